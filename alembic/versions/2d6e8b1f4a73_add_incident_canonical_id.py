@@ -0,0 +1,32 @@
+"""add_incident_canonical_id
+
+Revision ID: 2d6e8b1f4a73
+Revises: f1b7c3d92e45
+Create Date: 2026-10-19 16:21:54.118730
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2d6e8b1f4a73'
+down_revision = 'f1b7c3d92e45'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Near-duplicate detection points each duplicate at the first report of its story
+    op.add_column('incidents', sa.Column('canonical_incident_id', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'fk_incidents_canonical_incident_id', 'incidents', 'incidents',
+        ['canonical_incident_id'], ['id'], ondelete='SET NULL'
+    )
+    op.create_index(op.f('ix_incidents_canonical_incident_id'), 'incidents', ['canonical_incident_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_incidents_canonical_incident_id'), table_name='incidents')
+    op.drop_constraint('fk_incidents_canonical_incident_id', 'incidents', type_='foreignkey')
+    op.drop_column('incidents', 'canonical_incident_id')
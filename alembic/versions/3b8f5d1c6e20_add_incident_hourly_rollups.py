@@ -0,0 +1,43 @@
+"""add_incident_hourly_rollups
+
+Revision ID: 3b8f5d1c6e20
+Revises: 7a4c2e9d5b18
+Create Date: 2026-10-19 19:41:08.215394
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b8f5d1c6e20'
+down_revision = '7a4c2e9d5b18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('incident_hourly_rollups',
+        sa.Column('hour', sa.DateTime(), nullable=False),
+        sa.Column('state', sa.String(length=2), nullable=False),
+        sa.Column('crime_type', sa.String(length=50), nullable=False),
+        sa.Column('severity', sa.String(length=20), nullable=False),
+        sa.Column('is_duplicate', sa.Boolean(), nullable=False),
+        sa.Column('is_verified', sa.Boolean(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('hour', 'state', 'crime_type', 'severity', 'is_duplicate', 'is_verified')
+    )
+
+    # Backfill from existing incidents
+    op.execute("""
+        INSERT INTO incident_hourly_rollups
+            (hour, state, crime_type, severity, is_duplicate, is_verified, count)
+        SELECT date_trunc('hour', discovered_at), coalesce(state, ''), crime_type, severity,
+               coalesce(is_duplicate, false), coalesce(is_verified, false), count(*)
+        FROM incidents
+        GROUP BY 1, 2, 3, 4, 5, 6
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('incident_hourly_rollups')
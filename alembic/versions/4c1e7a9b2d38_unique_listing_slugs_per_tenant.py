@@ -0,0 +1,39 @@
+"""unique_listing_slugs_per_tenant
+
+Revision ID: 4c1e7a9b2d38
+Revises: 9398f4feb914
+Create Date: 2026-10-19 09:12:41.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4c1e7a9b2d38'
+down_revision = '9398f4feb914'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Disambiguate existing duplicates so the unique index can be built
+    op.execute("""
+        UPDATE listings SET slug = slug || '-' || id
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (PARTITION BY tenant_id, slug ORDER BY id) AS rn
+                FROM listings
+            ) ranked
+            WHERE ranked.rn > 1
+        )
+    """)
+    
+    # Slug allocation relies on ON CONFLICT (tenant_id, slug)
+    op.drop_index('idx_listings_tenant_slug', table_name='listings')
+    op.create_index('idx_listings_tenant_slug', 'listings', ['tenant_id', 'slug'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_listings_tenant_slug', table_name='listings')
+    op.create_index('idx_listings_tenant_slug', 'listings', ['tenant_id', 'slug'], unique=False)
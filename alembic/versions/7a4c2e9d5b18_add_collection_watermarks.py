@@ -0,0 +1,29 @@
+"""add_collection_watermarks
+
+Revision ID: 7a4c2e9d5b18
+Revises: 2d6e8b1f4a73
+Create Date: 2026-10-19 17:05:12.482106
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a4c2e9d5b18'
+down_revision = '2d6e8b1f4a73'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('collection_watermarks',
+        sa.Column('query', sa.String(length=500), nullable=False),
+        sa.Column('last_published_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('query')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('collection_watermarks')
@@ -0,0 +1,37 @@
+"""add_listing_endorsement_stats
+
+Revision ID: a5d92e4f7c10
+Revises: e83f05c6a1d4
+Create Date: 2026-10-19 13:26:08.104577
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a5d92e4f7c10'
+down_revision = 'e83f05c6a1d4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Incrementally maintained aggregates; backfill with scripts/rebuild_endorsement_stats.py
+    op.create_table('listing_endorsement_stats',
+        sa.Column('listing_id', sa.Integer(), nullable=False),
+        sa.Column('tenant_id', sa.Integer(), nullable=False),
+        sa.Column('endorsement_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('would_repeat_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('tag_counts', sa.JSON(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['listing_id'], ['listings.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('listing_id')
+    )
+    op.create_index('idx_endorsement_stats_tenant', 'listing_endorsement_stats', ['tenant_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_endorsement_stats_tenant', table_name='listing_endorsement_stats')
+    op.drop_table('listing_endorsement_stats')
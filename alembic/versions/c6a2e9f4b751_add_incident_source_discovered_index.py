@@ -0,0 +1,25 @@
+"""add_incident_source_discovered_index
+
+Revision ID: c6a2e9f4b751
+Revises: 3b8f5d1c6e20
+Create Date: 2026-10-19 20:26:44.903117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c6a2e9f4b751'
+down_revision = '3b8f5d1c6e20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Per-source totals and recent counts for the admin sources page
+    op.create_index('idx_incidents_source_discovered', 'incidents', ['source_id', 'discovered_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_incidents_source_discovered', table_name='incidents')
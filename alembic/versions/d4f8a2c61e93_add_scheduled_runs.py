@@ -0,0 +1,28 @@
+"""add_scheduled_runs
+
+Revision ID: d4f8a2c61e93
+Revises: c6a2e9f4b751
+Create Date: 2026-10-19 21:12:37.548210
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4f8a2c61e93'
+down_revision = 'c6a2e9f4b751'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('scheduled_runs',
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('last_started_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('scheduled_runs')
@@ -0,0 +1,38 @@
+"""add_background_jobs
+
+Revision ID: e2a7c5b83f16
+Revises: d4f8a2c61e93
+Create Date: 2026-10-19 23:05:12.604117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2a7c5b83f16'
+down_revision = 'd4f8a2c61e93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('background_jobs',
+        sa.Column('id', sa.String(length=32), nullable=False),
+        sa.Column('kind', sa.String(length=100), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('params', sa.Text(), nullable=True),
+        sa.Column('progress', sa.Text(), nullable=True),
+        sa.Column('result', sa.Text(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_background_jobs_created_at'), 'background_jobs', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_background_jobs_created_at'), table_name='background_jobs')
+    op.drop_table('background_jobs')
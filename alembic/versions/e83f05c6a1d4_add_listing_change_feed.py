@@ -0,0 +1,41 @@
+"""add_listing_change_feed
+
+Revision ID: e83f05c6a1d4
+Revises: 4c1e7a9b2d38
+Create Date: 2026-10-19 10:03:17.552910
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e83f05c6a1d4'
+down_revision = '4c1e7a9b2d38'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keyset index for GET /v1/listings/changes
+    op.create_index('idx_listings_tenant_updated', 'listings', ['tenant_id', 'updated_at', 'id'])
+    
+    # Deletion log so consumers receive tombstones for removed listings
+    op.create_table('listing_tombstones',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('tenant_id', sa.Integer(), nullable=False),
+        sa.Column('listing_id', sa.Integer(), nullable=False),
+        sa.Column('slug', sa.String(length=200), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_listing_tombstones_tenant_deleted', 'listing_tombstones', ['tenant_id', 'deleted_at', 'id'])
+    op.create_index(op.f('ix_listing_tombstones_id'), 'listing_tombstones', ['id'])
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_listing_tombstones_id'), table_name='listing_tombstones')
+    op.drop_index('idx_listing_tombstones_tenant_deleted', table_name='listing_tombstones')
+    op.drop_table('listing_tombstones')
+    op.drop_index('idx_listings_tenant_updated', table_name='listings')
@@ -0,0 +1,46 @@
+"""unique_incident_urls
+
+Revision ID: f1b7c3d92e45
+Revises: a5d92e4f7c10
+Create Date: 2026-10-19 15:02:37.640918
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1b7c3d92e45'
+down_revision = 'a5d92e4f7c10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Later copies of an article move to an archive table, each pointing at the
+    # earliest copy (which stays), so the unique index can be built without
+    # losing any rows
+    op.execute("""
+        CREATE TABLE incident_url_duplicates AS
+        SELECT * FROM (
+            SELECT incidents.*,
+                   min(id) OVER (PARTITION BY url) AS canonical_incident_id,
+                   row_number() OVER (PARTITION BY url ORDER BY id) AS rn
+            FROM incidents
+        ) ranked
+        WHERE ranked.rn > 1
+    """)
+    op.drop_column('incident_url_duplicates', 'rn')
+    op.execute("DELETE FROM incidents WHERE id IN (SELECT id FROM incident_url_duplicates)")
+    
+    # News ingestion relies on ON CONFLICT (url) DO NOTHING
+    op.create_index('idx_incidents_url', 'incidents', ['url'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_incidents_url', table_name='incidents')
+    
+    # The archive's leading columns are the incidents columns, in order
+    op.drop_column('incident_url_duplicates', 'canonical_incident_id')
+    op.execute("INSERT INTO incidents SELECT * FROM incident_url_duplicates")
+    op.drop_table('incident_url_duplicates')
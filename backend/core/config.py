@@ -51,7 +51,58 @@ class Settings(BaseSettings):
     # API Rate Limiting
     RATE_LIMIT_PER_MINUTE: int = 60
     RATE_LIMIT_PER_HOUR: int = 1000
-    
+
+    # Endorsement anti-spam (per worker process)
+    ENDORSEMENT_IP_SALT: str = os.getenv("ENDORSEMENT_IP_SALT", "")  # Falls back to SECRET_KEY
+    ENDORSEMENT_TRUST_FORWARDED_FOR: bool = False  # Enable only behind a trusted proxy
+    ENDORSEMENT_RATE_LIMIT: int = 5  # Per tenant, listing and client IP...
+    ENDORSEMENT_RATE_WINDOW_SECONDS: int = 3600  # ...within this sliding window
+    ENDORSEMENT_DEDUP_CAPACITY: int = 200_000
+    ENDORSEMENT_DEDUP_ERROR_RATE: float = 0.001
+    ENDORSEMENT_DEDUP_TTL_SECONDS: int = 86400
+
+    # Endorsement write-behind queue (POST /endorsements?mode=async)
+    ENDORSEMENT_QUEUE_MAX_SIZE: int = 10000
+    ENDORSEMENT_QUEUE_BATCH_SIZE: int = 500
+    ENDORSEMENT_QUEUE_FLUSH_SECONDS: float = 0.5
+    ENDORSEMENT_QUEUE_SPILL_PATH: str = "data/endorsement_spill.jsonl"
+
+    # NewsAPI collection
+    NEWSAPI_KEY: str = os.getenv("NEWSAPI_KEY", "")
+    NEWSAPI_MAX_CONCURRENCY: int = 4  # Requests in flight at once
+    NEWSAPI_REQUESTS_PER_SECOND: float = 2.0
+    NEWSAPI_MAX_PAGES: int = 5  # Per keyword group
+    NEWSAPI_MAX_REQUESTS_PER_RUN: int = 40  # Keeps a run inside the plan's daily quota
+    NEWSAPI_QUEUE_SIZE: int = 8  # Pages buffered ahead of processing
+    NEWSAPI_WATERMARK_OVERLAP_MINUTES: int = 30  # Re-request this much before each query's watermark
+    NEWSAPI_MAX_LOOKBACK_HOURS: int = 168  # Oldest a watermark resume may reach back
+    NEWSAPI_RECENT_URLS: int = 20000  # URLs remembered across runs to skip before the database
+
+    # Near-duplicate incident detection (MinHash + LSH)
+    NEAR_DUPLICATE_NUM_PERM: int = 64
+    NEAR_DUPLICATE_BANDS: int = 16  # 4 rows per band; candidates from roughly 0.5 similarity
+    NEAR_DUPLICATE_THRESHOLD: float = 0.5
+    NEAR_DUPLICATE_WINDOW_HOURS: int = 72
+
+    # Buffered writes to operational log tables (api_logs, ...)
+    LOG_WRITER_MAX_SIZE: int = 10000  # Rows buffered before new ones are dropped
+    LOG_WRITER_BATCH_SIZE: int = 500
+    LOG_WRITER_FLUSH_SECONDS: float = 1.0
+
+    # Background jobs (status is kept in background_jobs so every worker can report it)
+    JOB_HISTORY_DAYS: int = 30  # Finished jobs older than this are pruned
+
+    # In-app scheduler (one instance per job via Postgres advisory locks)
+    SCHEDULER_ENABLED: bool = True
+    SCHEDULER_JITTER_SECONDS: int = 60
+    COLLECTION_INTERVAL_MINUTES: int = 120
+    COLLECTION_HOURS_BACK: int = 2  # Fallback window for queries without a watermark
+    ROLLUP_INTERVAL_MINUTES: int = 15
+    ROLLUP_RECONCILE_HOURS: int = 48  # Hours recounted from incidents on each rollup run
+
+    # Admin dashboard
+    ADMIN_DASHBOARD_CACHE_SECONDS: float = 5.0  # Counts are shared by every admin for this long
+
     # Email Configuration
     SMTP_HOST: str = "smtp.gmail.com"
     SMTP_PORT: int = 587
@@ -0,0 +1,47 @@
+"""
+Opaque pagination cursors shared by keyset-paginated endpoints
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+
+def encode_cursor(payload: Dict[str, Any]) -> str:
+    """Encode a JSON-serializable position as a URL-safe token"""
+    raw = json.dumps(payload, separators=(",", ":"), default=_json_default).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Decode a token produced by encode_cursor, raising ValueError if malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(payload, dict):
+        raise ValueError("Invalid cursor")
+    return payload
+
+
+def position(timestamp: datetime, row_id: int) -> list:
+    """Serialize a (timestamp, id) keyset position"""
+    return [timestamp.isoformat(), row_id]
+
+
+def parse_position(value: Optional[list]) -> Optional[Tuple[datetime, int]]:
+    """Parse a (timestamp, id) keyset position, raising ValueError if malformed"""
+    if value is None:
+        return None
+    try:
+        timestamp, row_id = value
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
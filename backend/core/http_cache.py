@@ -0,0 +1,52 @@
+"""
+Conditional GET support (ETag / If-None-Match) and per-endpoint Cache-Control policies
+"""
+import hashlib
+from typing import Dict
+
+from fastapi import Request
+from starlette.responses import Response
+
+# Bump when the serialized shape of a cached resource changes
+REPRESENTATION_VERSION = "1"
+
+# Responses are tenant-scoped (API key), so only private caches may store them;
+# clients and CDNs revalidate with If-None-Match and usually get a 304
+CACHE_POLICIES = {
+    "listing": "private, max-age=30, must-revalidate",
+    "search": "private, no-cache",
+}
+
+
+def etag_for(*parts) -> str:
+    """Strong ETag from version-like parts (ids, updated_at, ...)"""
+    raw = ":".join([REPRESENTATION_VERSION, *(str(part) for part in parts)])
+    return f'"{hashlib.sha256(raw.encode()).hexdigest()[:32]}"'
+
+
+def etag_for_body(body: bytes) -> str:
+    """Strong ETag from a serialized response body"""
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weak comparison against If-None-Match, as RFC 7232 requires for GET"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates
+
+
+def cache_headers(etag: str, policy: str) -> Dict[str, str]:
+    return {
+        "ETag": etag,
+        "Cache-Control": CACHE_POLICIES[policy],
+        "Vary": "Authorization"
+    }
+
+
+def not_modified(etag: str, policy: str) -> Response:
+    return Response(status_code=304, headers=cache_headers(etag, policy))
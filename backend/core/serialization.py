@@ -0,0 +1,78 @@
+"""
+Fast JSON path for trusted ORM output
+
+Handlers that build ``ListingResponse.from_orm(...)`` and return it through a
+``response_model`` pay for Pydantic validation twice before JSON encoding.
+Rows loaded from our own tables are already trusted, so these helpers read
+the attributes with precompiled getters and encode with orjson instead.
+"""
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+import orjson
+from starlette.responses import Response
+
+from backend.schemas.tenant_schemas import EndorsementResponse, ListingResponse
+
+# Fields filled in by handlers rather than read from the Listing row
+LISTING_COMPUTED_FIELDS = ("endorsement_summary",)
+
+# Same field names and order as the Pydantic schema, so both paths agree
+LISTING_FIELDS = tuple(f for f in ListingResponse.model_fields if f not in LISTING_COMPUTED_FIELDS)
+
+# Large Text/JSON columns left out of list views unless asked for via fields=
+LISTING_DEFERRED_FIELDS = ("description", "tags", "hours_json", "images_json")
+LISTING_LIST_FIELDS = tuple(f for f in LISTING_FIELDS if f not in LISTING_DEFERRED_FIELDS)
+
+ENDORSEMENT_FIELDS = tuple(EndorsementResponse.model_fields)
+
+
+@lru_cache(maxsize=64)
+def row_serializer(fields: Sequence[str]) -> Callable[[Any], Dict[str, Any]]:
+    """Compile (and cache) an object -> dict serializer for a tuple of fields"""
+    fields = tuple(fields)
+    getter = attrgetter(*fields)
+    if len(fields) == 1:
+        return lambda obj: {fields[0]: getter(obj)}
+    return lambda obj: dict(zip(fields, getter(obj)))
+
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str], default: Sequence[str]) -> Tuple[str, ...]:
+    """
+    Parse a ``fields=`` query value into a tuple in schema order.
+
+    ``id`` is always included. Raises ValueError naming any unknown fields.
+    """
+    if not fields:
+        return tuple(default)
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested - set(allowed)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    requested.add("id")
+    return tuple(field for field in allowed if field in requested)
+
+
+def serialize_listing(listing, fields: Sequence[str] = LISTING_FIELDS) -> Dict[str, Any]:
+    return row_serializer(tuple(fields))(listing)
+
+
+def serialize_endorsement(endorsement) -> Dict[str, Any]:
+    return row_serializer(ENDORSEMENT_FIELDS)(endorsement)
+
+
+def dumps(content: Any) -> bytes:
+    """orjson encoding (native datetime support, returns bytes)"""
+    return orjson.dumps(content)
+
+
+def json_response(content: Any = None, body: Optional[bytes] = None, status_code: int = 200,
+                  headers: Optional[Dict[str, str]] = None) -> Response:
+    """Build a JSON response from content or an already-encoded body"""
+    return Response(
+        content=body if body is not None else dumps(content),
+        status_code=status_code,
+        media_type="application/json",
+        headers=headers
+    )
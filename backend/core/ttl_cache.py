@@ -0,0 +1,44 @@
+"""
+Short-TTL, single-flight cache for expensive read-mostly payloads
+
+A value is computed at most once per key per ``ttl`` seconds in a worker
+process. Requests that miss while a computation is already running await
+that same computation instead of starting their own. Computations run in a
+thread, because they use the synchronous database session. Failures are
+not cached.
+"""
+import asyncio
+import time
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlightCache:
+    """Per-process TTL cache whose concurrent misses share one computation"""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    async def get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._compute(key, compute))
+            self._inflight[key] = future
+        # A waiter that disconnects must not cancel the computation for the others
+        return await asyncio.shield(future)
+
+    def invalidate(self, key: Hashable):
+        self._entries.pop(key, None)
+
+    async def _compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        try:
+            value = await asyncio.to_thread(compute)
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
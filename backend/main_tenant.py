@@ -17,6 +17,7 @@ from database.database import get_db
 from backend.routes import tenant_api
 from backend.middleware import TimingMiddleware, AuthMiddleware
 from backend.core.config import settings
+from backend.services.endorsement_queue import endorsement_queue
 
 # Create FastAPI app for multi-tenant platform
 app = FastAPI(
@@ -47,6 +48,19 @@ if os.path.exists("frontend/static"):
 # Include tenant API router
 app.include_router(tenant_api.router)
 
+
+@app.on_event("startup")
+async def start_background_writers():
+    """Start the endorsement write-behind queue (replays any spill file first)"""
+    await endorsement_queue.start()
+
+
+@app.on_event("shutdown")
+async def stop_background_writers():
+    """Flush queued endorsements, spilling to disk whatever can't be written"""
+    await endorsement_queue.stop()
+
+
 # Root endpoint - tenant resolution
 @app.get("/", response_class=HTMLResponse)
 async def root(request: Request):
@@ -7,6 +7,7 @@ from fastapi import FastAPI, Depends, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse
+import asyncio
 import uvicorn
 import os
 from datetime import datetime, timedelta
@@ -14,13 +15,20 @@ import pytz
 
 from fastapi.templating import Jinja2Templates
 
-from database.database import get_db
+from database.database import get_db, SessionLocal
 # Legacy routes (Google OAuth based)
 from backend.routes import incidents, auth, admin, data_collection, google_auth, businesses, pages
 # Multi-tenant routes (API key based)
 from backend.routes import tenant_api
 from backend.middleware import TimingMiddleware, AuthMiddleware
 from backend.core.config import settings
+from backend.services.endorsement_queue import endorsement_queue
+from backend.services.gazetteer import load_gazetteer
+from backend.services.incident_rollups import ROLLUP_JOB, run_rollup_job
+from backend.services.jobs import job_runner
+from backend.services.log_writer import log_writer
+from backend.services.news_api import COLLECTION_JOB, run_collection_job
+from backend.services.scheduler import ScheduledTask, scheduler
 
 # Create unified FastAPI app
 app = FastAPI(
@@ -69,6 +77,62 @@ app.include_router(pages.router, tags=["Pages"])
 # Include multi-tenant routes (API key based - port 9179 functionality)
 app.include_router(tenant_api.router, prefix="/v1", tags=["Multi-Tenant API"])
 
+
+@app.on_event("startup")
+async def start_background_writers():
+    """Start the endorsement write-behind queue (replays any spill file first)"""
+    await endorsement_queue.start()
+
+
+@app.on_event("startup")
+async def load_reference_data():
+    """Build the in-memory location gazetteer used by news ingestion"""
+    db = SessionLocal()
+    try:
+        load_gazetteer(db)
+    except Exception as e:
+        print(f"Could not load gazetteer: {e}")
+    finally:
+        db.close()
+
+
+@app.on_event("startup")
+async def start_scheduler():
+    """Run periodic jobs in-process (replaces the scripts/collect_data.py cron entry)"""
+    if not settings.SCHEDULER_ENABLED:
+        return
+    if settings.NEWSAPI_KEY:
+        scheduler.register(ScheduledTask(
+            name=COLLECTION_JOB,
+            interval_seconds=settings.COLLECTION_INTERVAL_MINUTES * 60,
+            jitter_seconds=settings.SCHEDULER_JITTER_SECONDS,
+            run=lambda job: run_collection_job(job, settings.COLLECTION_HOURS_BACK),
+            params={"hours_back": settings.COLLECTION_HOURS_BACK}
+        ))
+    scheduler.register(ScheduledTask(
+        name=ROLLUP_JOB,
+        interval_seconds=settings.ROLLUP_INTERVAL_MINUTES * 60,
+        jitter_seconds=settings.SCHEDULER_JITTER_SECONDS,
+        run=run_rollup_job,
+        run_on_start=True
+    ))
+    await scheduler.start()
+
+
+@app.on_event("shutdown")
+async def stop_background_writers():
+    """
+    Stop the scheduler loops, flush queued endorsements (spilling to disk
+    whatever can't be written), stop the job runner from taking new jobs
+    (queued ones are cancelled, running ones finish in their threads), then
+    flush buffered ApiLog rows through the log writer
+    """
+    await scheduler.stop()
+    await endorsement_queue.stop()
+    job_runner.shutdown()
+    await asyncio.to_thread(log_writer.stop)
+
+
 @app.get("/")
 async def root():
     """Root endpoint showing unified system info"""
@@ -1,46 +1,81 @@
 """
 Admin routes for system management
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select, text
+from typing import Optional
 from datetime import datetime, timedelta
 import pytz
 
-from database import get_db
+from database import SessionLocal, get_db
 from database.models import Incident, Source, ApiLog, SystemStats
 from backend.middleware import verify_admin_access
 from backend.core.config import settings
+from backend.core.cursors import decode_cursor, encode_cursor
+from backend.core.ttl_cache import SingleFlightCache
+from backend.services.incident_rollups import Rollup, db_local
+from backend.services.log_writer import log_writer
 
 router = APIRouter()
 
 
+# Several admins refreshing the dashboard share one computation per TTL
+admin_cache = SingleFlightCache(ttl=settings.ADMIN_DASHBOARD_CACHE_SECONDS)
+
+# Page size for GET /sources when only a cursor is passed
+DEFAULT_SOURCES_PAGE = 100
+
+
+def _in_own_session(compute, *args):
+    """
+    Run a cached computation on a session of its own. It runs in a worker
+    thread on behalf of every waiting request, and may outlive the request
+    that started it, so it must not borrow that request's session.
+    """
+    db = SessionLocal()
+    try:
+        return compute(db, *args)
+    finally:
+        db.close()
+
+
 @router.get("/dashboard")
 async def admin_dashboard(
-    current_user: str = Depends(verify_admin_access),
-    db: Session = Depends(get_db)
+    current_user: str = Depends(verify_admin_access)
 ):
     """Admin dashboard data"""
     
     eastern = pytz.timezone(settings.TIMEZONE)
     now = datetime.now(eastern)
     
-    # Get counts
-    total_incidents = db.query(Incident).count()
-    verified_incidents = db.query(Incident).filter(Incident.is_verified == True).count()
-    unverified_incidents = total_incidents - verified_incidents
+    payload = await admin_cache.get("dashboard", lambda: _in_own_session(_dashboard_payload))
     
-    # Get today's incidents
-    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    today_incidents = db.query(Incident).filter(
-        Incident.discovered_at >= today_start
-    ).count()
+    return {
+        **payload,
+        "current_time": now.isoformat(),
+        "login_time_allowed": _is_login_time_allowed()
+    }
+
+
+def _dashboard_payload(db: Session) -> dict:
+    """Counts, recent API logs and daily stats for the dashboard"""
     
-    # Get incidents by severity
-    severity_counts = db.query(
-        Incident.severity,
-        func.count(Incident.id).label('count')
-    ).group_by(Incident.severity).all()
+    eastern = pytz.timezone(settings.TIMEZONE)
+    today_start = datetime.now(eastern).replace(hour=0, minute=0, second=0, microsecond=0)
+    
+    # All counts in one pass over the hourly rollups, per severity
+    total = func.sum(Rollup.count)
+    severity_rows = db.query(
+        Rollup.severity,
+        total,
+        total.filter(Rollup.is_verified == True),
+        total.filter(Rollup.hour >= db_local(today_start))
+    ).group_by(Rollup.severity).having(total > 0).all()
+    
+    total_incidents = sum(count for _, count, _, _ in severity_rows)
+    verified_incidents = sum(verified or 0 for _, _, verified, _ in severity_rows)
+    today_incidents = sum(today or 0 for _, _, _, today in severity_rows)
     
     # Get recent API logs
     recent_logs = db.query(ApiLog).order_by(
@@ -56,10 +91,10 @@ async def admin_dashboard(
         "summary": {
             "total_incidents": total_incidents,
             "verified_incidents": verified_incidents,
-            "unverified_incidents": unverified_incidents,
+            "unverified_incidents": total_incidents - verified_incidents,
             "today_incidents": today_incidents
         },
-        "severity_breakdown": dict(severity_counts),
+        "severity_breakdown": {severity: count for severity, count, _, _ in severity_rows},
         "recent_api_logs": [
             {
                 "id": log.id,
@@ -79,47 +114,85 @@ async def admin_dashboard(
                 "api_errors": stat.api_errors
             }
             for stat in system_stats
-        ],
-        "current_time": now.isoformat(),
-        "login_time_allowed": _is_login_time_allowed()
+        ]
     }
 
 
 @router.get("/sources")
 async def get_sources(
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Sources per page; returns a paginated envelope"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     current_user: str = Depends(verify_admin_access),
     db: Session = Depends(get_db)
 ):
-    """Get news sources with statistics"""
-    
-    sources = db.query(Source).all()
-    
-    source_stats = []
-    for source in sources:
-        # Get incident count for this source
-        incident_count = db.query(Incident).filter(
-            Incident.source_id == source.id
-        ).count()
-        
-        # Get recent incident count (last 7 days)
-        cutoff = datetime.now(pytz.timezone(settings.TIMEZONE)) - timedelta(days=7)
-        recent_count = db.query(Incident).filter(
-            Incident.source_id == source.id,
-            Incident.discovered_at >= cutoff
-        ).count()
-        
-        source_stats.append({
-            "id": source.id,
-            "name": source.name,
-            "domain": source.domain,
-            "reliability_score": source.reliability_score,
-            "is_active": source.is_active,
-            "total_incidents": incident_count,
-            "recent_incidents_7d": recent_count,
-            "created_at": source.created_at.isoformat()
-        })
-    
-    return source_stats
+    """
+    Get news sources with statistics
+
+    Returns the list of every source unless ``limit`` or ``cursor`` is
+    passed, which opts in to keyset pagination on id and returns
+    ``{sources, next_cursor, has_next}``.
+    """
+    
+    paginated = limit is not None or cursor is not None
+    after_id = 0
+    if cursor:
+        try:
+            after_id = int(decode_cursor(cursor).get("id", 0))
+        except (TypeError, ValueError) as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    cutoff = datetime.now(pytz.timezone(settings.TIMEZONE)) - timedelta(days=7)
+    
+    page = select(Source).where(Source.id > after_id).order_by(Source.id)
+    if paginated:
+        limit = limit or DEFAULT_SOURCES_PAGE
+        page = page.limit(limit + 1)
+    page = page.subquery()
+    
+    # Both counts for the whole page in one grouped pass over idx_incidents_source_discovered
+    counts = select(
+        Incident.source_id,
+        func.count().label("total"),
+        func.count().filter(Incident.discovered_at >= cutoff).label("recent")
+    ).where(
+        Incident.source_id.in_(select(page.c.id))
+    ).group_by(Incident.source_id).subquery()
+    
+    rows = db.execute(
+        select(
+            page,
+            func.coalesce(counts.c.total, 0).label("total_incidents"),
+            func.coalesce(counts.c.recent, 0).label("recent_incidents_7d")
+        )
+        .outerjoin(counts, counts.c.source_id == page.c.id)
+        .order_by(page.c.id)
+    ).all()
+    
+    has_next = paginated and len(rows) > limit
+    if paginated:
+        rows = rows[:limit]
+    
+    sources = [
+        {
+            "id": row.id,
+            "name": row.name,
+            "domain": row.domain,
+            "reliability_score": row.reliability_score,
+            "is_active": row.is_active,
+            "total_incidents": row.total_incidents,
+            "recent_incidents_7d": row.recent_incidents_7d,
+            "created_at": row.created_at.isoformat()
+        }
+        for row in rows
+    ]
+    if not paginated:
+        return sources
+    
+    return {
+        "sources": sources,
+        "next_cursor": encode_cursor({"id": rows[-1].id}) if has_next else None,
+        "has_next": has_next
+    }
 
 
 @router.post("/sources/{source_id}/toggle")
@@ -183,32 +256,37 @@ async def system_health(
     
     # Check database connection
     try:
-        db.execute("SELECT 1")
+        db.execute(text("SELECT 1"))
         db_status = "healthy"
     except Exception as e:
         db_status = f"error: {str(e)}"
     
-    # Check recent API activity
-    recent_logs = db.query(ApiLog).filter(
-        ApiLog.created_at >= now - timedelta(hours=1)
-    ).count()
-    
-    # Check for recent errors
-    recent_errors = db.query(ApiLog).filter(
-        ApiLog.created_at >= now - timedelta(hours=1),
-        ApiLog.status_code >= 400
-    ).count()
+    # Check recent API activity and errors in one query
+    recent_logs, recent_errors = await admin_cache.get(
+        "api-activity", lambda: _in_own_session(_recent_api_activity, now - timedelta(hours=1))
+    )
     
     return {
         "timestamp": now.isoformat(),
         "database": db_status,
         "recent_api_calls_1h": recent_logs,
         "recent_errors_1h": recent_errors,
+        "log_writer": log_writer.stats(),
         "login_time_allowed": _is_login_time_allowed(),
         "timezone": settings.TIMEZONE
     }
 
 
+def _recent_api_activity(db: Session, since: datetime) -> tuple:
+    """(calls, errors) logged since ``since``"""
+    return tuple(db.query(
+        func.count(ApiLog.id),
+        func.count(ApiLog.id).filter(ApiLog.status_code >= 400)
+    ).filter(
+        ApiLog.created_at >= since
+    ).one())
+
+
 def _is_login_time_allowed() -> bool:
     """Check if current time is within allowed login hours"""
     eastern = pytz.timezone(settings.TIMEZONE)
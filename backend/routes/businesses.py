@@ -12,6 +12,8 @@ import os
 from database import get_db
 from database.business_models import User, Business, BusinessReview, BusinessCategory
 from backend.routes.google_auth import get_current_user
+from backend.services.slugs import SlugAllocationError, assign_unique_slug, insert_with_unique_slug, slugify
+from backend.core.config import settings
 
 router = APIRouter()
 
@@ -150,40 +152,23 @@ async def create_business(
             detail=f"Invalid category. Allowed categories: {', '.join(allowed_categories)}"
         )
     
-    # Create slug from name
-    slug = _create_slug(business_data.name)
-    
-    # Check if slug already exists
-    existing_slug = db.query(Business).filter(Business.slug == slug).first()
-    if existing_slug:
-        slug = f"{slug}-{datetime.now().strftime('%Y%m%d%H%M%S')}"
-    
-    # Create business
-    business = Business(
+    # Create business with a collision-free slug (no pre-check query)
+    now = datetime.utcnow()
+    values = business_data.dict()
+    values.update(
         owner_id=current_user["id"],
-        name=business_data.name,
-        description=business_data.description,
-        category=business_data.category,
-        phone=business_data.phone,
-        email=business_data.email,
-        website=business_data.website,
-        address=business_data.address,
-        city=business_data.city,
-        state=business_data.state,
-        zip_code=business_data.zip_code,
-        hours=business_data.hours,
-        price_range=business_data.price_range,
-        amenities=business_data.amenities,
-        tags=business_data.tags,
-        slug=slug,
         is_approved=not settings.BUSINESS_APPROVAL_REQUIRED,  # Auto-approve if approval not required
-        created_at=datetime.utcnow(),
-        updated_at=datetime.utcnow()
+        created_at=now,
+        updated_at=now
     )
     
-    db.add(business)
+    try:
+        business = insert_with_unique_slug(
+            db, Business, values, slugify(business_data.name), ("slug",)
+        )
+    except SlugAllocationError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     db.commit()
-    db.refresh(business)
     
     return BusinessResponse(
         id=business.id,
@@ -246,16 +231,12 @@ async def update_business(
                 detail=f"Invalid category. Allowed categories: {', '.join(allowed_categories)}"
             )
     
-    # Update slug if name changed
+    # Update slug if name changed (before other fields, see assign_unique_slug)
     if "name" in update_data and update_data["name"] != business.name:
-        new_slug = _create_slug(update_data["name"])
-        existing_slug = db.query(Business).filter(
-            Business.slug == new_slug,
-            Business.id != business_id
-        ).first()
-        if existing_slug:
-            new_slug = f"{new_slug}-{datetime.now().strftime('%Y%m%d%H%M%S')}"
-        update_data["slug"] = new_slug
+        try:
+            assign_unique_slug(db, business, slugify(update_data["name"]))
+        except SlugAllocationError as e:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     
     # Update business
     for field, value in update_data.items():
@@ -383,12 +364,3 @@ async def upload_logo(
     db.commit()
     
     return {"logo_url": logo_url, "message": "Logo uploaded successfully"}
-
-
-def _create_slug(name: str) -> str:
-    """Create URL-friendly slug from business name"""
-    import re
-    # Convert to lowercase and replace spaces/special chars with hyphens
-    slug = re.sub(r'[^\w\s-]', '', name.lower())
-    slug = re.sub(r'[-\s]+', '-', slug)
-    return slug.strip('-')
@@ -3,36 +3,68 @@ Data collection routes for NewsAPI integration
 """
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from sqlalchemy.orm import Session
-from typing import Dict
+from typing import Dict, Optional
 import logging
 
 from database import get_db
-from backend.services.news_api import NewsAPIService
+from backend.services.jobs import job_runner
+from backend.services.news_api import COLLECTION_JOB, run_collection_job
+from backend.services.scheduler import run_with_advisory_lock
 from backend.middleware import verify_admin_access
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-@router.post("/collect-news")
+@router.post("/collect-news", status_code=202)
 async def collect_news_data(
     hours_back: int = 24,
-    current_user: str = Depends(verify_admin_access),
-    db: Session = Depends(get_db)
+    current_user: str = Depends(verify_admin_access)
 ):
-    """Trigger news data collection from NewsAPI"""
+    """Start news data collection from NewsAPI as a background job"""
     try:
-        logger.info(f"Starting data collection for {hours_back} hours")
-        news_service = NewsAPIService()
-        
-        # Run synchronously to see errors
-        result = run_data_collection(db, news_service, hours_back)
-        logger.info(f"Data collection result: {result}")
-        return result
+        # Same advisory lock as the scheduler, so no other instance collects concurrently
+        job = job_runner.submit(
+            COLLECTION_JOB,
+            lambda job: run_with_advisory_lock(
+                COLLECTION_JOB, lambda job: run_collection_job(job, hours_back), job
+            ),
+            params={"hours_back": hours_back}
+        )
+        logger.info(f"Data collection job {job.id} ({job.status}) for {hours_back} hours")
+        return {
+            "job_id": job.id,
+            "status": job.status,
+            "status_url": f"/api/data/jobs/{job.id}"
+        }
             
     except Exception as e:
         logger.error(f"Error starting data collection: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error starting data collection: {str(e)}")
 
+@router.get("/jobs")
+async def list_jobs(
+    kind: Optional[str] = None,
+    current_user: str = Depends(verify_admin_access)
+):
+    """Recent background jobs from every worker, newest first"""
+    return {"jobs": [job.to_dict() for job in job_runner.list(kind)]}
+
+@router.get("/jobs/{job_id}")
+async def get_job(
+    job_id: str,
+    current_user: str = Depends(verify_admin_access)
+):
+    """
+    Status and progress of a background job
+
+    Progress is live on the worker running the job; other workers report it
+    as of the job's last status change.
+    """
+    job = job_runner.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
 @router.get("/collection-status")
 async def get_collection_status(
     current_user: str = Depends(verify_admin_access),
@@ -57,7 +89,10 @@ async def get_collection_status(
             Incident.discovered_at >= last_hour
         ).count()
         
+        job = job_runner.latest(COLLECTION_JOB)
+        
         return {
+            "current_job": job.to_dict() if job else None,
             "latest_collection": {
                 "timestamp": latest_log.created_at.isoformat() if latest_log else None,
                 "articles_found": latest_log.articles_found if latest_log else 0,
@@ -66,7 +101,8 @@ async def get_collection_status(
                 "errors": latest_log.errors if latest_log else None
             },
             "recent_incidents_last_hour": recent_incidents,
-            "collection_active": latest_log is not None and latest_log.status_code == 200
+            "collection_active": latest_log is not None and latest_log.status_code == 200,
+            "collection_running": job is not None and job.active
         }
         
     except Exception as e:
@@ -128,26 +164,3 @@ async def test_newsapi_connection():
             "status": "error",
             "message": f"Error testing NewsAPI: {str(e)}"
         }
-
-def run_data_collection(db: Session, news_service: NewsAPIService, hours_back: int) -> Dict:
-    """Run the actual data collection"""
-    try:
-        logger.info(f"Starting data collection for last {hours_back} hours")
-        
-        result = news_service.collect_incidents(db, hours_back)
-        
-        logger.info(f"Data collection completed: {result}")
-        
-        return {
-            "message": "Data collection completed",
-            "hours_back": hours_back,
-            "result": result
-        }
-        
-    except Exception as e:
-        logger.error(f"Error in data collection: {str(e)}")
-        return {
-            "message": "Data collection failed",
-            "error": str(e),
-            "hours_back": hours_back
-        }
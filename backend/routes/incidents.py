@@ -13,6 +13,7 @@ from database import get_db
 from database.models import Incident, Source, Location
 from backend.middleware import get_current_user
 from backend.core.config import settings
+from backend.services.incident_rollups import NO_STATE, Rollup, adjust_rollups, hours_ago
 
 router = APIRouter()
 
@@ -197,36 +198,34 @@ async def get_incident_stats(
 ):
     """Get incident statistics"""
     
-    # Calculate time filter
+    # Calculate time filter (whole hours on the rollups' own clock)
     eastern = pytz.timezone(settings.TIMEZONE)
-    cutoff_time = datetime.now(eastern) - timedelta(hours=hours)
+    cutoff_hour = hours_ago(hours)
+    total = func.sum(Rollup.count)
     
     # Get counts by severity
     severity_counts = db.query(
-        Incident.severity,
-        func.count(Incident.id).label('count')
+        Rollup.severity, total
     ).filter(
-        Incident.discovered_at >= cutoff_time
-    ).group_by(Incident.severity).all()
+        Rollup.hour >= cutoff_hour
+    ).group_by(Rollup.severity).having(total > 0).all()
     
     # Get counts by state
     state_counts = db.query(
-        Incident.state,
-        func.count(Incident.id).label('count')
+        Rollup.state, total
     ).filter(
-        Incident.discovered_at >= cutoff_time,
-        Incident.state.isnot(None)
-    ).group_by(Incident.state).order_by(
-        func.count(Incident.id).desc()
+        Rollup.hour >= cutoff_hour,
+        Rollup.state != NO_STATE
+    ).group_by(Rollup.state).having(total > 0).order_by(
+        total.desc()
     ).limit(10).all()
     
     # Get counts by crime type
     type_counts = db.query(
-        Incident.crime_type,
-        func.count(Incident.id).label('count')
+        Rollup.crime_type, total
     ).filter(
-        Incident.discovered_at >= cutoff_time
-    ).group_by(Incident.crime_type).all()
+        Rollup.hour >= cutoff_hour
+    ).group_by(Rollup.crime_type).having(total > 0).all()
     
     return {
         "time_period_hours": hours,
@@ -250,8 +249,15 @@ async def verify_incident(
     if not incident:
         raise HTTPException(status_code=404, detail="Incident not found")
     
+    # Move the incident between rollup buckets in the same transaction
+    changed = bool(incident.is_verified) != verified
+    if changed:
+        adjust_rollups(db, Incident.id == incident_id, sign=-1)
     incident.is_verified = verified
     incident.processed_at = datetime.now(pytz.timezone(settings.TIMEZONE))
+    if changed:
+        db.flush()
+        adjust_rollups(db, Incident.id == incident_id)
     
     db.commit()
     
@@ -263,15 +269,15 @@ async def get_available_states(db: Session = Depends(get_db)):
     """Get list of available states with incident counts"""
     
     # Get states with incident counts from last 30 days
-    cutoff_time = datetime.now(pytz.timezone(settings.TIMEZONE)) - timedelta(days=30)
+    cutoff_hour = hours_ago(30 * 24)
+    total = func.sum(Rollup.count)
     
     state_counts = db.query(
-        Incident.state,
-        func.count(Incident.id).label('count')
+        Rollup.state, total
     ).filter(
-        Incident.discovered_at >= cutoff_time,
-        Incident.state.isnot(None)
-    ).group_by(Incident.state).order_by(Incident.state).all()
+        Rollup.hour >= cutoff_hour,
+        Rollup.state != NO_STATE
+    ).group_by(Rollup.state).having(total > 0).order_by(Rollup.state).all()
     
     return [
         {"state_code": state, "count": count}
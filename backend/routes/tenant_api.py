@@ -2,27 +2,52 @@
 White-label Multi-tenant Business Directory API
 Following the master project specifications exactly
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Header, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Header, Query, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from typing import Optional, List
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.exc import IntegrityError
+from typing import Optional, List, Union
 import hashlib
 import secrets
 from datetime import datetime, timedelta
 
 from database import get_db
-from database.tenant_models import Tenant, User, Listing, Category, Endorsement, UsageMeter
+from database.tenant_models import (
+    Tenant, User, Listing, ListingEndorsementStats, Category, Endorsement, UsageMeter
+)
 from backend.schemas.tenant_schemas import (
     AuthRegister, AuthLogin, AuthResponse, TenantResponse, UserResponse,
     ListingCreate, ListingUpdate, ListingResponse, SearchRequest, SearchResponse,
-    EndorsementCreate, EndorsementResponse, UsageResponse, HealthResponse,
+    ListingChangesResponse, ListingBatchResponse,
+    EndorsementCreate, EndorsementResponse, EndorsementAcceptedResponse, EndorsementListResponse, EndorsementSummaryResponse,
+    UsageResponse, HealthResponse,
     ApiKeyResponse, ErrorResponse
 )
 from backend.core.config import settings
+from backend.core.serialization import (
+    LISTING_FIELDS, LISTING_LIST_FIELDS, dumps, json_response, parse_fields,
+    serialize_endorsement, serialize_listing
+)
+from backend.core.cursors import decode_cursor, encode_cursor, parse_position, position
+from backend.core.http_cache import cache_headers, etag_for, etag_for_body, etag_matches, not_modified
+from backend.services.slugs import SlugAllocationError, insert_with_unique_slug, slugify
+from backend.services.anti_spam import EndorsementGate, endorsement_gate, endorsement_txn_hash, hash_ip
+from backend.services.endorsement_queue import QueueFull, endorsement_queue
+from backend.services.endorsement_stats import record_endorsements, summarize
+from backend.services.purge import mark_listing_deleted, run_listing_purge
+from backend.services.change_feed import fetch_listing_changes
+from backend.services.listing_export import EXPORT_MEDIA_TYPES, parquet_available, stream_listings_export
 
 router = APIRouter(prefix="/v1", tags=["tenant-api"])
 security = HTTPBearer()
 
+# Upper bound on ids/slugs accepted by GET /listings:batchGet
+MAX_BATCH_GET = 200
+# Page size for GET /endorsements when only a cursor is passed
+DEFAULT_ENDORSEMENT_PAGE = 50
+
 
 # Authentication Dependencies
 def get_current_tenant(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
@@ -34,7 +59,7 @@ def get_current_tenant(credentials: HTTPAuthorizationCredentials = Depends(secur
         # Hash the API key and look up tenant
         api_key_hash = hashlib.sha256(token.encode()).hexdigest()
         tenant = db.query(Tenant).filter(Tenant.api_key_hash == api_key_hash).first()
-        if not tenant:
+        if not tenant or tenant.plan_status == "deleted":
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid API key"
@@ -192,40 +217,27 @@ async def create_listing(
     db: Session = Depends(get_db)
 ):
     """Create new business listing"""
-    # Generate slug from name
-    slug = listing_data.name.lower().replace(" ", "-").replace("&", "and")
+    values = listing_data.dict()
+    values.update(tenant_id=tenant.id, status="active")
     
-    listing = Listing(
-        tenant_id=tenant.id,
-        name=listing_data.name,
-        slug=slug,
-        description=listing_data.description,
-        website=listing_data.website,
-        phone=listing_data.phone,
-        email=listing_data.email,
-        addr_line1=listing_data.addr_line1,
-        city=listing_data.city,
-        region=listing_data.region,
-        postal=listing_data.postal,
-        country=listing_data.country,
-        lat=listing_data.lat,
-        lng=listing_data.lng,
-        category_id=listing_data.category_id,
-        tags=listing_data.tags,
-        hours_json=listing_data.hours_json,
-        images_json=listing_data.images_json,
-        status="active"
-    )
-    
-    db.add(listing)
+    # Single INSERT ... ON CONFLICT per attempt, no uniqueness pre-check
+    try:
+        listing = insert_with_unique_slug(
+            db, Listing, values, slugify(listing_data.name), ("tenant_id", "slug")
+        )
+    except SlugAllocationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
     db.commit()
-    db.refresh(listing)
     
-    return ListingResponse.from_orm(listing)
+    return json_response(serialize_listing(listing))
 
 
 @router.get("/listings", response_model=SearchResponse)
 async def search_listings(
+    request: Request,
     q: Optional[str] = Query(None, description="Search query"),
     category: Optional[int] = Query(None, description="Category ID filter"),
     lat: Optional[float] = Query(None, description="Latitude for geo search"),
@@ -234,11 +246,30 @@ async def search_listings(
     sort: str = Query("relevance", description="Sort order"),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(20, ge=1, le=100, description="Items per page"),
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated listing fields to return; description, tags, hours_json "
+                    "and images_json are omitted unless requested"
+    ),
     tenant: Tenant = Depends(get_current_tenant),
     db: Session = Depends(get_db)
 ):
     """Search business listings with filters and geo search"""
-    query = db.query(Listing).filter(Listing.tenant_id == tenant.id)
+    try:
+        selected = parse_fields(fields, LISTING_FIELDS, LISTING_LIST_FIELDS)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    # Only load the selected columns; large Text/JSON columns stay deferred
+    query = db.query(Listing).options(
+        load_only(*[getattr(Listing, field) for field in selected])
+    ).filter(
+        Listing.tenant_id == tenant.id,
+        Listing.status.is_distinct_from("deleted")
+    )
     
     # Text search
     if q:
@@ -274,25 +305,129 @@ async def search_listings(
     offset = (page - 1) * limit
     listings = query.offset(offset).limit(limit).all()
     
-    return SearchResponse(
-        listings=[ListingResponse.from_orm(listing) for listing in listings],
-        total=total,
-        page=page,
-        limit=limit,
-        has_next=(offset + limit) < total
+    # Fast path: trusted rows straight to orjson, no SearchResponse re-validation
+    body = dumps({
+        "listings": [serialize_listing(listing, selected) for listing in listings],
+        "total": total,
+        "page": page,
+        "limit": limit,
+        "has_next": (offset + limit) < total
+    })
+    
+    # Result sets have no single version column, so tag the serialized page
+    etag = etag_for_body(body)
+    if etag_matches(request, etag):
+        return not_modified(etag, "search")
+    
+    return json_response(body=body, headers=cache_headers(etag, "search"))
+
+
+@router.get("/listings/export")
+async def export_listings(
+    format: str = Query("ndjson", pattern="^(ndjson|csv|parquet)$", description="Export format"),
+    tenant: Tenant = Depends(get_current_tenant),
+    db: Session = Depends(get_db)
+):
+    """Stream a full dump of the tenant's listings from a server-side cursor"""
+    if format == "parquet" and not parquet_available():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Parquet export requires pyarrow to be installed"
+        )
+    
+    filename = f"{tenant.slug}-listings.{format}"
+    return StreamingResponse(
+        stream_listings_export(db, tenant.id, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
     )
 
 
+@router.get("/listings/changes", response_model=ListingChangesResponse)
+async def get_listing_changes(
+    since: Optional[str] = Query(None, description="Cursor from a previous response; omit for a full sync"),
+    limit: int = Query(500, ge=1, le=1000, description="Maximum changes to return"),
+    tenant: Tenant = Depends(get_current_tenant),
+    db: Session = Depends(get_db)
+):
+    """Get listing creates/updates/deletes (tombstones) in commit order since a cursor"""
+    try:
+        feed = fetch_listing_changes(db, tenant.id, since, limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    for change in feed["changes"]:
+        if change["listing"] is not None:
+            change["listing"] = serialize_listing(change["listing"])
+    
+    return json_response(feed)
+
+
+@router.get("/listings:batchGet", response_model=ListingBatchResponse)
+async def batch_get_listings(
+    ids: Optional[str] = Query(None, description="Comma-separated listing IDs"),
+    slugs: Optional[str] = Query(None, description="Comma-separated listing slugs"),
+    fields: Optional[str] = Query(None, description="Comma-separated listing fields to return"),
+    tenant: Tenant = Depends(get_current_tenant),
+    db: Session = Depends(get_db)
+):
+    """Get many listings in one query, in request order, reporting any not found"""
+    if bool(ids) == bool(slugs):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide exactly one of ids or slugs"
+        )
+    
+    try:
+        keys = [key.strip() for key in (ids or slugs).split(",") if key.strip()]
+        if ids:
+            keys = [int(key) for key in keys]
+        selected = parse_fields(fields, LISTING_FIELDS, LISTING_FIELDS)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    keys = list(dict.fromkeys(keys))  # De-duplicate, keep request order
+    if len(keys) > MAX_BATCH_GET:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BATCH_GET} listings per request"
+        )
+    
+    key_column = Listing.id if ids else Listing.slug
+    columns = set(selected) | {key_column.key}
+    listings = db.query(Listing).options(
+        load_only(*[getattr(Listing, field) for field in columns])
+    ).filter(
+        Listing.tenant_id == tenant.id,
+        key_column.in_(keys),
+        Listing.status.is_distinct_from("deleted")
+    ).all()
+    
+    found = {getattr(listing, key_column.key): listing for listing in listings}
+    return json_response({
+        "listings": [serialize_listing(found[key], selected) for key in keys if key in found],
+        "missing": [key for key in keys if key not in found]
+    })
+
+
 @router.get("/listings/{listing_id}", response_model=ListingResponse)
 async def get_listing(
     listing_id: int,
+    request: Request,
     tenant: Tenant = Depends(get_current_tenant),
     db: Session = Depends(get_db)
 ):
     """Get specific business listing"""
     listing = db.query(Listing).filter(
         Listing.id == listing_id,
-        Listing.tenant_id == tenant.id
+        Listing.tenant_id == tenant.id,
+        Listing.status.is_distinct_from("deleted")
     ).first()
     
     if not listing:
@@ -301,7 +436,50 @@ async def get_listing(
             detail="Listing not found"
         )
     
-    return ListingResponse.from_orm(listing)
+    # Primary-key lookup of the pre-aggregated endorsement stats
+    stats = db.get(ListingEndorsementStats, listing.id)
+    
+    # Unchanged listings skip serialization and payload entirely
+    etag = etag_for(
+        tenant.id, listing.id, listing.updated_at.isoformat(),
+        stats.updated_at.isoformat() if stats else None
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag, "listing")
+    
+    payload = serialize_listing(listing)
+    payload["endorsement_summary"] = summarize(listing.id, stats)
+    return json_response(payload, headers=cache_headers(etag, "listing"))
+
+
+@router.get("/listings/{listing_id}/endorsements/summary", response_model=EndorsementSummaryResponse)
+async def get_listing_endorsement_summary(
+    listing_id: int,
+    tenant: Tenant = Depends(get_current_tenant),
+    db: Session = Depends(get_db)
+):
+    """Get endorsement count, would-repeat percentage and top tags for a listing"""
+    stats = db.get(ListingEndorsementStats, listing_id)
+    
+    if stats is None:
+        # No endorsements yet - still 404 for listings outside this tenant
+        exists = db.query(Listing.id).filter(
+            Listing.id == listing_id,
+            Listing.tenant_id == tenant.id,
+            Listing.status.is_distinct_from("deleted")
+        ).first()
+        if not exists:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Listing not found"
+            )
+    elif stats.tenant_id != tenant.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Listing not found"
+        )
+    
+    return json_response(summarize(listing_id, stats))
 
 
 @router.put("/listings/{listing_id}", response_model=ListingResponse)
@@ -314,7 +492,8 @@ async def update_listing(
     """Update business listing"""
     listing = db.query(Listing).filter(
         Listing.id == listing_id,
-        Listing.tenant_id == tenant.id
+        Listing.tenant_id == tenant.id,
+        Listing.status.is_distinct_from("deleted")
     ).first()
     
     if not listing:
@@ -327,23 +506,26 @@ async def update_listing(
     for field, value in listing_data.dict(exclude_unset=True).items():
         setattr(listing, field, value)
     
-    listing.updated_at = datetime.utcnow()
+    # Database clock, so the change feed orders updates consistently with inserts
+    listing.updated_at = func.now()
     db.commit()
     db.refresh(listing)
     
-    return ListingResponse.from_orm(listing)
+    return json_response(serialize_listing(listing))
 
 
 @router.delete("/listings/{listing_id}")
 async def delete_listing(
     listing_id: int,
+    background_tasks: BackgroundTasks,
     tenant: Tenant = Depends(get_current_tenant),
     db: Session = Depends(get_db)
 ):
     """Delete business listing"""
     listing = db.query(Listing).filter(
         Listing.id == listing_id,
-        Listing.tenant_id == tenant.id
+        Listing.tenant_id == tenant.id,
+        Listing.status.is_distinct_from("deleted")
     ).first()
     
     if not listing:
@@ -352,22 +534,73 @@ async def delete_listing(
             detail="Listing not found"
         )
     
-    db.delete(listing)
-    db.commit()
+    # Soft-mark (and tombstone) now; endorsements and the row are purged in batches
+    mark_listing_deleted(db, listing)
+    background_tasks.add_task(run_listing_purge, listing_id)
     
     return {"message": "Listing deleted successfully"}
 
 
 # Endorsement Endpoints
-@router.post("/endorsements", response_model=EndorsementResponse)
+def _client_ip(request: Request) -> Optional[str]:
+    """Client address, honouring X-Forwarded-For only when configured to"""
+    if settings.ENDORSEMENT_TRUST_FORWARDED_FOR:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else None
+
+
+@router.post(
+    "/endorsements",
+    response_model=EndorsementResponse,
+    responses={202: {"model": EndorsementAcceptedResponse}}
+)
 async def create_endorsement(
+    request: Request,
     endorsement_data: EndorsementCreate,
+    mode: str = Query("sync", pattern="^(sync|async)$", description="async queues the write and returns 202"),
     tenant: Tenant = Depends(get_current_tenant),
     db: Session = Depends(get_db)
 ):
     """Create customer endorsement"""
-    # Generate anti-spam transaction hash
-    txn_hash = hashlib.sha256(f"{endorsement_data.listing_id}{datetime.utcnow().isoformat()}".encode()).hexdigest()
+    ip_hash = hash_ip(_client_ip(request))
+    txn_hash = endorsement_txn_hash(
+        tenant.id, endorsement_data.listing_id, ip_hash,
+        endorsement_data.would_repeat, endorsement_data.tags, endorsement_data.comment
+    )
+    
+    # In-memory checks, before any write is attempted; the submission is only
+    # counted against them once it has been committed or queued
+    rejection = endorsement_gate.check(tenant.id, endorsement_data.listing_id, ip_hash, txn_hash)
+    if rejection == EndorsementGate.RATE_LIMITED:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many endorsements for this listing, try again later",
+            headers={"Retry-After": str(settings.ENDORSEMENT_RATE_WINDOW_SECONDS)}
+        )
+    if rejection == EndorsementGate.DUPLICATE:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Duplicate endorsement"
+        )
+    
+    # The foreign key alone would accept another tenant's listing (and the
+    # stats would follow it there), and the async flusher can't report a
+    # failure back, so check ownership before either write path
+    exists = db.query(Listing.id).filter(
+        Listing.id == endorsement_data.listing_id,
+        Listing.tenant_id == tenant.id,
+        Listing.status.is_distinct_from("deleted")
+    ).first()
+    if not exists:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Listing not found"
+        )
+    
+    if mode == "async":
+        return _enqueue_endorsement(tenant, endorsement_data, txn_hash, ip_hash)
     
     endorsement = Endorsement(
         tenant_id=tenant.id,
@@ -376,31 +609,150 @@ async def create_endorsement(
         tags=endorsement_data.tags,
         comment=endorsement_data.comment,
         txn_hash=txn_hash,
-        ip_hash="hashed_ip_placeholder"  # TODO: Get real IP and hash it
+        ip_hash=ip_hash
     )
     
-    db.add(endorsement)
-    db.commit()
+    try:
+        db.add(endorsement)
+        db.flush()
+        # Same transaction, so the aggregates never drift from the endorsements table
+        record_endorsements(db, [endorsement])
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        if "txn_hash" in str(e.orig):
+            # Duplicate that went to another worker, so the gate never saw it
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Duplicate endorsement"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Listing not found"
+        )
+    endorsement_gate.record(tenant.id, endorsement_data.listing_id, ip_hash, txn_hash)
     db.refresh(endorsement)
     
     return EndorsementResponse.from_orm(endorsement)
 
 
-@router.get("/endorsements", response_model=List[EndorsementResponse])
+def _enqueue_endorsement(tenant: Tenant, endorsement_data: EndorsementCreate,
+                         txn_hash: str, ip_hash: str):
+    """Hand an endorsement to the write-behind queue"""
+    try:
+        endorsement_queue.submit({
+            "tenant_id": tenant.id,
+            "listing_id": endorsement_data.listing_id,
+            "would_repeat": endorsement_data.would_repeat,
+            "tags": endorsement_data.tags,
+            "comment": endorsement_data.comment,
+            "txn_hash": txn_hash,
+            "ip_hash": ip_hash,
+            "created_at": datetime.utcnow()
+        })
+    except QueueFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Endorsement queue is full, retry shortly",
+            headers={"Retry-After": "1"}
+        )
+    endorsement_gate.record(tenant.id, endorsement_data.listing_id, ip_hash, txn_hash)
+    
+    return json_response(
+        {"status": "accepted", "txn_hash": txn_hash, "listing_id": endorsement_data.listing_id},
+        status_code=status.HTTP_202_ACCEPTED
+    )
+
+
+@router.get("/endorsements", response_model=Union[List[EndorsementResponse], EndorsementListResponse])
 async def get_endorsements(
     listing_id: Optional[int] = Query(None, description="Filter by listing ID"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size; returns a paginated envelope"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    format: str = Query("json", pattern="^(json|ndjson)$", description="ndjson streams every endorsement"),
     tenant: Tenant = Depends(get_current_tenant),
     db: Session = Depends(get_db)
 ):
-    """Get endorsements with optional listing filter"""
-    query = db.query(Endorsement).filter(Endorsement.tenant_id == tenant.id)
-    
+    """
+    Get endorsements newest first
+
+    Without ``limit`` or ``cursor`` the response is the full list, as it has
+    always been, streamed from a server-side cursor. Passing either opts in
+    to keyset pagination on (created_at, id), which returns
+    ``{endorsements, next_cursor, has_next}``.
+    """
+    conditions = [Endorsement.tenant_id == tenant.id]
     if listing_id:
-        query = query.filter(Endorsement.listing_id == listing_id)
+        conditions.append(Endorsement.listing_id == listing_id)
+    
+    if format == "ndjson":
+        return StreamingResponse(
+            _stream_endorsements(db, conditions),
+            media_type="application/x-ndjson"
+        )
     
-    endorsements = query.order_by(Endorsement.created_at.desc()).all()
+    if limit is None and cursor is None:
+        return StreamingResponse(
+            _stream_endorsements(db, conditions, json_array=True),
+            media_type="application/json"
+        )
+    limit = limit or DEFAULT_ENDORSEMENT_PAGE
     
-    return [EndorsementResponse.from_orm(endorsement) for endorsement in endorsements]
+    if cursor:
+        try:
+            after = parse_position(decode_cursor(cursor).get("p"))
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        if after:
+            conditions.append(tuple_(Endorsement.created_at, Endorsement.id) < after)
+    
+    # Served from idx_endorsements_tenant_created; no OFFSET, no full materialization
+    endorsements = db.query(Endorsement).filter(*conditions).order_by(
+        Endorsement.created_at.desc(), Endorsement.id.desc()
+    ).limit(limit + 1).all()
+    
+    has_next = len(endorsements) > limit
+    endorsements = endorsements[:limit]
+    next_cursor = None
+    if has_next:
+        last = endorsements[-1]
+        next_cursor = encode_cursor({"p": position(last.created_at, last.id)})
+    
+    return json_response({
+        "endorsements": [serialize_endorsement(endorsement) for endorsement in endorsements],
+        "next_cursor": next_cursor,
+        "has_next": has_next
+    })
+
+
+def _stream_endorsements(db: Session, conditions: list, json_array: bool = False):
+    """NDJSON (or one JSON array) from a server-side cursor, one batch of rows at a time"""
+    stmt = select(Endorsement).where(*conditions).order_by(
+        Endorsement.created_at.desc(), Endorsement.id.desc()
+    ).execution_options(yield_per=1000)
+    
+    result = db.scalars(stmt)
+    try:
+        if json_array:
+            yield b"["
+        first = True
+        for batch in result.partitions():
+            rows = [dumps(serialize_endorsement(endorsement)) for endorsement in batch]
+            if json_array:
+                yield (b"" if first else b",") + b",".join(rows)
+            else:
+                yield b"".join(row + b"\n" for row in rows)
+            first = False
+            # Drop the batch from the identity map so memory stays flat
+            for endorsement in batch:
+                db.expunge(endorsement)
+        if json_array:
+            yield b"]"
+    finally:
+        result.close()
 
 
 # Media Upload Endpoint
@@ -3,7 +3,7 @@ Pydantic schemas for white-label multi-tenant Business Directory Platform
 Following the master project specifications exactly
 """
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
 from datetime import datetime
 from enum import Enum
 
@@ -18,6 +18,7 @@ class PlanStatusEnum(str, Enum):
     ACTIVE = "active"
     SUSPENDED = "suspended"
     CANCELLED = "cancelled"
+    DELETED = "deleted"
 
 
 class RoleEnum(str, Enum):
@@ -30,6 +31,7 @@ class StatusEnum(str, Enum):
     ACTIVE = "active"
     PENDING = "pending"
     SUSPENDED = "suspended"
+    DELETED = "deleted"
 
 
 # Tenant Schemas
@@ -130,6 +132,20 @@ class ListingUpdate(BaseModel):
     images_json: Optional[List[str]] = None
 
 
+class EndorsementTagCount(BaseModel):
+    tag: str
+    count: int
+
+
+class EndorsementSummaryResponse(BaseModel):
+    listing_id: int
+    endorsement_count: int
+    would_repeat_count: int
+    would_repeat_pct: float
+    top_tags: List[EndorsementTagCount]
+    updated_at: Optional[datetime] = None
+
+
 class ListingResponse(ListingBase):
     id: int
     tenant_id: int
@@ -138,11 +154,32 @@ class ListingResponse(ListingBase):
     status: str
     created_at: datetime
     updated_at: datetime
+    endorsement_summary: Optional[EndorsementSummaryResponse] = None  # Detail reads only
     
     class Config:
         from_attributes = True
 
 
+class ListingBatchResponse(BaseModel):
+    listings: List[ListingResponse]
+    missing: List[Union[int, str]]
+
+
+# Change Feed Schemas
+class ListingChange(BaseModel):
+    op: str = Field(..., pattern="^(create|update|delete)$")
+    id: int
+    slug: Optional[str] = None
+    changed_at: datetime
+    listing: Optional[ListingResponse] = None
+
+
+class ListingChangesResponse(BaseModel):
+    changes: List[ListingChange]
+    next_cursor: str
+    has_more: bool
+
+
 # Category Schemas
 class CategoryBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=100)
@@ -181,6 +218,13 @@ class EndorsementCreate(EndorsementBase):
     pass
 
 
+class EndorsementAcceptedResponse(BaseModel):
+    """Returned with 202 when an endorsement is queued for a batched write"""
+    status: str = "accepted"
+    txn_hash: str  # Provisional id; the stored endorsement carries the same txn_hash
+    listing_id: int
+
+
 class EndorsementResponse(EndorsementBase):
     id: int
     tenant_id: int
@@ -193,6 +237,12 @@ class EndorsementResponse(EndorsementBase):
         from_attributes = True
 
 
+class EndorsementListResponse(BaseModel):
+    endorsements: List[EndorsementResponse]
+    next_cursor: Optional[str] = None
+    has_next: bool
+
+
 # Search Schemas
 class SearchRequest(BaseModel):
     q: Optional[str] = None
@@ -0,0 +1,196 @@
+"""
+In-process anti-spam gate for endorsements
+
+Checks run before the request opens a database transaction, so duplicate or
+flooding submissions are rejected without costing a write. State is per
+worker process: with N workers the effective limit is up to N times the
+configured one, and the unique index on ``endorsements.txn_hash`` remains the
+backstop for duplicates that reach different workers.
+"""
+import hashlib
+import hmac
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Dict, Hashable, Iterable, Optional
+
+from backend.core.config import settings
+
+
+def hash_ip(ip: Optional[str]) -> str:
+    """Keyed hash of a client IP, so stored hashes can't be reversed by brute force"""
+    key = (settings.ENDORSEMENT_IP_SALT or settings.SECRET_KEY).encode()
+    return hmac.new(key, (ip or "unknown").encode(), hashlib.sha256).hexdigest()
+
+
+def endorsement_txn_hash(tenant_id: int, listing_id: int, ip_hash: str, would_repeat: bool,
+                         tags: Optional[Iterable[str]], comment: Optional[str],
+                         now: Optional[datetime] = None) -> str:
+    """
+    Deterministic fingerprint of an endorsement submission.
+
+    The same client sending the same endorsement for the same listing on the
+    same UTC day gets the same hash, so resubmissions collide on txn_hash.
+    """
+    day = (now or datetime.utcnow()).strftime("%Y-%m-%d")
+    parts = [
+        str(tenant_id), str(listing_id), ip_hash, "1" if would_repeat else "0",
+        ",".join(sorted(str(tag) for tag in tags or [])), (comment or "").strip(), day
+    ]
+    return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+
+
+class SlidingWindowLimiter:
+    """
+    At most ``limit`` events per key in any ``window_seconds`` span.
+
+    Keys are kept in order of their latest event, so keys idle for a whole
+    window are expired from the front without scanning the map, and at most
+    ``max_keys`` are held: past that the least recently active are evicted.
+    """
+
+    def __init__(self, limit: int, window_seconds: float, max_keys: int = 100_000):
+        self.limit = limit
+        self.window = window_seconds
+        self.max_keys = max_keys
+        self._events: "OrderedDict[Hashable, deque]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def allowed(self, key: Hashable) -> bool:
+        """Whether one more event for ``key`` would stay within the limit"""
+        now = time.monotonic()
+        with self._lock:
+            events = self._prune(key, now - self.window)
+            return events is None or len(events) < self.limit
+
+    def record(self, key: Hashable):
+        """Count an event for ``key``"""
+        now = time.monotonic()
+        with self._lock:
+            events = self._prune(key, now - self.window)
+            if events is not None:
+                self._events.move_to_end(key)
+            else:
+                events = self._events[key] = deque()
+                if len(self._events) > self.max_keys:
+                    self._events.popitem(last=False)
+            events.append(now)
+
+    def _prune(self, key: Hashable, cutoff: float) -> Optional[deque]:
+        """Expire idle keys, then drop ``key``'s events outside the window"""
+        self._expire(cutoff)
+        events = self._events.get(key)
+        if events is not None:
+            while events and events[0] <= cutoff:
+                events.popleft()
+        return events
+
+    def _expire(self, cutoff: float):
+        """Drop keys whose latest event is outside the window"""
+        while self._events:
+            events = next(iter(self._events.values()))
+            if events and events[-1] > cutoff:
+                break
+            self._events.popitem(last=False)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def add(self, item: str):
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+
+class RecentFingerprints:
+    """
+    Remembers fingerprints seen within roughly the last ``ttl_seconds``.
+
+    Two Bloom filters are rotated: lookups check both, inserts go to the
+    current one, and the older one is discarded every ``ttl_seconds`` (or when
+    the current one reaches capacity), so memory stays fixed.
+    """
+
+    def __init__(self, capacity: int, error_rate: float, ttl_seconds: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.ttl = ttl_seconds
+        self._current = BloomFilter(capacity, error_rate)
+        self._previous = BloomFilter(capacity, error_rate)
+        self._rotated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __contains__(self, fingerprint: str) -> bool:
+        """Whether the fingerprint was remembered recently"""
+        with self._lock:
+            self._rotate()
+            return fingerprint in self._current or fingerprint in self._previous
+
+    def add(self, fingerprint: str):
+        with self._lock:
+            self._rotate()
+            self._current.add(fingerprint)
+
+    def _rotate(self):
+        now = time.monotonic()
+        if now - self._rotated_at >= self.ttl or self._current.count >= self.capacity:
+            self._previous = self._current
+            self._current = BloomFilter(self.capacity, self.error_rate)
+            self._rotated_at = now
+
+
+class EndorsementGate:
+    """Rate limit per (tenant, listing, client) and reject recent duplicates"""
+
+    RATE_LIMITED = "rate_limited"
+    DUPLICATE = "duplicate"
+
+    def __init__(self, limit: int, window_seconds: float, capacity: int,
+                 error_rate: float, dedup_ttl_seconds: float):
+        self.limiter = SlidingWindowLimiter(limit, window_seconds)
+        self.recent = RecentFingerprints(capacity, error_rate, dedup_ttl_seconds)
+
+    def check(self, tenant_id: int, listing_id: int, ip_hash: str, txn_hash: str) -> Optional[str]:
+        """Return a rejection reason, or None if the submission may proceed"""
+        if not self.limiter.allowed((tenant_id, listing_id, ip_hash)):
+            return self.RATE_LIMITED
+        if txn_hash in self.recent:
+            return self.DUPLICATE
+        return None
+
+    def record(self, tenant_id: int, listing_id: int, ip_hash: str, txn_hash: str):
+        """
+        Count an accepted submission against the rate limit and remember its
+        fingerprint. Call only once it is committed or queued, so a failed
+        write neither uses up a slot nor turns the client's retry into a 409.
+        """
+        self.limiter.record((tenant_id, listing_id, ip_hash))
+        self.recent.add(txn_hash)
+
+
+endorsement_gate = EndorsementGate(
+    limit=settings.ENDORSEMENT_RATE_LIMIT,
+    window_seconds=settings.ENDORSEMENT_RATE_WINDOW_SECONDS,
+    capacity=settings.ENDORSEMENT_DEDUP_CAPACITY,
+    error_rate=settings.ENDORSEMENT_DEDUP_ERROR_RATE,
+    dedup_ttl_seconds=settings.ENDORSEMENT_DEDUP_TTL_SECONDS,
+)
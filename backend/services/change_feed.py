@@ -0,0 +1,97 @@
+"""
+Incremental change feed for tenant listings
+"""
+import heapq
+from datetime import timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.orm import Session
+
+from database.tenant_models import Listing, ListingTombstone
+from backend.core.cursors import decode_cursor, encode_cursor, parse_position, position
+
+# now() is the transaction start time, so a slow transaction can commit rows
+# stamped earlier than rows already handed out. Changes younger than this are
+# held back until every transaction that could predate them has committed.
+SETTLE_SECONDS = 5
+
+
+def fetch_listing_changes(db: Session, tenant_id: int, since: Optional[str], limit: int) -> Dict:
+    """
+    Return up to ``limit`` creates/updates/deletes after the ``since`` cursor.
+
+    Upserts are read from listings via idx_listings_tenant_updated and deletes
+    from listing_tombstones; both are keyset-scanned on (timestamp, id) and
+    merged in timestamp order. Raises ValueError for a malformed cursor.
+    """
+    state = decode_cursor(since) if since else {}
+    updated_after = parse_position(state.get("u"))
+    deleted_after = parse_position(state.get("d"))
+    horizon = func.now() - timedelta(seconds=SETTLE_SECONDS)
+
+    listings_query = select(Listing).where(
+        Listing.tenant_id == tenant_id,
+        Listing.updated_at < horizon,
+        Listing.status.is_distinct_from("deleted")  # Already tombstoned, awaiting purge
+    )
+    if updated_after:
+        listings_query = listings_query.where(tuple_(Listing.updated_at, Listing.id) > updated_after)
+    listings = db.scalars(
+        listings_query.order_by(Listing.updated_at, Listing.id).limit(limit + 1)
+    ).all()
+
+    tombstones_query = select(ListingTombstone).where(
+        ListingTombstone.tenant_id == tenant_id,
+        ListingTombstone.deleted_at < horizon
+    )
+    if deleted_after:
+        tombstones_query = tombstones_query.where(
+            tuple_(ListingTombstone.deleted_at, ListingTombstone.id) > deleted_after
+        )
+    tombstones = db.scalars(
+        tombstones_query.order_by(ListingTombstone.deleted_at, ListingTombstone.id).limit(limit + 1)
+    ).all()
+
+    merged = heapq.merge(
+        ((listing.updated_at, 0, listing.id, listing) for listing in listings),
+        ((tombstone.deleted_at, 1, tombstone.id, tombstone) for tombstone in tombstones),
+    )
+
+    # Create vs update is relative to what the client had seen before this page;
+    # updated_after itself advances as the page is built
+    seen_through = updated_after[0] if updated_after else None
+    changes = []
+    for changed_at, kind, row_id, row in merged:
+        if len(changes) == limit:
+            break
+        if kind == 0:
+            created = seen_through is None or row.created_at > seen_through
+            changes.append({
+                "op": "create" if created else "update",
+                "id": row.id,
+                "changed_at": changed_at,
+                "listing": row
+            })
+            updated_after = (changed_at, row_id)
+        else:
+            changes.append({
+                "op": "delete",
+                "id": row.listing_id,
+                "slug": row.slug,
+                "changed_at": changed_at,
+                "listing": None
+            })
+            deleted_after = (changed_at, row_id)
+
+    next_state = {}
+    if updated_after:
+        next_state["u"] = position(*updated_after)
+    if deleted_after:
+        next_state["d"] = position(*deleted_after)
+
+    return {
+        "changes": changes,
+        "next_cursor": encode_cursor(next_state),
+        "has_more": len(listings) + len(tombstones) > len(changes)
+    }
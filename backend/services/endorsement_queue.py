@@ -0,0 +1,232 @@
+"""
+Write-behind queue for endorsements
+
+In async-accept mode the API validates an endorsement, puts it on a bounded
+in-process queue and answers 202 straight away. A single flusher task drains
+the queue and writes each batch with one multi-row
+INSERT ... ON CONFLICT (txn_hash) DO NOTHING plus one stats upsert per
+listing, in one transaction.
+
+When the queue is full, ``submit`` raises ``QueueFull`` and the caller should
+shed load (503). On shutdown the queue is flushed. Anything that can't be
+written (database down, flush timed out) is appended to a JSONL spill file,
+which is replayed on the next startup.
+"""
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from database.database import SessionLocal
+from database.tenant_models import Endorsement
+from backend.core.config import settings
+from backend.services.endorsement_stats import record_endorsements
+
+logger = logging.getLogger(__name__)
+
+QueueFull = asyncio.QueueFull
+
+ROW_COLUMNS = ("tenant_id", "listing_id", "would_repeat", "tags", "comment", "txn_hash", "ip_hash", "created_at")
+
+
+class EndorsementQueue:
+    """Bounded queue of endorsement rows with a batching flusher task"""
+
+    def __init__(self, max_size: int, batch_size: int, flush_interval: float, spill_path: str):
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.spill_path = spill_path
+        self._queue: Optional[asyncio.Queue] = None
+        self._flusher: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._flusher is not None and not self._flusher.done()
+
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    def submit(self, row: Dict):
+        """Enqueue a row without waiting; raises QueueFull under backpressure"""
+        if not self.running:
+            raise QueueFull("Endorsement queue is not running")
+        self._queue.put_nowait(row)
+
+    async def start(self):
+        """Replay any spilled rows, then start the flusher"""
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        await asyncio.to_thread(self._replay_spill)
+        self._flusher = asyncio.create_task(self._run(), name="endorsement-flusher")
+        logger.info("Endorsement write-behind queue started")
+
+    async def stop(self, timeout: float = 10.0):
+        """Stop the flusher, write what's left, and spill anything that doesn't make it"""
+        if self._flusher is None:
+            return
+        self._flusher.cancel()
+        try:
+            await self._flusher
+        except asyncio.CancelledError:
+            pass
+        self._flusher = None
+
+        pending = self._drain()
+        if not pending:
+            return
+        try:
+            while pending:
+                await asyncio.wait_for(asyncio.to_thread(write_batch, pending[:self.batch_size]), timeout)
+                pending = pending[self.batch_size:]
+        except Exception as e:
+            logger.error(f"Final endorsement flush failed, spilling {len(pending)} rows: {str(e)}")
+            self._spill(pending)
+
+    async def _run(self):
+        batch: List[Dict] = []
+        while True:
+            try:
+                # Wait for the first row, then take whatever else is already queued
+                batch.append(await self._queue.get())
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except asyncio.QueueEmpty:
+                        break
+                await asyncio.to_thread(write_batch, batch)
+                batch = []
+                await asyncio.sleep(self.flush_interval)
+            except asyncio.CancelledError:
+                # Rows taken off the queue go back for stop(); if the write already
+                # landed, ON CONFLICT makes the retry a no-op
+                self._requeue(batch)
+                raise
+            except OperationalError as e:
+                logger.error(f"Database unavailable, spilling {len(batch)} endorsements: {str(e)}")
+                self._spill(batch)
+                batch = []
+            except Exception as e:
+                logger.error(f"Error flushing {len(batch)} endorsements, spilling them: {str(e)}")
+                self._spill(batch)
+                batch = []
+
+    def _drain(self) -> List[Dict]:
+        rows = []
+        while self._queue is not None and not self._queue.empty():
+            rows.append(self._queue.get_nowait())
+        return rows
+
+    def _requeue(self, rows: List[Dict]):
+        overflow = []
+        for row in rows:
+            try:
+                self._queue.put_nowait(row)
+            except asyncio.QueueFull:
+                overflow.append(row)
+        if overflow:
+            self._spill(overflow)
+
+    def _spill(self, rows: List[Dict]):
+        """Append rows to the spill file and fsync it"""
+        directory = os.path.dirname(self.spill_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.spill_path, "a", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row, default=_isoformat) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        logger.warning(f"Spilled {len(rows)} endorsements to {self.spill_path}")
+
+    def _replay_spill(self):
+        """Write spilled rows from a previous run; keep the file if that fails"""
+        replaying = f"{self.spill_path}.replaying"
+        try:
+            os.replace(self.spill_path, replaying)
+        except FileNotFoundError:
+            return  # No spill file, or another worker is already replaying it
+        rows: List[Dict] = []
+        pending = rows
+        try:
+            with open(replaying, encoding="utf-8", errors="replace") as f:
+                for number, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        rows.append(_parse_row(line))
+                    except (ValueError, TypeError, AttributeError) as e:
+                        # e.g. a line cut short when the process died mid-spill
+                        logger.warning(f"Skipping unreadable spilled endorsement on line {number}: {str(e)}")
+            while pending:
+                write_batch(pending[:self.batch_size])
+                pending = pending[self.batch_size:]
+        except Exception as e:
+            logger.error(f"Could not replay spilled endorsements: {str(e)}")
+            self._spill(pending)
+        else:
+            logger.info(f"Replayed {len(rows)} spilled endorsements")
+        os.remove(replaying)
+
+
+def write_batch(rows: List[Dict]) -> int:
+    """Insert a batch in one transaction and return how many rows were new"""
+    db = SessionLocal()
+    try:
+        try:
+            inserted = _insert(db, rows)
+        except IntegrityError:
+            # A row references a listing purged since it was accepted; isolate it
+            db.rollback()
+            inserted = []
+            for row in rows:
+                try:
+                    with db.begin_nested():
+                        inserted.extend(_insert(db, [row]))
+                except IntegrityError:
+                    logger.warning(f"Dropping endorsement {row['txn_hash']} for listing {row['listing_id']}")
+        record_endorsements(db, inserted)
+        db.commit()
+        logger.debug(f"Flushed {len(inserted)} of {len(rows)} queued endorsements")
+        return len(inserted)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _insert(db, rows: List[Dict]) -> List[Endorsement]:
+    # Duplicates already stored (or repeated within the batch) are skipped
+    stmt = (
+        pg_insert(Endorsement)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=[Endorsement.txn_hash])
+        .returning(Endorsement)
+    )
+    return list(db.scalars(stmt))
+
+
+def _isoformat(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _parse_row(line: str) -> Dict:
+    row = json.loads(line)
+    if row.get("created_at"):
+        row["created_at"] = datetime.fromisoformat(row["created_at"])
+    return {column: row.get(column) for column in ROW_COLUMNS}
+
+
+endorsement_queue = EndorsementQueue(
+    max_size=settings.ENDORSEMENT_QUEUE_MAX_SIZE,
+    batch_size=settings.ENDORSEMENT_QUEUE_BATCH_SIZE,
+    flush_interval=settings.ENDORSEMENT_QUEUE_FLUSH_SECONDS,
+    spill_path=settings.ENDORSEMENT_QUEUE_SPILL_PATH,
+)
@@ -0,0 +1,145 @@
+"""
+Incrementally maintained per-listing endorsement aggregates
+
+``record_endorsements`` runs inside the caller's transaction, so the stats
+row commits (or rolls back) together with the endorsements it counts.
+``rebuild_stats`` recomputes everything from the endorsements table.
+"""
+import logging
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import case, delete, func, insert, null, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from database.tenant_models import Endorsement, ListingEndorsementStats
+
+logger = logging.getLogger(__name__)
+
+TOP_TAGS = 5
+
+
+def record_endorsements(db: Session, endorsements: Iterable) -> None:
+    """Fold new endorsements into their listings' stats rows (caller commits)"""
+    grouped = defaultdict(lambda: {"tenant_id": None, "count": 0, "would_repeat": 0, "tags": Counter()})
+    for endorsement in endorsements:
+        group = grouped[endorsement.listing_id]
+        group["tenant_id"] = endorsement.tenant_id
+        group["count"] += 1
+        group["would_repeat"] += 1 if endorsement.would_repeat else 0
+        group["tags"].update(str(tag) for tag in (endorsement.tags or []))
+
+    for listing_id, group in grouped.items():
+        # One upsert per listing; it also row-locks the stats row for the tag merge
+        stmt = pg_insert(ListingEndorsementStats).values(
+            listing_id=listing_id,
+            tenant_id=group["tenant_id"],
+            endorsement_count=group["count"],
+            would_repeat_count=group["would_repeat"],
+            tag_counts={}
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ListingEndorsementStats.listing_id],
+            set_={
+                "endorsement_count": ListingEndorsementStats.endorsement_count + stmt.excluded.endorsement_count,
+                "would_repeat_count": ListingEndorsementStats.would_repeat_count + stmt.excluded.would_repeat_count,
+                "updated_at": func.now()
+            }
+        ).returning(ListingEndorsementStats.tag_counts)
+        tag_counts = db.execute(stmt).scalar()
+
+        if group["tags"]:
+            merged = Counter(tag_counts or {})
+            merged.update(group["tags"])
+            db.execute(
+                ListingEndorsementStats.__table__.update()
+                .where(ListingEndorsementStats.listing_id == listing_id)
+                .values(tag_counts=dict(merged))
+            )
+
+
+def summarize(listing_id: int, stats: Optional[ListingEndorsementStats]) -> Dict:
+    """Response payload for a stats row (zeros when the listing has none)"""
+    if stats is None:
+        return {
+            "listing_id": listing_id,
+            "endorsement_count": 0,
+            "would_repeat_count": 0,
+            "would_repeat_pct": 0.0,
+            "top_tags": [],
+            "updated_at": None
+        }
+
+    count = stats.endorsement_count or 0
+    top_tags = Counter(stats.tag_counts or {}).most_common(TOP_TAGS)
+    return {
+        "listing_id": listing_id,
+        "endorsement_count": count,
+        "would_repeat_count": stats.would_repeat_count,
+        "would_repeat_pct": round(100.0 * stats.would_repeat_count / count, 1) if count else 0.0,
+        "top_tags": [{"tag": tag, "count": tag_count} for tag, tag_count in top_tags],
+        "updated_at": stats.updated_at
+    }
+
+
+def rebuild_stats(db: Session, tenant_id: Optional[int] = None, batch_size: int = 5000) -> int:
+    """
+    Recompute stats from scratch (optionally for one tenant) and commit.
+
+    Counts come from one GROUP BY; tag counts from a streamed scan ordered by
+    listing, so only one listing's tags are held in memory at a time.
+    Endorsements written while this runs may be missed - run it again.
+    """
+    scope = [Endorsement.tenant_id == tenant_id] if tenant_id is not None else []
+    stats_scope = [ListingEndorsementStats.tenant_id == tenant_id] if tenant_id is not None else []
+
+    db.execute(delete(ListingEndorsementStats).where(*stats_scope))
+
+    counts = (
+        select(
+            Endorsement.listing_id,
+            func.min(Endorsement.tenant_id),
+            func.count(Endorsement.id),
+            func.sum(case((Endorsement.would_repeat.is_(True), 1), else_=0)),
+            null(),
+            func.now()
+        )
+        .where(*scope)
+        .group_by(Endorsement.listing_id)
+    )
+    result = db.execute(
+        insert(ListingEndorsementStats).from_select(
+            ["listing_id", "tenant_id", "endorsement_count", "would_repeat_count", "tag_counts", "updated_at"],
+            counts
+        )
+    )
+    rebuilt = result.rowcount
+
+    tag_rows = db.execute(
+        select(Endorsement.listing_id, Endorsement.tags)
+        .where(Endorsement.tags.isnot(None), *scope)
+        .order_by(Endorsement.listing_id)
+        .execution_options(yield_per=batch_size)
+    )
+    current_listing, tags = None, Counter()
+    for listing_id, endorsement_tags in tag_rows:
+        if listing_id != current_listing:
+            _store_tags(db, current_listing, tags)
+            current_listing, tags = listing_id, Counter()
+        tags.update(str(tag) for tag in endorsement_tags or [])
+    _store_tags(db, current_listing, tags)
+
+    db.commit()
+    logger.info(f"Rebuilt endorsement stats for {rebuilt} listings")
+    return rebuilt
+
+
+def _store_tags(db: Session, listing_id: Optional[int], tags: Counter):
+    if listing_id is None or not tags:
+        return
+    db.execute(
+        ListingEndorsementStats.__table__.update()
+        .where(ListingEndorsementStats.listing_id == listing_id)
+        .values(tag_counts=dict(tags))
+    )
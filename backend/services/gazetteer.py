@@ -0,0 +1,209 @@
+"""
+In-memory gazetteer for extracting US cities and states from article text
+
+Built once from the ``locations`` table: city names, state names,
+two-letter codes and AP-style abbreviations ("Calif.", "Tex.") are loaded
+into a token trie. ``extract`` walks the text's tokens once and returns the
+longest name at each position, then resolves the city/state pair.
+"""
+import logging
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from database.models import Location
+
+logger = logging.getLogger(__name__)
+
+US_STATES = {
+    "AL": "Alabama", "AK": "Alaska", "AZ": "Arizona", "AR": "Arkansas", "CA": "California",
+    "CO": "Colorado", "CT": "Connecticut", "DE": "Delaware", "FL": "Florida", "GA": "Georgia",
+    "HI": "Hawaii", "ID": "Idaho", "IL": "Illinois", "IN": "Indiana", "IA": "Iowa",
+    "KS": "Kansas", "KY": "Kentucky", "LA": "Louisiana", "ME": "Maine", "MD": "Maryland",
+    "MA": "Massachusetts", "MI": "Michigan", "MN": "Minnesota", "MS": "Mississippi", "MO": "Missouri",
+    "MT": "Montana", "NE": "Nebraska", "NV": "Nevada", "NH": "New Hampshire", "NJ": "New Jersey",
+    "NM": "New Mexico", "NY": "New York", "NC": "North Carolina", "ND": "North Dakota", "OH": "Ohio",
+    "OK": "Oklahoma", "OR": "Oregon", "PA": "Pennsylvania", "RI": "Rhode Island", "SC": "South Carolina",
+    "SD": "South Dakota", "TN": "Tennessee", "TX": "Texas", "UT": "Utah", "VT": "Vermont",
+    "VA": "Virginia", "WA": "Washington", "WV": "West Virginia", "WI": "Wisconsin", "WY": "Wyoming",
+    "DC": "District of Columbia",
+}
+
+# AP style abbreviations used in datelines; only counted with their period,
+# since undotted most are ordinary words ("Miss America", "Wash", "Ill")
+AP_ABBREVIATIONS = {
+    "Ala": "AL", "Ariz": "AZ", "Ark": "AR", "Calif": "CA", "Colo": "CO", "Conn": "CT",
+    "Del": "DE", "Fla": "FL", "Ga": "GA", "Ill": "IL", "Ind": "IN", "Kan": "KS", "Ky": "KY",
+    "La": "LA", "Md": "MD", "Mass": "MA", "Mich": "MI", "Minn": "MN", "Miss": "MS", "Mo": "MO",
+    "Mont": "MT", "Neb": "NE", "Nev": "NV", "N.H": "NH", "N.J": "NJ", "N.M": "NM", "N.Y": "NY",
+    "N.C": "NC", "N.D": "ND", "Okla": "OK", "Ore": "OR", "Pa": "PA", "R.I": "RI", "S.C": "SC",
+    "S.D": "SD", "Tenn": "TN", "Tex": "TX", "Vt": "VT", "Va": "VA", "Wash": "WA", "W.Va": "WV",
+    "Wis": "WI", "Wyo": "WY", "D.C": "DC",
+}
+
+# Codes that are also common words ("shot IN the leg", "OR", "ME") only count
+# right after a comma or a city ("Portland, OR" / "Columbus OH")
+AMBIGUOUS_CODES = {"IN", "OR", "ME", "OK", "HI", "OH", "LA", "MA", "PA", "CO", "ID", "AL", "DE", "MO", "GA"}
+
+# Words, dotted abbreviations (N.Y., D.C.) and commas
+TOKEN_PATTERN = re.compile(r"[A-Za-z]\.(?:[A-Za-z]{1,2}\.)+|[A-Za-z]+(?:['-][A-Za-z]+)*\.?|,")
+
+CITY, STATE, CODE, ABBREVIATION = "city", "state", "code", "abbreviation"
+
+
+@dataclass(frozen=True)
+class Place:
+    kind: str
+    state: str
+    city: Optional[str] = None
+    population: int = 0
+
+
+def _key(token: str) -> str:
+    return token.rstrip(".").lower()
+
+
+class Gazetteer:
+    """Token trie of place names"""
+
+    def __init__(self, places: Iterable[Tuple[str, Place]]):
+        self._root: Dict = {}
+        self.max_tokens = 1
+        self.size = 0
+        for name, place in places:
+            tokens = [_key(token) for token in TOKEN_PATTERN.findall(name) if token != ","]
+            if not tokens:
+                continue
+            node = self._root
+            for token in tokens:
+                node = node.setdefault(token, {})
+            node.setdefault(None, []).append(place)
+            self.max_tokens = max(self.max_tokens, len(tokens))
+            self.size += 1
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[str, str, Optional[str], Optional[int]]]) -> "Gazetteer":
+        """Build from (state_code, state_name, city, population) rows plus the built-in state names"""
+        states = dict(US_STATES)
+        cities = []
+        for state_code, state_name, city, population in rows:
+            if city:
+                cities.append((city, Place(CITY, state_code, city, population or 0)))
+            elif state_name:
+                states[state_code] = state_name
+
+        places = list(cities)
+        for code, name in states.items():
+            places.append((name, Place(STATE, code)))
+            places.append((code, Place(CODE, code)))
+        for abbreviation, code in AP_ABBREVIATIONS.items():
+            places.append((abbreviation + ".", Place(ABBREVIATION, code)))
+        return cls(places)
+
+    def extract(self, text: str) -> Dict:
+        """Return {"state", "city", "text"} for the most specific place named in the text"""
+        tokens = TOKEN_PATTERN.findall(text or "")
+        cities: List[Tuple[Place, str]] = []
+        states: List[Tuple[str, str]] = []
+
+        i = 0
+        while i < len(tokens):
+            matched, length = self._longest_match(tokens, i)
+            if not matched:
+                i += 1
+                continue
+            surface = " ".join(tokens[i:i + length])
+            if i + length < len(tokens) and tokens[i + length].lower() == "state":
+                # "Washington state", "New York state"
+                matched = [place for place in matched if place.kind != CITY]
+            for place in matched:
+                if place.kind == CITY:
+                    cities.append((place, surface))
+                elif place.kind == STATE or self._code_counts(tokens, i, place.state, cities):
+                    states.append((place.state, surface))
+            i += length
+
+        return self._resolve(cities, states)
+
+    def _longest_match(self, tokens: List[str], start: int) -> Tuple[List[Place], int]:
+        node, best, best_length = self._root, [], 0
+        for offset in range(min(self.max_tokens, len(tokens) - start)):
+            token = tokens[start + offset]
+            # Names and codes are capitalized; "dallas" in a URL slug is not a place mention
+            if not token[0].isupper():
+                break
+            node = node.get(_key(token))
+            if node is None:
+                break
+            places = node.get(None)
+            if places:
+                best, best_length = self._filter_codes(places, token), offset + 1
+        return best, best_length
+
+    @staticmethod
+    def _filter_codes(places: List[Place], token: str) -> List[Place]:
+        # Two-letter codes must be written in capitals ("TX", not "Tx"/"tx"),
+        # and abbreviations with their period ("Miss.", not "Miss")
+        if len(token) == 2 and not token.isupper():
+            places = [place for place in places if place.kind != CODE]
+        if not token.endswith("."):
+            places = [place for place in places if place.kind != ABBREVIATION]
+        return places
+
+    @staticmethod
+    def _code_counts(tokens: List[str], index: int, code: str, cities: List[Tuple[Place, str]]) -> bool:
+        if code not in AMBIGUOUS_CODES:
+            return True
+        previous = tokens[index - 1] if index else ""
+        return previous == "," or bool(cities and cities[-1][1].split()[-1] == previous)
+
+    @staticmethod
+    def _resolve(cities: List[Tuple[Place, str]], states: List[Tuple[str, str]]) -> Dict:
+        state_codes = [code for code, _ in states]
+        if cities:
+            # Prefer a city whose state is also mentioned, then the most populous namesake
+            consistent = [(place, surface) for place, surface in cities if place.state in state_codes]
+            if consistent:
+                place, surface = consistent[0]
+                state_surface = states[state_codes.index(place.state)][1]
+                return {"state": place.state, "city": place.city, "text": f"{surface}, {state_surface}"[:200]}
+            first_name = cities[0][0].city
+            place, surface = max(
+                ((place, surface) for place, surface in cities if place.city == first_name),
+                key=lambda candidate: candidate[0].population
+            )
+            return {"state": place.state, "city": place.city, "text": surface[:200]}
+        if states:
+            code, surface = states[0]
+            return {"state": code, "city": None, "text": surface[:200]}
+        return {"state": None, "city": None, "text": None}
+
+
+_gazetteer: Optional[Gazetteer] = None
+_states_only: Optional[Gazetteer] = None  # Fallback until the locations table is loaded
+
+
+def load_gazetteer(db: Session) -> Gazetteer:
+    """(Re)build the shared gazetteer from the locations table"""
+    global _gazetteer
+    rows = db.execute(
+        select(Location.state_code, Location.state_name, Location.city, Location.population)
+    ).all()
+    _gazetteer = Gazetteer.from_rows(rows)
+    logger.info(f"Gazetteer loaded: {_gazetteer.size} names from {len(rows)} locations")
+    return _gazetteer
+
+
+def get_gazetteer(db: Optional[Session] = None) -> Gazetteer:
+    """The shared gazetteer, loading it on first use (state names only without a session)"""
+    global _states_only
+    if _gazetteer is None:
+        if db is not None:
+            return load_gazetteer(db)
+        if _states_only is None:
+            _states_only = Gazetteer.from_rows([])
+        return _states_only
+    return _gazetteer
@@ -0,0 +1,152 @@
+"""
+Keyword classifier for news articles, compiled once at import
+
+The rules match keywords as plain substrings of the lowercased text (so
+"cast" also matches "broadcast"), exactly as the original per-call scans
+did. A keyword without a space can only occur inside a single
+space-separated token, so each distinct token is matched once with a
+precompiled regex and the result is memoized. Repeated vocabulary across
+articles then costs a dict lookup. The few multi-word keywords are checked
+against the whole text.
+"""
+import re
+from typing import Dict, FrozenSet, Iterable, List, Set
+
+ENTERTAINMENT_KEYWORDS = [
+    "movie", "film", "dvd", "blu-ray", "streaming", "netflix", "hulu", "amazon prime",
+    "imdb", "rating", "genre", "drama", "comedy", "action", "thriller", "horror",
+    "plot", "synopsis", "cast", "director", "producer", "awards", "nominations",
+    "trailer", "review", "critic", "box office", "theater", "cinema", "premiere",
+    "sequel", "remake", "adaptation", "based on", "inspired by", "fictional",
+    "character", "actor", "actress", "starring", "featuring", "performance",
+    "amzn", "web-dl", "h264", "1080p", "720p", "4k", "uhd", "torrent", "download"
+]
+
+# Classification rules for significant violent crimes only; order breaks ties
+CLASSIFICATIONS = {
+    "mass_violence": {
+        "keywords": ["mass shooting", "mass casualty", "multiple victims", "rampage", "mass murder"],
+        "severity": "critical",
+        "min_confidence": 0.3
+    },
+    "school_incident": {
+        "keywords": ["school shooting", "school", "campus", "student", "teacher", "education"],
+        "severity": "critical",
+        "min_confidence": 0.3
+    },
+    "homicide": {
+        "keywords": ["homicide", "murder", "killed", "death", "dead", "fatal", "slain"],
+        "severity": "high",
+        "min_confidence": 0.4
+    },
+    "shooting": {
+        "keywords": ["shooting", "shot", "gun", "firearm", "gunman", "gunshot"],
+        "severity": "medium",
+        "min_confidence": 0.5
+    },
+    "stabbing": {
+        "keywords": ["stabbing", "stabbed", "knife", "cut", "slashed"],
+        "severity": "medium",
+        "min_confidence": 0.5
+    }
+}
+
+
+def trie_pattern(words: Iterable[str]) -> str:
+    """Regex alternation factored by shared prefixes; at a position it matches the longest word"""
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        alternation = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{alternation})?" if "" in node else alternation
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """Finds which keywords occur as substrings of a text"""
+
+    def __init__(self, keywords: Iterable[str], cache_size: int = 50_000):
+        keywords = sorted(set(keywords))
+        self.spaced = [keyword for keyword in keywords if " " in keyword]
+        single = [keyword for keyword in keywords if " " not in keyword]
+        # Zero-width lookahead so overlapping occurrences are all reported
+        self.pattern = re.compile("(?=(" + trie_pattern(single) + "))")
+        # Every keyword that starts where the longest match starts is a prefix of it
+        self.prefixes = {
+            keyword: frozenset(other for other in single if keyword.startswith(other))
+            for keyword in single
+        }
+        self.cache_size = cache_size
+        self._token_hits: Dict[str, FrozenSet[str]] = {}
+
+    def find(self, text: str) -> Set[str]:
+        hits: Set[str] = set()
+        for token in set(text.split(" ")):
+            token_hits = self._token_hits.get(token)
+            if token_hits is None:
+                token_hits = self._match_token(token)
+            if token_hits:
+                hits |= token_hits
+        for keyword in self.spaced:
+            if keyword in text:
+                hits.add(keyword)
+        return hits
+
+    def _match_token(self, token: str) -> FrozenSet[str]:
+        hits = set()
+        for match in self.pattern.finditer(token):
+            hits |= self.prefixes[match.group(1)]
+        if len(self._token_hits) >= self.cache_size:
+            self._token_hits.clear()
+        token_hits = self._token_hits[token] = frozenset(hits)
+        return token_hits
+
+
+class IncidentClassifier:
+    """Entertainment filter plus crime-type scoring over one keyword pass"""
+
+    def __init__(self, entertainment_keywords: List[str] = ENTERTAINMENT_KEYWORDS,
+                 classifications: Dict = CLASSIFICATIONS):
+        self.entertainment = frozenset(entertainment_keywords)
+        self.classifications = [
+            (crime_type, config["keywords"], config["severity"], config.get("min_confidence", 0.3))
+            for crime_type, config in classifications.items()
+        ]
+        all_keywords = list(entertainment_keywords)
+        for config in classifications.values():
+            all_keywords.extend(config["keywords"])
+        self.matcher = KeywordMatcher(all_keywords)
+
+    def classify(self, title: str, description: str) -> Dict:
+        """Classify incident type and severity - focus on significant violent crimes"""
+        hits = self.matcher.find(f"{title} {description}".lower())
+
+        # Filter out entertainment content first
+        if not self.entertainment.isdisjoint(hits):
+            return {"type": "filtered_out", "severity": "filtered", "confidence": 0.0}
+
+        # Find best match with minimum confidence threshold
+        best_match = {"type": "other", "severity": "low", "confidence": 0.0}
+        for crime_type, keywords, severity, min_confidence in self.classifications:
+            keyword_count = sum(1 for keyword in keywords if keyword in hits)
+            confidence = min(keyword_count / len(keywords), 1.0)
+            if confidence >= min_confidence and confidence > best_match["confidence"]:
+                best_match = {"type": crime_type, "severity": severity, "confidence": confidence}
+
+        # Filter out low-confidence incidents
+        if best_match["confidence"] < 0.3:
+            return {"type": "filtered_out", "severity": "filtered", "confidence": 0.0}
+
+        return best_match
+
+
+classifier = IncidentClassifier()
@@ -0,0 +1,164 @@
+"""
+Hourly incident rollups
+
+``incident_hourly_rollups`` holds one count per discovery hour and per
+(state, crime_type, severity, is_duplicate, is_verified). Ingest and
+verification adjust the counts in the same transaction as the incident
+change. A periodic job reconciles recent hours against ``incidents`` to pick
+up anything changed outside those paths, and refreshes the daily
+``system_stats`` rows from the rollups. Stats endpoints sum rollup rows, so
+their cost follows the number of hours and dimension values in the window,
+not the number of incidents.
+
+``discovered_at`` is filled by the database's now(), so ``hour`` is on the
+database session's clock. Windows are computed there too (``hours_ago``,
+``db_local``) rather than from Python's local or Eastern time.
+"""
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+import pytz
+
+from sqlalchemy import delete, func, select, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from database.database import SessionLocal
+from database.models import ApiLog, Incident, IncidentHourlyRollup, SystemStats
+from backend.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+NO_STATE = ""  # Rollup key for incidents without a state (NULL can't be part of the key)
+ROLLUP_JOB = "incident_rollups"
+
+Rollup = IncidentHourlyRollup
+
+_hour = func.date_trunc("hour", Incident.discovered_at)
+_dimensions = (
+    _hour,
+    func.coalesce(Incident.state, NO_STATE),
+    Incident.crime_type,
+    Incident.severity,
+    func.coalesce(Incident.is_duplicate, False),
+    func.coalesce(Incident.is_verified, False),
+)
+_columns = ["hour", "state", "crime_type", "severity", "is_duplicate", "is_verified", "count"]
+
+
+def hours_ago(hours: float):
+    """SQL for the start of the hour ``hours`` back from now, on Rollup.hour's clock"""
+    return func.date_trunc("hour", func.localtimestamp() - timedelta(hours=hours))
+
+
+def db_local(value: datetime):
+    """SQL for a tz-aware ``value`` as a naive timestamp on Rollup.hour's clock"""
+    return func.timezone(func.current_setting("TimeZone"), value)
+
+
+def adjust_rollups(db: Session, where, sign: int = 1):
+    """
+    Add (or with ``sign=-1`` remove) the incidents matching ``where`` to the
+    rollups. Runs in the caller's transaction; the caller commits.
+    """
+    counts = select(*_dimensions, func.count() * sign).where(where).group_by(*_dimensions)
+    stmt = pg_insert(Rollup).from_select(_columns, counts)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Rollup.hour, Rollup.state, Rollup.crime_type, Rollup.severity,
+                        Rollup.is_duplicate, Rollup.is_verified],
+        set_={"count": Rollup.count + stmt.excluded.count}
+    )
+    db.execute(stmt)
+
+
+def reconcile_rollups(db: Session, since=None) -> int:
+    """
+    Correct the rollups for every hour from ``since`` (a datetime on
+    Rollup.hour's clock or a SQL expression; all hours when None) to match
+    ``incidents`` and commit. Returns how many rollup rows changed.
+
+    Recount and stored counts are read in one statement, so from one
+    snapshot, and only their difference is added with the same upsert
+    ingest uses. Ingest batches committing meanwhile keep their own
+    increments, and only the rows being corrected are locked, never the
+    whole table.
+    """
+    recount = select(*_dimensions, func.count()).group_by(*_dimensions)
+    stored = select(
+        Rollup.hour, Rollup.state, Rollup.crime_type, Rollup.severity,
+        Rollup.is_duplicate, Rollup.is_verified, -Rollup.count
+    )
+    if since is not None:
+        since = func.date_trunc("hour", since)
+        recount = recount.where(Incident.discovered_at >= since)
+        stored = stored.where(Rollup.hour >= since)
+    combined = union_all(recount, stored).subquery()
+    keys, count = list(combined.c)[:-1], list(combined.c)[-1]
+    differences = select(*keys, func.sum(count)).group_by(*keys).having(func.sum(count) != 0)
+
+    stmt = pg_insert(Rollup).from_select(_columns, differences)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Rollup.hour, Rollup.state, Rollup.crime_type, Rollup.severity,
+                        Rollup.is_duplicate, Rollup.is_verified],
+        set_={"count": Rollup.count + stmt.excluded.count}
+    )
+    corrected = db.execute(stmt).rowcount
+    # Groups that no longer have any incidents
+    clear = delete(Rollup).where(Rollup.count == 0)
+    if since is not None:
+        clear = clear.where(Rollup.hour >= since)
+    db.execute(clear)
+    db.commit()
+    return corrected
+
+
+def refresh_system_stats(db: Session, days: int = 2):
+    """Upsert one system_stats row per local day for the last ``days`` days from the rollups"""
+    today = datetime.now(pytz.timezone(settings.TIMEZONE)).replace(hour=0, minute=0, second=0, microsecond=0)
+    for offset in range(days):
+        day = today - timedelta(days=offset)
+        start, end = db_local(day), db_local(day + timedelta(days=1))
+        window = (Rollup.hour >= start, Rollup.hour < end)
+
+        def breakdown(column) -> Dict[str, int]:
+            return {
+                key or "unknown": total
+                for key, total in db.execute(
+                    select(column, func.sum(Rollup.count)).where(*window).group_by(column)
+                ).all()
+                if total
+            }
+
+        by_severity = breakdown(Rollup.severity)
+        api_calls, api_errors = db.execute(
+            select(
+                func.count(),
+                func.count().filter(ApiLog.status_code >= 400)
+            ).where(ApiLog.created_at >= start, ApiLog.created_at < end)
+        ).one()
+
+        stats = db.scalars(select(SystemStats).where(SystemStats.date == day)).first()
+        if stats is None:
+            stats = SystemStats(date=day)
+            db.add(stats)
+        stats.total_incidents = sum(by_severity.values())
+        stats.incidents_by_state = json.dumps(breakdown(Rollup.state))
+        stats.incidents_by_type = json.dumps(breakdown(Rollup.crime_type))
+        stats.incidents_by_severity = json.dumps(by_severity)
+        stats.api_calls_made = api_calls
+        stats.api_errors = api_errors
+    db.commit()
+
+
+def run_rollup_job(job) -> Dict:
+    """Job body: reconcile recent hours and refresh daily stats"""
+    db = SessionLocal()
+    try:
+        rows = reconcile_rollups(db, hours_ago(settings.ROLLUP_RECONCILE_HOURS))
+        job.progress["rollup_rows"] = rows
+        refresh_system_stats(db)
+        return {"rollup_rows": rows, "reconciled_hours": settings.ROLLUP_RECONCILE_HOURS}
+    finally:
+        db.close()
@@ -0,0 +1,217 @@
+"""
+Lightweight in-process background jobs
+
+Jobs run on a small thread pool, so long tasks such as news collection
+never block the event loop or hold an HTTP request open. Each job carries
+a ``progress`` dict that the task updates while it runs. Every status
+change is also written to ``background_jobs``, so a job started on one
+uvicorn worker (or before a restart) can be looked up from any other.
+Live progress is only available from the worker running the job; the
+stored row holds progress as of the last status change.
+"""
+import json
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from backend.core.config import settings
+from database.database import engine
+from database.models import BackgroundJob
+
+logger = logging.getLogger(__name__)
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = "queued", "running", "succeeded", "failed"
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    params: Dict[str, Any]
+    status: str = QUEUED
+    progress: Dict[str, Any] = field(default_factory=dict)
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @property
+    def active(self) -> bool:
+        return self.status in (QUEUED, RUNNING)
+
+    def to_dict(self) -> Dict:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "params": self.params,
+            "status": self.status,
+            "progress": dict(self.progress),
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+    def to_row(self) -> Dict:
+        """Values for the job's background_jobs row"""
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "params": json.dumps(self.params, default=str),
+            "progress": json.dumps(self.progress, default=str),
+            "result": json.dumps(self.result, default=str),
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+    @classmethod
+    def from_row(cls, row) -> "Job":
+        return cls(
+            id=row.id,
+            kind=row.kind,
+            params=json.loads(row.params) if row.params else {},
+            status=row.status,
+            progress=json.loads(row.progress) if row.progress else {},
+            result=json.loads(row.result) if row.result else None,
+            error=row.error,
+            created_at=row.created_at,
+            started_at=row.started_at,
+            finished_at=row.finished_at,
+        )
+
+
+class JobRunner:
+    """
+    Thread-pool job runner keeping the most recent ``history`` jobs in memory
+
+    With ``persist`` (the default) job status is also stored in the database
+    and lookups fall back to it for jobs this process doesn't hold.
+    """
+
+    def __init__(self, max_workers: int = 2, history: int = 100, persist: bool = True):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._history = history
+        self._persist = persist
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, task: Callable[[Job], Any], params: Optional[Dict] = None,
+               exclusive: bool = True) -> Job:
+        """
+        Queue ``task(job)`` and return the job.
+
+        With ``exclusive`` an active job of the same kind in this process is
+        returned instead of starting a second one. Across processes, tasks
+        guard themselves (see scheduler.run_with_advisory_lock).
+        """
+        with self._lock:
+            if exclusive:
+                active = self._latest_local(kind)
+                if active is not None and active.active:
+                    return active
+            job = Job(id=uuid.uuid4().hex, kind=kind, params=params or {})
+            self._jobs[job.id] = job
+            while len(self._jobs) > self._history:
+                oldest = next(iter(self._jobs.values()))
+                if oldest.active:
+                    break
+                self._jobs.popitem(last=False)
+        self._save(job)
+        self._executor.submit(self._run, job, task)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        job = self._jobs.get(job_id)
+        if job is None and self._persist:
+            stored = self._load(select(BackgroundJob.__table__).where(BackgroundJob.__table__.c.id == job_id))
+            job = stored[0] if stored else None
+        return job
+
+    def latest(self, kind: str) -> Optional[Job]:
+        jobs = self.list(kind, limit=1)
+        return jobs[0] if jobs else None
+
+    def list(self, kind: Optional[str] = None, limit: int = 20) -> List[Job]:
+        """Newest jobs first, from every worker when persisted"""
+        local = [job for job in reversed(self._jobs.values()) if kind is None or job.kind == kind]
+        if not self._persist:
+            return local[:limit]
+        jobs_table = BackgroundJob.__table__
+        stmt = select(jobs_table).order_by(jobs_table.c.created_at.desc()).limit(limit)
+        if kind is not None:
+            stmt = stmt.where(jobs_table.c.kind == kind)
+        stored = self._load(stmt)
+        if stored is None:
+            return local[:limit]
+        # This process's own jobs carry live progress
+        return [self._jobs.get(job.id, job) for job in stored]
+
+    def shutdown(self):
+        """Stop accepting jobs; running ones finish in their threads"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _latest_local(self, kind: str) -> Optional[Job]:
+        for job in reversed(self._jobs.values()):
+            if job.kind == kind:
+                return job
+        return None
+
+    def _save(self, job: Job):
+        """Upsert the job's row; a database outage must not fail the job itself"""
+        if not self._persist:
+            return
+        jobs_table = BackgroundJob.__table__
+        row = job.to_row()
+        stmt = pg_insert(jobs_table).values(**row)
+        try:
+            with engine.begin() as conn:
+                conn.execute(stmt.on_conflict_do_update(
+                    index_elements=[jobs_table.c.id],
+                    set_={name: stmt.excluded[name] for name in row if name != "id"}
+                ))
+                if job.finished_at is not None:
+                    conn.execute(delete(jobs_table).where(
+                        jobs_table.c.created_at < datetime.utcnow() - timedelta(days=settings.JOB_HISTORY_DAYS)
+                    ))
+        except Exception as e:
+            logger.error(f"Error saving job {job.kind} {job.id}: {str(e)}")
+
+    def _load(self, stmt) -> Optional[List[Job]]:
+        """Jobs from background_jobs, or None if the database can't be read"""
+        try:
+            with engine.connect() as conn:
+                return [Job.from_row(row) for row in conn.execute(stmt)]
+        except Exception as e:
+            logger.error(f"Error loading jobs: {str(e)}")
+            return None
+
+    def _run(self, job: Job, task: Callable[[Job], Any]):
+        job.status = RUNNING
+        job.started_at = datetime.utcnow()
+        self._save(job)
+        try:
+            job.result = task(job)
+            job.status = SUCCEEDED
+        except Exception as e:
+            logger.error(f"Job {job.kind} {job.id} failed: {str(e)}")
+            job.error = str(e)
+            job.status = FAILED
+        finally:
+            job.finished_at = datetime.utcnow()
+            self._save(job)
+
+
+job_runner = JobRunner()
@@ -0,0 +1,194 @@
+"""
+Streaming export of tenant listings as NDJSON, CSV or Parquet
+"""
+import csv
+import io
+import json
+import logging
+from datetime import datetime
+from typing import Iterator, List
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from database.tenant_models import Listing
+from backend.core.serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_COLUMNS = [
+    "id", "tenant_id", "name", "slug", "description", "website", "phone", "email",
+    "addr_line1", "city", "region", "postal", "country", "lat", "lng",
+    "category_id", "tags", "hours_json", "images_json",
+    "featured_until", "status", "created_at", "updated_at",
+]
+
+# JSON columns are flattened to JSON text for CSV and Parquet
+JSON_COLUMNS = {"tags", "hours_json", "images_json"}
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def parquet_available() -> bool:
+    """Check whether the optional pyarrow dependency is installed"""
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def stream_listings_export(db: Session, tenant_id: int, export_format: str,
+                           batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[bytes]:
+    """Return a byte iterator for the requested export format"""
+    writers = {
+        "ndjson": _stream_ndjson,
+        "csv": _stream_csv,
+        "parquet": _stream_parquet,
+    }
+    return writers[export_format](db, tenant_id, batch_size)
+
+
+def _iter_batches(db: Session, tenant_id: int, batch_size: int) -> Iterator[List]:
+    """Yield plain rows in batches from a server-side cursor (no ORM objects)"""
+    stmt = (
+        select(*[getattr(Listing, column) for column in EXPORT_COLUMNS])
+        .where(Listing.tenant_id == tenant_id, Listing.status.is_distinct_from("deleted"))
+        .order_by(Listing.id)
+        .execution_options(yield_per=batch_size)
+    )
+    result = db.execute(stmt)
+    try:
+        for partition in result.partitions():
+            yield partition
+    finally:
+        result.close()
+
+
+def _flatten(column: str, value):
+    """Render a value for the flat (CSV/Parquet) formats"""
+    if value is not None and column in JSON_COLUMNS:
+        return json.dumps(value)
+    return value
+
+
+def _csv_value(column: str, value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return _flatten(column, value)
+
+
+def _stream_ndjson(db: Session, tenant_id: int, batch_size: int) -> Iterator[bytes]:
+    exported = 0
+    for rows in _iter_batches(db, tenant_id, batch_size):
+        lines = [dumps(dict(zip(EXPORT_COLUMNS, row))) for row in rows]
+        exported += len(lines)
+        yield b"\n".join(lines) + b"\n"
+    logger.info(f"Exported {exported} listings for tenant {tenant_id} as ndjson")
+
+
+def _stream_csv(db: Session, tenant_id: int, batch_size: int) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    exported = 0
+
+    for rows in _iter_batches(db, tenant_id, batch_size):
+        for row in rows:
+            writer.writerow([_csv_value(column, value) for column, value in zip(EXPORT_COLUMNS, row)])
+        exported += len(rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate(0)
+
+    # Header only (no listings)
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+    logger.info(f"Exported {exported} listings for tenant {tenant_id} as csv")
+
+
+class _ChunkSink:
+    """Write-only file object that hands written bytes back to the generator"""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        # Parquet footers record absolute offsets, so report the total written
+        return self._position
+
+    def writable(self) -> bool:
+        return True
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _parquet_schema():
+    import pyarrow as pa
+
+    types = {
+        "id": pa.int64(),
+        "tenant_id": pa.int64(),
+        "category_id": pa.int64(),
+        "lat": pa.float64(),
+        "lng": pa.float64(),
+        "featured_until": pa.timestamp("us"),
+        "created_at": pa.timestamp("us"),
+        "updated_at": pa.timestamp("us"),
+    }
+    return pa.schema([(column, types.get(column, pa.string())) for column in EXPORT_COLUMNS])
+
+
+def _stream_parquet(db: Session, tenant_id: int, batch_size: int) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _parquet_schema()
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    exported = 0
+
+    try:
+        for rows in _iter_batches(db, tenant_id, batch_size):
+            columns = {column: [] for column in EXPORT_COLUMNS}
+            for row in rows:
+                for column, value in zip(EXPORT_COLUMNS, row):
+                    columns[column].append(_flatten(column, value))
+            # One row group per cursor batch keeps memory bounded
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+            exported += len(rows)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+
+    chunk = sink.drain()
+    if chunk:
+        yield chunk
+    logger.info(f"Exported {exported} listings for tenant {tenant_id} as parquet")
@@ -0,0 +1,129 @@
+"""
+Buffered writer for operational log tables
+
+api_logs rows are written through it. Nothing writes audit_logs yet; when
+something does, it should call ``submit(AuditLog, row)`` rather than add to
+the request's session.
+
+Callers hand over plain column dicts with ``submit``, which never blocks and
+never touches the caller's session. A daemon thread drains the buffer every
+``flush_interval`` seconds, or sooner once ``batch_size`` rows are waiting.
+Each drain writes one multi-row INSERT per table in a single transaction.
+When the buffer is full, new rows are dropped and counted rather than
+slowing the request path. The buffer is flushed on shutdown and at
+interpreter exit, so scripts keep their last rows.
+"""
+import atexit
+import logging
+import threading
+from collections import defaultdict, deque
+from typing import Dict, List, Tuple, Type
+
+from sqlalchemy import insert
+
+from database.database import SessionLocal
+from backend.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class BufferedLogWriter:
+    """Thread-safe bounded buffer of log rows with a background flusher thread"""
+
+    def __init__(self, max_size: int, batch_size: int, flush_interval: float):
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer: deque = deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def submit(self, model: Type, row: Dict) -> bool:
+        """Buffer one row for ``model``'s table; False if it was dropped"""
+        with self._lock:
+            if len(self._buffer) >= self.max_size:
+                self.dropped += 1
+                return False
+            self._buffer.append((model, row))
+            if self._thread is None and not self._stopping.is_set():
+                self._start()
+            if len(self._buffer) >= self.batch_size:
+                self._wakeup.set()
+        return True
+
+    def stats(self) -> Dict:
+        return {
+            "queued": len(self._buffer),
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+    def flush(self) -> int:
+        """Write everything buffered so far; returns rows written"""
+        total = 0
+        while True:
+            batch = self._take(self.batch_size)
+            if not batch:
+                return total
+            total += self._write(batch)
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the flusher thread and write what's left"""
+        self._stopping.set()
+        self._wakeup.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout)
+        self.flush()
+
+    def _start(self):
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Log writer flush failed: {str(e)}")
+
+    def _take(self, limit: int) -> List[Tuple[Type, Dict]]:
+        with self._lock:
+            return [self._buffer.popleft() for _ in range(min(limit, len(self._buffer)))]
+
+    def _write(self, batch: List[Tuple[Type, Dict]]) -> int:
+        by_model: Dict[Type, List[Dict]] = defaultdict(list)
+        for model, row in batch:
+            by_model[model].append(row)
+
+        db = SessionLocal()
+        try:
+            for model, rows in by_model.items():
+                db.execute(insert(model.__table__), rows)
+            db.commit()
+            self.written += len(batch)
+            return len(batch)
+        except Exception as e:
+            # Operational logs are best effort; count the loss instead of retrying forever
+            db.rollback()
+            self.failed += len(batch)
+            logger.error(f"Dropping {len(batch)} log rows: {str(e)}")
+            return 0
+        finally:
+            db.close()
+
+
+log_writer = BufferedLogWriter(
+    max_size=settings.LOG_WRITER_MAX_SIZE,
+    batch_size=settings.LOG_WRITER_BATCH_SIZE,
+    flush_interval=settings.LOG_WRITER_FLUSH_SECONDS,
+)
+atexit.register(log_writer.stop)
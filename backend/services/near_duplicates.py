@@ -0,0 +1,230 @@
+"""
+Near-duplicate detection for incidents (MinHash + LSH)
+
+Each article's title and description are reduced to word 3-gram shingles
+and a MinHash signature. Signatures are split into bands, and each band is
+hashed into a bucket. Only incidents sharing at least one bucket are
+compared, and a match needs an estimated Jaccard similarity of at least
+``threshold``. Only canonical (non-duplicate) incidents are indexed, so
+every duplicate points straight at the first report of its story.
+Entries older than the rolling window are evicted, and each collection run
+first loads the incidents other workers have discovered since its last one.
+"""
+import logging
+import random
+import re
+import threading
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from database.models import Incident
+from backend.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MERSENNE_PRIME = (1 << 61) - 1
+# Re-read this far behind the high-water mark on each load: discovered_at is
+# the inserting transaction's start time, so rows can commit out of order
+LOAD_OVERLAP = timedelta(minutes=15)
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+SHINGLE_SIZE = 3
+
+
+def shingles(title: str, description: Optional[str]) -> set:
+    """Word 3-grams of the normalized text (single words for very short texts)"""
+    words = WORD_PATTERN.findall(f"{title} {description or ''}".lower())
+    if len(words) < SHINGLE_SIZE:
+        return set(words)
+    return {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+class MinHasher:
+    """``num_perm`` universal hash functions over shingle hashes"""
+
+    def __init__(self, num_perm: int, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.params = [
+            (rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def signature(self, shingle_set: set) -> Tuple[int, ...]:
+        if not shingle_set:
+            return ()
+        # Built-in str hash is stable within a process, which is all an in-memory index needs
+        hashes = [hash(shingle) & 0xFFFFFFFFFFFFFFFF for shingle in shingle_set]
+        return tuple(
+            min((a * h + b) % MERSENNE_PRIME for h in hashes)
+            for a, b in self.params
+        )
+
+
+@dataclass
+class _Entry:
+    key: Hashable
+    signature: Tuple[int, ...]
+    published_at: datetime
+    band_keys: Tuple
+
+
+class NearDuplicateIndex:
+    """LSH index over a rolling window of canonical incidents"""
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, threshold: float = 0.5,
+                 window_hours: int = 72):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.window = timedelta(hours=window_hours)
+        self._buckets: Dict[Tuple, List[_Entry]] = defaultdict(list)
+        self._entries: Dict[Hashable, _Entry] = {}
+        self._order: deque = deque()  # Keys in insertion order, for eviction
+        self._lock = threading.Lock()
+        self.loaded = False
+        self.loaded_through: Optional[datetime] = None  # Latest discovered_at loaded
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def signature(self, title: str, description: Optional[str]) -> Tuple[int, ...]:
+        return self.hasher.signature(shingles(title, description))
+
+    def find(self, signature: Tuple[int, ...]) -> Optional[Hashable]:
+        """Key of the most similar indexed incident at or above the threshold"""
+        if not signature:
+            return None
+        best_key, best_score = None, self.threshold
+        seen = set()
+        with self._lock:
+            for band_key in self._band_keys(signature):
+                for entry in self._buckets.get(band_key, ()):
+                    if entry.key in seen:
+                        continue
+                    seen.add(entry.key)
+                    score = self._similarity(signature, entry.signature)
+                    if score >= best_score:
+                        best_key, best_score = entry.key, score
+        return best_key
+
+    def add(self, key: Hashable, signature: Tuple[int, ...], published_at: datetime):
+        if not signature:
+            return
+        entry = _Entry(key, signature, published_at, tuple(self._band_keys(signature)))
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = entry
+            self._order.append(key)
+            for band_key in entry.band_keys:
+                self._buckets[band_key].append(entry)
+            self._evict()
+
+    def rekey(self, old_key: Hashable, new_key: Hashable):
+        """Replace a provisional key (e.g. the URL before insert) with the incident id"""
+        with self._lock:
+            entry = self._entries.pop(old_key, None)
+            if entry is not None:
+                entry.key = new_key
+                self._entries[new_key] = entry
+                # Keep the entry's place in the eviction order; it was added recently,
+                # so search from the newest end
+                for position in range(len(self._order) - 1, -1, -1):
+                    if self._order[position] == old_key:
+                        self._order[position] = new_key
+                        break
+                else:
+                    self._order.append(new_key)
+
+    def discard(self, key: Hashable):
+        with self._lock:
+            self._remove(key)
+
+    def _band_keys(self, signature: Sequence[int]):
+        for band in range(self.bands):
+            start = band * self.rows
+            yield (band, hash(signature[start:start + self.rows]))
+
+    @staticmethod
+    def _similarity(a: Sequence[int], b: Sequence[int]) -> float:
+        return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for band_key in entry.band_keys:
+            bucket = self._buckets.get(band_key)
+            if bucket:
+                bucket[:] = [other for other in bucket if other is not entry]
+                if not bucket:
+                    del self._buckets[band_key]
+
+    def _evict(self):
+        cutoff = datetime.utcnow() - self.window
+        while self._order:
+            entry = self._entries.get(self._order[0])
+            if entry is not None and entry.published_at >= cutoff:
+                break
+            key = self._order.popleft()
+            if entry is not None:
+                self._remove(key)
+
+    def load(self, db: Session):
+        """
+        Index canonical incidents published inside the window
+
+        The first load reads the whole window; later ones only incidents
+        discovered since the previous load, such as those written by other
+        workers.
+        """
+        cutoff = datetime.utcnow() - self.window
+        query = select(
+            Incident.id, Incident.title, Incident.description, Incident.published_at, Incident.discovered_at
+        ).where(Incident.published_at >= cutoff, Incident.is_duplicate.isnot(True))
+        if self.loaded_through is not None:
+            query = query.where(Incident.discovered_at >= self.loaded_through - LOAD_OVERLAP)
+        rows = db.execute(query.order_by(Incident.published_at)).all()
+
+        added = 0
+        for incident_id, title, description, published_at, discovered_at in rows:
+            if self.loaded_through is None or discovered_at > self.loaded_through:
+                self.loaded_through = discovered_at
+            if incident_id in self._entries:
+                continue
+            self.add(incident_id, self.signature(title, description), naive_utc(published_at))
+            added += 1
+        if not self.loaded:
+            self.loaded = True
+            logger.info(f"Near-duplicate index loaded with {len(self)} incidents")
+        elif added:
+            logger.info(f"Near-duplicate index added {added} incidents, now {len(self)}")
+
+
+def naive_utc(value: datetime) -> datetime:
+    """Comparable with datetime.utcnow() whether or not the value is tz-aware"""
+    if value.tzinfo is not None:
+        return value.replace(tzinfo=None) - value.utcoffset()
+    return value
+
+
+near_duplicate_index = NearDuplicateIndex(
+    num_perm=settings.NEAR_DUPLICATE_NUM_PERM,
+    bands=settings.NEAR_DUPLICATE_BANDS,
+    threshold=settings.NEAR_DUPLICATE_THRESHOLD,
+    window_hours=settings.NEAR_DUPLICATE_WINDOW_HOURS,
+)
+
+
+def get_near_duplicate_index(db: Session) -> NearDuplicateIndex:
+    """The shared index, warmed from the database on first use"""
+    if not near_duplicate_index.loaded:
+        near_duplicate_index.load(db)
+    return near_duplicate_index
@@ -1,19 +1,33 @@
 """
 NewsAPI service for collecting violent crime incidents
 """
-import requests
+import asyncio
 import os
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import logging
+
+import httpx
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
-from database import get_db
+from database import get_db, SessionLocal
 from database.models import Incident, Source, ApiLog
 import pytz
 from backend.core.config import settings
+from backend.services.gazetteer import get_gazetteer
+from backend.services.incident_rollups import adjust_rollups
+from backend.services.incident_classifier import classifier
+from backend.services.log_writer import log_writer
+from backend.services.near_duplicates import get_near_duplicate_index, naive_utc, near_duplicate_index
+from backend.services.news_collector import FetchStats, KEYWORD_GROUPS, NewsAPIFetcher, RecentUrls, group_query
+from backend.services.watermarks import advance_watermarks, from_dates, load_watermarks
 
 logger = logging.getLogger(__name__)
 
+# URLs handled by earlier runs in this process
+recent_urls = RecentUrls(settings.NEWSAPI_RECENT_URLS)
+
 class NewsAPIService:
     """Service for collecting crime data from NewsAPI"""
     
@@ -48,82 +62,110 @@ class NewsAPIService:
         ]
         return " OR ".join(significant_crimes)
     
-    def collect_incidents(self, db: Session, hours_back: int = 24) -> Dict:
-        """Collect recent crime incidents from NewsAPI"""
+    def collect_incidents(self, db: Session, hours_back: int = 24,
+                          transport: Optional[httpx.AsyncBaseTransport] = None,
+                          progress: Optional[Dict] = None) -> Dict:
+        """
+        Collect recent crime incidents from NewsAPI (blocking; for scripts and jobs)
+
+        Runs collect_incidents_async on a fresh event loop. Async callers must
+        await collect_incidents_async instead.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.collect_incidents_async(db, hours_back, transport, progress))
+        raise RuntimeError("collect_incidents blocks; await collect_incidents_async from a running event loop")
+    
+    async def collect_incidents_async(self, db: Session, hours_back: int = 24,
+                                      transport: Optional[httpx.AsyncBaseTransport] = None,
+                                      progress: Optional[Dict] = None) -> Dict:
+        """
+        Collect recent crime incidents from NewsAPI
+        
+        Keyword groups and their pages are fetched concurrently and handed to
+        the processing stage through a bounded queue. Pass ``transport`` (e.g.
+        news_fixtures.ReplayTransport) to replace the network, and ``progress`` to have a
+        dict kept up to date with running counts.
+        """
         start_time = datetime.now()
         errors = []
-        articles_found = 0
         articles_processed = 0
         
+        # Each query resumes from its watermark (with overlap), however old, up to
+        # NEWSAPI_MAX_LOOKBACK_HOURS; queries without one start hours_back ago
+        now = datetime.utcnow()
+        floor = now - timedelta(hours=hours_back)
+        queries = [group_query(keywords) for keywords in KEYWORD_GROUPS]
+        group_from = from_dates(
+            load_watermarks(db, queries), queries, floor,
+            timedelta(minutes=settings.NEWSAPI_WATERMARK_OVERLAP_MINUTES),
+            earliest=now - timedelta(hours=settings.NEWSAPI_MAX_LOOKBACK_HOURS)
+        )
+        params = {
+            "language": "en",
+            "sortBy": "publishedAt",
+            "from": floor.strftime("%Y-%m-%dT%H:%M:%S")
+        }
+        query_summary = f"{len(queries)} keyword groups from {min(group_from.values())}"
+        
+        queue: asyncio.Queue = asyncio.Queue(maxsize=settings.NEWSAPI_QUEUE_SIZE)
+        fetcher = None
+        
         try:
-            # Calculate date range
-            eastern = pytz.timezone('US/Eastern')
-            now = datetime.now(eastern)
-            from_date = now - timedelta(hours=hours_back)
-            
-            # Build search parameters (remove date restrictions for now)
-            params = {
-                "q": self.build_search_query(),
-                "language": "en",
-                "sortBy": "publishedAt",
-                "pageSize": 100
-            }
+            # Pick up incidents other workers inserted since this one last ran
+            near_duplicate_index.load(db)
             
-            # Make API request
-            logger.info(f"Making NewsAPI request with params: {params}")
-            response = requests.get(
-                f"{self.base_url}/everything",
+            async with httpx.AsyncClient(
+                base_url=self.base_url,
                 headers=self.headers,
-                params=params,
-                timeout=30
-            )
-            
-            response_time = int((datetime.now() - start_time).total_seconds() * 1000)
-            logger.info(f"NewsAPI response status: {response.status_code}")
-            logger.info(f"NewsAPI response text: {response.text[:500]}")
-            
-            if response.status_code != 200:
-                error_msg = f"API request failed: {response.status_code} - {response.text}"
-                logger.error(error_msg)
-                errors.append(error_msg)
-                
-                # Log API error
-                self._log_api_call(
-                    db, "everything", str(params), response.status_code,
-                    response_time, 0, 0, error_msg
+                timeout=30,
+                transport=transport
+            ) as client:
+                fetcher = NewsAPIFetcher(
+                    client,
+                    max_concurrency=settings.NEWSAPI_MAX_CONCURRENCY,
+                    requests_per_second=settings.NEWSAPI_REQUESTS_PER_SECOND,
+                    max_pages=settings.NEWSAPI_MAX_PAGES,
+                    max_requests=settings.NEWSAPI_MAX_REQUESTS_PER_RUN
                 )
+                logger.info(f"Starting NewsAPI collection: {query_summary}")
                 
-                return {
-                    "success": False,
-                    "articles_found": 0,
-                    "articles_processed": 0,
-                    "errors": errors
-                }
+                processor = asyncio.create_task(
+                    self._consume_articles(db, queue, errors, fetcher.stats, progress)
+                )
+                try:
+                    groups = await asyncio.gather(*(
+                        fetcher.fetch_group(keywords, params, queue, group_from) for keywords in KEYWORD_GROUPS
+                    ))
+                finally:
+                    await queue.put(None)  # Tell the processing stage fetching is done
+                articles_processed = await processor
             
-            data = response.json()
-            articles = data.get("articles", [])
-            articles_found = len(articles)
+            # Only advance past windows that were fully fetched and processed
+            if not errors:
+                advance_watermarks(db, {
+                    group.query: group.newest_published_at
+                    for group in groups if group.complete and group.newest_published_at
+                })
             
-            # Process articles
-            for article in articles:
-                try:
-                    if self._process_article(db, article):
-                        articles_processed += 1
-                except Exception as e:
-                    error_msg = f"Error processing article: {str(e)}"
-                    logger.error(error_msg)
-                    errors.append(error_msg)
+            stats = fetcher.stats
+            errors = stats.errors + errors
+            response_time = int((datetime.now() - start_time).total_seconds() * 1000)
+            success = stats.pages_fetched > 0 or not stats.errors
+            status_code = 200 if success else (stats.last_status or 500)
             
-            # Log successful API call
             self._log_api_call(
-                db, "everything", str(params), response.status_code,
-                response_time, articles_found, articles_processed, None
+                "everything", query_summary, status_code,
+                response_time, stats.articles_found, articles_processed,
+                "; ".join(errors)[:2000] if errors else None
             )
             
             return {
-                "success": True,
-                "articles_found": articles_found,
+                "success": success,
+                "articles_found": stats.articles_found,
                 "articles_processed": articles_processed,
+                "requests_made": stats.requests_made,
                 "errors": errors
             }
             
@@ -136,92 +178,223 @@ class NewsAPIService:
             
             # Log error
             self._log_api_call(
-                db, "everything", str(params), 500,
-                response_time, 0, 0, error_msg
+                "everything", query_summary, 500,
+                response_time, fetcher.stats.articles_found if fetcher else 0, articles_processed, error_msg
             )
             
             return {
                 "success": False,
-                "articles_found": 0,
-                "articles_processed": 0,
+                "articles_found": fetcher.stats.articles_found if fetcher else 0,
+                "articles_processed": articles_processed,
                 "errors": errors
             }
     
-    def _process_article(self, db: Session, article: Dict) -> bool:
-        """Process a single article and create incident if relevant"""
-        try:
-            # Extract article data
-            title = article.get("title", "")
-            description = article.get("description", "")
-            url = article.get("url", "")
-            source_name = article.get("source", {}).get("name", "Unknown")
-            published_at = article.get("publishedAt", "")
-            
-            # Skip if missing essential data
-            if not title or not url or not published_at:
-                return False
+    async def _consume_articles(self, db: Session, queue: asyncio.Queue, errors: List[str],
+                                stats: FetchStats, progress: Optional[Dict] = None) -> int:
+        """Processing stage: drain pages from the queue until the end marker"""
+        processed = 0
+        
+        while True:
+            articles = await queue.get()
+            if progress is not None:
+                progress.update(
+                    requests_made=stats.requests_made,
+                    articles_found=stats.articles_found,
+                    articles_processed=processed,
+                    errors=len(stats.errors) + len(errors)
+                )
+            if articles is None:
+                return processed
             
-            # Check if already exists
-            existing = db.query(Incident).filter(Incident.url == url).first()
-            if existing:
-                return False
+            # Keyword groups and watermark overlaps repeat URLs; skip them before the database
+            fresh = {}
+            for article in articles:
+                url = article.get("url")
+                if url and url not in recent_urls and url not in fresh:
+                    fresh[url] = article
+            if not fresh:
+                continue
             
-            # Get or create source
-            source = self._get_or_create_source(db, source_name)
+            try:
+                # Database work runs off the event loop so fetching continues meanwhile
+                processed += await asyncio.to_thread(self._process_articles, db, list(fresh.values()))
+                recent_urls.add_all(fresh)
+            except Exception as e:
+                error_msg = f"Error processing articles: {str(e)}"
+                logger.error(error_msg)
+                errors.append(error_msg)
+    
+    def _process_articles(self, db: Session, articles: List[Dict]) -> int:
+        """
+        Process a batch of articles, returning how many incidents were created
+        
+        Set-based: one query for known URLs, one for sources, multi-row
+        INSERT ... ON CONFLICT (url) DO NOTHING for new stories and then for
+        their near-duplicates, one hourly-rollup upsert, and a single commit.
+        """
+        get_gazetteer(db)  # Loads the Location table on first use
+        
+        candidates = {}
+        for article in articles:
+            row = self._article_to_row(article)
+            if row is not None:
+                candidates.setdefault(row["url"], row)
+        if not candidates:
+            return 0
+        
+        existing = set(db.scalars(select(Incident.url).where(Incident.url.in_(list(candidates)))))
+        rows = [row for url, row in candidates.items() if url not in existing]
+        if not rows:
+            return 0
+        
+        try:
+            source_ids = self._resolve_sources(db, {row["source_name"] for row in rows})
             
-            # Classify the incident
-            classification = self._classify_incident(title, description)
+            values = []
+            for row in rows:
+                source_id = source_ids.get(row.pop("source_name"))
+                if source_id is None:
+                    # Name whose derived domain collides with another source's
+                    logger.warning(f"No source for article {row['url']}")
+                    continue
+                values.append({**row, "source_id": source_id})
             
-            # Skip filtered out incidents
-            if classification["type"] == "filtered_out":
-                return False
+            canonical, duplicates = self._split_near_duplicates(db, values)
             
-            # Extract location
-            location = self._extract_location(title, description)
+            # Canonical rows first, so their ids exist for the duplicates to reference
+            written = self._insert_incidents(db, canonical)
+            canonical_ids = dict(written)
+            ids_by_url = dict(canonical_ids)
             
-            # Create incident
-            incident = Incident(
-                title=title,
-                description=description,
-                url=url,
-                source_id=source.id,
-                state=location.get("state"),
-                city=location.get("city"),
-                location_text=location.get("text"),
-                crime_type=classification["type"],
-                severity=classification["severity"],
-                published_at=datetime.fromisoformat(published_at.replace('Z', '+00:00')),
-                confidence_score=classification["confidence"],
-                is_verified=False,
-                is_duplicate=False
-            )
+            lost = {match for _, match in duplicates if isinstance(match, str) and match not in ids_by_url}
+            if lost:
+                ids_by_url.update(db.execute(
+                    select(Incident.url, Incident.id).where(Incident.url.in_(list(lost)))
+                ).all())
+            for row, match in duplicates:
+                row["canonical_incident_id"] = ids_by_url.get(match) if isinstance(match, str) else match
+            written += self._insert_incidents(db, [row for row, _ in duplicates])
+            inserted = len(written)
+            if written:
+                adjust_rollups(db, Incident.id.in_([incident_id for _, incident_id in written]))
             
-            db.add(incident)
             db.commit()
-            
-            return True
-            
         except Exception as e:
-            logger.error(f"Error processing article {article.get('url', 'unknown')}: {str(e)}")
+            logger.error(f"Error inserting {len(rows)} incidents: {str(e)}")
             db.rollback()
-            return False
+            for row in rows:
+                near_duplicate_index.discard(row["url"])
+            raise
+        
+        # Only now may later batches match these rows by id: re-keying before the
+        # commit would leave ids of rolled-back rows in the index
+        for row in canonical:
+            if row["url"] in canonical_ids:
+                near_duplicate_index.rekey(row["url"], canonical_ids[row["url"]])
+            else:
+                near_duplicate_index.discard(row["url"])  # Lost a race on the URL
+        
+        return inserted
+    
+    def _split_near_duplicates(self, db: Session, rows: List[Dict]) -> Tuple[List[Dict], List[Tuple[Dict, object]]]:
+        """
+        Separate new stories from near-duplicates of recent incidents
+        
+        New stories are added to the LSH index under their URL (re-keyed to the
+        incident id after insert), so later rows in the same batch match them.
+        Duplicates are returned with the matching incident id or URL.
+        """
+        index = get_near_duplicate_index(db)
+        canonical, duplicates = [], []
+        for row in rows:
+            signature = index.signature(row["title"], row["description"])
+            match = index.find(signature)
+            if match is None:
+                index.add(row["url"], signature, naive_utc(row["published_at"]))
+                canonical.append({**row, "is_duplicate": False, "canonical_incident_id": None})
+            else:
+                duplicates.append(({**row, "is_duplicate": True}, match))
+        return canonical, duplicates
+    
+    def _insert_incidents(self, db: Session, values: List[Dict]) -> List[Tuple[str, int]]:
+        """Multi-row insert returning (url, id) for the rows actually written"""
+        if not values:
+            return []
+        # The unique index catches URLs inserted concurrently since the check above
+        return db.execute(
+            pg_insert(Incident)
+            .values(values)
+            .on_conflict_do_nothing(index_elements=[Incident.url])
+            .returning(Incident.url, Incident.id)
+        ).all()
+    
+    def _article_to_row(self, article: Dict) -> Optional[Dict]:
+        """Classify one article into incident column values, or None to skip it"""
+        # Extract article data
+        title = article.get("title", "")
+        description = article.get("description", "")
+        url = article.get("url", "")
+        source_name = (article.get("source") or {}).get("name") or "Unknown"
+        published_at = article.get("publishedAt", "")
+        
+        # Skip if missing essential data
+        if not title or not url or not published_at:
+            return None
+        
+        # Classify the incident
+        classification = self._classify_incident(title, description)
+        
+        # Skip filtered out incidents
+        if classification["type"] == "filtered_out":
+            return None
+        
+        try:
+            published = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
+        except ValueError:
+            logger.error(f"Error processing article {url}: bad publishedAt {published_at!r}")
+            return None
+        
+        # Extract location
+        location = self._extract_location(title, description)
+        
+        return {
+            "title": title[:500],
+            "description": description,
+            "url": url,
+            "source_name": source_name[:100],
+            "state": location.get("state"),
+            "city": location.get("city"),
+            "location_text": location.get("text"),
+            "crime_type": classification["type"],
+            "severity": classification["severity"],
+            "published_at": published,
+            "confidence_score": classification["confidence"],
+            "is_verified": False,
+            "is_duplicate": False
+        }
     
-    def _get_or_create_source(self, db: Session, source_name: str) -> Source:
-        """Get existing source or create new one"""
-        source = db.query(Source).filter(Source.name == source_name).first()
+    def _resolve_sources(self, db: Session, source_names: set) -> Dict[str, int]:
+        """Map source names to ids, creating missing sources in one INSERT"""
+        source_ids = dict(db.execute(
+            select(Source.name, Source.id).where(Source.name.in_(source_names))
+        ).all())
         
-        if not source:
-            # Create new source with default reliability score
-            source = Source(
-                name=source_name,
-                domain=self._extract_domain(source_name),
-                reliability_score=0.5
+        missing = source_names - source_ids.keys()
+        if missing:
+            # Create new sources with default reliability score
+            db.execute(
+                pg_insert(Source)
+                .values([
+                    {"name": name, "domain": self._extract_domain(name), "reliability_score": 0.5}
+                    for name in missing
+                ])
+                .on_conflict_do_nothing()
             )
-            db.add(source)
-            db.commit()
-            db.refresh(source)
+            source_ids.update(db.execute(
+                select(Source.name, Source.id).where(Source.name.in_(missing))
+            ).all())
         
-        return source
+        return source_ids
     
     def _extract_domain(self, source_name: str) -> str:
         """Extract domain from source name"""
@@ -241,115 +414,44 @@ class NewsAPIService:
     
     def _classify_incident(self, title: str, description: str) -> Dict:
         """Classify incident type and severity - focus on significant violent crimes"""
-        text = f"{title} {description}".lower()
-        
-        # Filter out entertainment content first
-        entertainment_keywords = [
-            "movie", "film", "dvd", "blu-ray", "streaming", "netflix", "hulu", "amazon prime",
-            "imdb", "rating", "genre", "drama", "comedy", "action", "thriller", "horror",
-            "plot", "synopsis", "cast", "director", "producer", "awards", "nominations",
-            "trailer", "review", "critic", "box office", "theater", "cinema", "premiere",
-            "sequel", "remake", "adaptation", "based on", "inspired by", "fictional",
-            "character", "actor", "actress", "starring", "featuring", "performance",
-            "amzn", "web-dl", "h264", "1080p", "720p", "4k", "uhd", "torrent", "download"
-        ]
-        
-        # Check if this is entertainment content
-        for keyword in entertainment_keywords:
-            if keyword in text:
-                return {"type": "filtered_out", "severity": "filtered", "confidence": 0.0}
-        
-        # Enhanced classification rules for significant violent crimes only
-        classifications = {
-            "mass_violence": {
-                "keywords": ["mass shooting", "mass casualty", "multiple victims", "rampage", "mass murder"],
-                "severity": "critical",
-                "min_confidence": 0.3
-            },
-            "school_incident": {
-                "keywords": ["school shooting", "school", "campus", "student", "teacher", "education"],
-                "severity": "critical",
-                "min_confidence": 0.3
-            },
-            "homicide": {
-                "keywords": ["homicide", "murder", "killed", "death", "dead", "fatal", "slain"],
-                "severity": "high",
-                "min_confidence": 0.4
-            },
-            "shooting": {
-                "keywords": ["shooting", "shot", "gun", "firearm", "gunman", "gunshot"],
-                "severity": "medium",
-                "min_confidence": 0.5
-            },
-            "stabbing": {
-                "keywords": ["stabbing", "stabbed", "knife", "cut", "slashed"],
-                "severity": "medium",
-                "min_confidence": 0.5
-            }
-        }
-        
-        # Find best match with minimum confidence threshold
-        best_match = {"type": "other", "severity": "low", "confidence": 0.0}
-        
-        for crime_type, config in classifications.items():
-            keyword_count = sum(1 for keyword in config["keywords"] if keyword in text)
-            confidence = min(keyword_count / len(config["keywords"]), 1.0)
-            min_confidence = config.get("min_confidence", 0.3)
-            
-            # Only classify if confidence meets minimum threshold
-            if confidence >= min_confidence and confidence > best_match["confidence"]:
-                best_match = {
-                    "type": crime_type,
-                    "severity": config["severity"],
-                    "confidence": confidence
-                }
-        
-        # Filter out low-confidence incidents
-        if best_match["confidence"] < 0.3:
-            return {"type": "filtered_out", "severity": "filtered", "confidence": 0.0}
-        
-        return best_match
+        return classifier.classify(title, description)
     
     def _extract_location(self, title: str, description: str) -> Dict:
-        """Extract location information from text"""
-        text = f"{title} {description}"
-        
-        # US state abbreviations
-        states = {
-            "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "FL", "GA",
-            "HI", "ID", "IL", "IN", "IA", "KS", "KY", "LA", "ME", "MD",
-            "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NJ",
-            "NM", "NY", "NC", "ND", "OH", "OK", "OR", "PA", "RI", "SC",
-            "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY"
-        }
-        
-        # Find state mentions
-        for state in states:
-            if f" {state} " in text or text.endswith(f" {state}") or text.startswith(f"{state} "):
-                return {"state": state, "city": None, "text": None}
-        
-        return {"state": None, "city": None, "text": None}
+        """Extract city and state from text using the Location gazetteer"""
+        return get_gazetteer().extract(f"{title} {description or ''}")
     
-    def _log_api_call(self, db: Session, endpoint: str, query: str, 
-                     status_code: int, response_time: int, 
-                     articles_found: int, articles_processed: int, 
+    def _log_api_call(self, endpoint: str, query: str,
+                     status_code: int, response_time: int,
+                     articles_found: int, articles_processed: int,
                      errors: Optional[str]):
-        """Log API call to database"""
-        try:
-            api_log = ApiLog(
-                endpoint=endpoint,
-                query=query,
-                status_code=status_code,
-                response_time_ms=response_time,
-                articles_found=articles_found,
-                articles_processed=articles_processed,
-                errors=errors
-            )
-            db.add(api_log)
-            db.commit()
-        except Exception as e:
-            logger.error(f"Error logging API call: {str(e)}")
+        """Queue an api_logs row; written in batches off the request path"""
+        log_writer.submit(ApiLog, {
+            "endpoint": endpoint,
+            "query": query[:500],
+            "status_code": status_code,
+            "response_time_ms": response_time,
+            "articles_found": articles_found,
+            "articles_processed": articles_processed,
+            "errors": errors
+        })
     
     def get_preferred_domains(self) -> str:
         """Get comma-separated list of preferred news domains"""
         return "cnn.com,foxnews.com,abcnews.go.com,cbsnews.com,nbcnews.com,apnews.com,reuters.com,usatoday.com,washingtonpost.com,nytimes.com"
+
+
+COLLECTION_JOB = "news_collection"
+
+
+def run_collection_job(job, hours_back: int) -> Dict:
+    """Job body: collect with its own session, reporting progress on the job"""
+    db = SessionLocal()
+    try:
+        logger.info(f"Starting data collection for last {hours_back} hours")
+        result = NewsAPIService().collect_incidents(db, hours_back, progress=job.progress)
+        logger.info(f"Data collection completed: {result}")
+        if not result.get("success"):
+            raise RuntimeError("; ".join(result.get("errors", [])) or "Data collection failed")
+        return result
+    finally:
+        db.close()
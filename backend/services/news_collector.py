@@ -0,0 +1,219 @@
+"""
+Concurrent NewsAPI fetching
+
+Each keyword group is a separate /everything query. A group's first page
+reports totalResults; its remaining pages are then requested concurrently.
+Every request goes through one semaphore (max in-flight requests) and one
+rate limiter (min spacing between requests). Pages feed a bounded queue,
+so a slow processing stage makes fetchers wait instead of buffering
+everything in memory.
+
+See news_fixtures for recording responses and replaying them offline.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Narrow queries page deeper than one giant OR query before hitting the result cap
+KEYWORD_GROUPS = [
+    ["mass shooting", "school shooting"],
+    ["shooting", "gun violence"],
+    ["homicide", "murder", "killed", "fatal"],
+    ["stabbing", "violent crime", "assault", "robbery"],
+]
+
+PAGE_SIZE = 100  # NewsAPI maximum
+
+
+@dataclass
+class FetchStats:
+    """Counters for one collection run"""
+    requests_made: int = 0
+    pages_fetched: int = 0
+    articles_found: int = 0
+    last_status: Optional[int] = None
+    errors: List[str] = field(default_factory=list)
+
+
+@dataclass
+class GroupResult:
+    """Outcome of fetching one keyword group"""
+    query: str
+    newest_published_at: Optional[datetime] = None
+    complete: bool = False  # Every page in the window was fetched
+
+
+class AsyncRateLimiter:
+    """Spaces request starts at least ``1 / rate`` seconds apart"""
+
+    def __init__(self, rate_per_second: float):
+        self.interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+        self._next_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_at - now
+            self._next_at = max(now, self._next_at) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def pause(self, seconds: float):
+        """Push the next allowed start out, e.g. after a 429"""
+        self._next_at = max(self._next_at, time.monotonic() + seconds)
+
+
+class NewsAPIFetcher:
+    """Fans keyword-group and page requests out over one shared AsyncClient"""
+
+    def __init__(self, client: httpx.AsyncClient, max_concurrency: int, requests_per_second: float,
+                 max_pages: int, max_requests: int, max_retries: int = 2):
+        self.client = client
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.limiter = AsyncRateLimiter(requests_per_second)
+        self.max_pages = max_pages
+        self.max_requests = max_requests
+        self.max_retries = max_retries
+        self.stats = FetchStats()
+        self._stopped = False
+
+    async def fetch_group(self, keywords: List[str], params: Dict, queue: asyncio.Queue,
+                          from_dates: Optional[Dict[str, str]] = None) -> GroupResult:
+        """Fetch every page for one keyword group, putting article lists on ``queue``"""
+        query = group_query(keywords)
+        group_params = {**params, "q": query, "pageSize": PAGE_SIZE}
+        if from_dates and query in from_dates:
+            group_params["from"] = from_dates[query]
+        result = GroupResult(query)
+
+        first = await self._fetch_page(group_params, 1)
+        if first is None:
+            return result
+        self._track_newest(result, first["articles"])
+        await queue.put(first["articles"])
+
+        total_pages = -(-first.get("totalResults", 0) // PAGE_SIZE)
+        last_page = min(self.max_pages, total_pages)
+        fetched = [True]
+
+        async def fetch_and_enqueue(page: int):
+            data = await self._fetch_page(group_params, page)
+            fetched.append(data is not None)
+            if data is not None and data["articles"]:
+                self._track_newest(result, data["articles"])
+                await queue.put(data["articles"])
+
+        if last_page >= 2:
+            await asyncio.gather(*(fetch_and_enqueue(page) for page in range(2, last_page + 1)))
+        result.complete = last_page >= total_pages and all(fetched)
+        return result
+
+    @staticmethod
+    def _track_newest(result: GroupResult, articles: List[Dict]):
+        for article in articles:
+            published = parse_published_at(article.get("publishedAt"))
+            if published and (result.newest_published_at is None or published > result.newest_published_at):
+                result.newest_published_at = published
+
+    async def _fetch_page(self, params: Dict, page: int) -> Optional[Dict]:
+        for _ in range(self.max_retries + 1):
+            if self._stopped:
+                return None
+            if self.stats.requests_made >= self.max_requests:
+                self._stop(f"Request budget of {self.max_requests} reached")
+                return None
+
+            async with self.semaphore:
+                await self.limiter.wait()
+                self.stats.requests_made += 1
+                try:
+                    response = await self.client.get("/everything", params={**params, "page": page})
+                except httpx.HTTPError as e:
+                    self.stats.errors.append(f"{params['q']} page {page}: {str(e)}")
+                    continue
+
+            self.stats.last_status = response.status_code
+            if response.status_code == 429 and "Retry-After" in response.headers:
+                retry_after = float(response.headers["Retry-After"])
+                logger.warning(f"NewsAPI rate limited, backing off {retry_after}s")
+                self.limiter.pause(retry_after)
+                continue
+
+            try:
+                data = response.json()
+            except ValueError:
+                data = {"message": response.text[:200]}
+            if response.status_code != 200:
+                code = data.get("code")
+                if code in ("maximumResultsReached",):
+                    return None  # Plan cap on how deep a query may page
+                if response.status_code == 429 or code in ("rateLimited", "apiKeyExhausted"):
+                    # Quota exhausted; every further request would fail the same way
+                    self._stop(f"NewsAPI {code}: {data.get('message')}")
+                    return None
+                self.stats.errors.append(
+                    f"API request failed: {response.status_code} - {data.get('message', response.text)}"
+                )
+                return None
+
+            articles = data.get("articles", [])
+            self.stats.pages_fetched += 1
+            self.stats.articles_found += len(articles)
+            return {"articles": articles, "totalResults": data.get("totalResults", 0)}
+
+        self.stats.errors.append(f"{params['q']} page {page}: gave up after {self.max_retries + 1} attempts")
+        return None
+
+    def _stop(self, reason: str):
+        if not self._stopped:
+            self._stopped = True
+            logger.warning(reason)
+            self.stats.errors.append(reason)
+
+
+class RecentUrls:
+    """Bounded, insertion-ordered set of article URLs already handled"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._urls: "OrderedDict[str, None]" = OrderedDict()
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._urls
+
+    def __len__(self) -> int:
+        return len(self._urls)
+
+    def add_all(self, urls: Iterable[str]):
+        for url in urls:
+            self._urls[url] = None
+            self._urls.move_to_end(url)
+        while len(self._urls) > self.max_size:
+            self._urls.popitem(last=False)
+
+
+def group_query(keywords: List[str]) -> str:
+    """NewsAPI q parameter for a keyword group (phrases quoted)"""
+    return " OR ".join(f'"{keyword}"' if " " in keyword else keyword for keyword in keywords)
+
+
+def parse_published_at(value: Optional[str]) -> Optional[datetime]:
+    """NewsAPI publishedAt ("2026-01-01T12:00:00Z") as naive UTC"""
+    if not value:
+        return None
+    try:
+        published = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if published.tzinfo is not None:
+        published = published.replace(tzinfo=None) - published.utcoffset()
+    return published
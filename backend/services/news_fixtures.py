@@ -0,0 +1,163 @@
+"""
+Record and replay NewsAPI traffic
+
+``RecordingTransport`` wraps the real transport and appends every
+/everything response to a gzip-compressed NDJSON file. Each line looks like
+``{"q", "page", "status", "elapsed_ms", "body"}``. ``ReplayTransport`` serves
+those lines back with no network. It can replay at a multiple of the
+recorded latency, and it can scale the volume up by synthesizing further
+pages from the recorded articles. That lets the ingestion pipeline be
+benchmarked offline at, say, 100k articles.
+"""
+import asyncio
+import copy
+import gzip
+import json
+import logging
+import threading
+import time
+import zlib
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import httpx
+
+from backend.services.news_collector import PAGE_SIZE
+
+logger = logging.getLogger(__name__)
+
+SYNTHETIC_HOST = "https://replay.invalid"  # URL prefix of synthesized articles
+
+
+def _request_key(request: httpx.Request) -> Tuple[str, int]:
+    return request.url.params.get("q", ""), int(request.url.params.get("page", "1"))
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Passes requests through to ``inner`` and records each response"""
+
+    def __init__(self, path: str, inner: Optional[httpx.AsyncBaseTransport] = None):
+        self.inner = inner or httpx.AsyncHTTPTransport()
+        self._file = gzip.open(path, "at", encoding="utf-8")
+        self._lock = threading.Lock()
+        self.recorded = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.monotonic()
+        response = await self.inner.handle_async_request(request)
+        content = await response.aread()
+        elapsed_ms = int((time.monotonic() - started) * 1000)
+
+        try:
+            body = json.loads(content)
+        except ValueError:
+            body = {"status": "error", "message": content.decode("utf-8", "replace")[:200]}
+        q, page = _request_key(request)
+        line = json.dumps({"q": q, "page": page, "status": response.status_code,
+                           "elapsed_ms": elapsed_ms, "body": body}, separators=(",", ":"))
+        with self._lock:
+            self._file.write(line + "\n")
+            self.recorded += 1
+
+        # aread() decoded the body, so drop headers that describe the wire encoding
+        headers = {name: value for name, value in response.headers.items()
+                   if name.lower() not in ("content-encoding", "content-length", "transfer-encoding")}
+        return httpx.Response(response.status_code, headers=headers, content=content, request=request)
+
+    async def aclose(self):
+        await self.inner.aclose()
+        with self._lock:
+            self._file.close()
+
+
+def read_fixture(path: str) -> Iterable[Dict]:
+    """Lines of a recorded fixture (gzip or plain NDJSON)"""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def write_fixture(path: str, records: Iterable[Dict]) -> int:
+    """Write records in the recorder's format, returning how many were written"""
+    count = 0
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+            count += 1
+    return count
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    Serves a recorded fixture as if it were NewsAPI.
+
+    ``speed`` scales the recorded latency: 1.0 replays it as recorded, 10.0
+    ten times faster, and 0 skips it entirely. With ``articles`` set, every
+    query reports a share of that total in totalResults. Pages beyond the
+    recording are then synthesized from the recorded articles, each with a
+    unique URL, a shifted publishedAt and a numbered title. Queries that
+    were never recorded return an empty page.
+    """
+
+    def __init__(self, path: str, speed: float = 0.0, articles: Optional[int] = None):
+        self.speed = speed
+        self.pages: Dict[Tuple[str, int], Dict] = {}
+        self.pool: Dict[str, List[Dict]] = defaultdict(list)
+        latencies = []
+        for record in read_fixture(path):
+            self.pages[(record["q"], record["page"])] = record
+            latencies.append(record.get("elapsed_ms", 0))
+            if record.get("status", 200) == 200:
+                self.pool[record["q"]].extend(record["body"].get("articles", []))
+        self.default_latency_ms = sum(latencies) / len(latencies) if latencies else 0
+        self.articles = articles
+        logger.info(f"Replay fixture {path}: {len(self.pages)} pages, "
+                    f"{sum(len(pool) for pool in self.pool.values())} articles")
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        q, page = _request_key(request)
+        record = self.pages.get((q, page))
+        if self.articles is not None and self.pool.get(q):
+            status, body = 200, self._scaled_page(q, page, record)
+        elif record is not None:
+            status, body = record.get("status", 200), record["body"]
+        else:
+            status, body = 200, {"status": "ok", "totalResults": 0, "articles": []}
+
+        if self.speed > 0:
+            latency_ms = record.get("elapsed_ms", 0) if record else self.default_latency_ms
+            await asyncio.sleep(latency_ms / 1000 / self.speed)
+        return httpx.Response(status, json=body, request=request)
+
+    def _scaled_page(self, q: str, page: int, record: Optional[Dict]) -> Dict:
+        per_query = -(-self.articles // len(self.pool))
+        start = (page - 1) * PAGE_SIZE
+        count = max(0, min(PAGE_SIZE, per_query - start))
+        if record is not None and record.get("status", 200) == 200:
+            articles = record["body"].get("articles", [])[:count]
+        else:
+            articles = []
+        pool = self.pool[q]
+        articles = articles + [
+            synthesize_article(pool[index % len(pool)], q, index)
+            for index in range(start + len(articles), start + count)
+        ]
+        return {"status": "ok", "totalResults": per_query, "articles": articles}
+
+
+def synthesize_article(template: Dict, q: str, index: int) -> Dict:
+    """A unique variant of a recorded article"""
+    article = copy.deepcopy(template)
+    article["url"] = f"{SYNTHETIC_HOST}/{zlib.crc32(q.encode())}/{index}"
+    article["title"] = f"{template.get('title') or ''} ({index})"
+    published = template.get("publishedAt")
+    if published:
+        try:
+            shifted = datetime.fromisoformat(published.replace("Z", "+00:00")) - timedelta(seconds=index)
+            article["publishedAt"] = shifted.strftime("%Y-%m-%dT%H:%M:%SZ")
+        except ValueError:
+            pass
+    return article
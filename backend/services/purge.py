@@ -0,0 +1,148 @@
+"""
+Chunked purge of tenants and listings
+
+Deleting through the ORM cascades makes SQLAlchemy load every child row and
+issue a DELETE per row. Purges here soft-mark the parent first (so the API
+stops serving it), then remove children with set-based DELETEs of at most
+``batch_size`` rows, each in its own short transaction, driven by the
+``tenant_id`` / ``listing_id`` indexes. A purge that dies part way can simply
+be run again.
+"""
+import logging
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from database.database import SessionLocal
+from database.tenant_models import (
+    Tenant, User, Listing, ListingTombstone, ListingEndorsementStats, Category, Endorsement,
+    ModerationReport, AuditLog, UsageMeter, Member
+)
+
+logger = logging.getLogger(__name__)
+
+PURGE_BATCH_SIZE = 1000
+
+ProgressCallback = Callable[[str, int], None]
+
+
+def mark_tenant_deleted(db: Session, tenant: Tenant):
+    """Soft-mark a tenant so authentication rejects it before the purge runs"""
+    tenant.plan_status = "deleted"
+    db.commit()
+
+
+def mark_listing_deleted(db: Session, listing: Listing):
+    """Soft-mark a listing and record its tombstone in the same transaction"""
+    listing.status = "deleted"
+    db.add(ListingTombstone(tenant_id=listing.tenant_id, listing_id=listing.id, slug=listing.slug))
+    db.commit()
+
+
+def purge_listing(db: Session, listing_id: int, batch_size: int = PURGE_BATCH_SIZE,
+                  progress: Optional[ProgressCallback] = None) -> Dict[str, int]:
+    """Delete a soft-deleted listing and its endorsements in batches"""
+    listing = db.get(Listing, listing_id)
+    if listing is None or listing.status != "deleted":
+        return {}
+    tenant_id = listing.tenant_id
+    db.expunge(listing)
+
+    # tenant_id keeps the batches on idx_endorsements_tenant_listing
+    counts = {
+        "endorsements": _delete_in_batches(
+            db, Endorsement,
+            (Endorsement.tenant_id == tenant_id) & (Endorsement.listing_id == listing_id),
+            batch_size, progress
+        ),
+    }
+    db.execute(delete(ListingEndorsementStats).where(ListingEndorsementStats.listing_id == listing_id))
+    result = db.execute(
+        delete(Listing)
+        .where(Listing.id == listing_id, Listing.status == "deleted")
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    counts["listings"] = result.rowcount
+    logger.info(f"Purged listing {listing_id}: {counts}")
+    return counts
+
+
+def purge_tenant(db: Session, tenant_id: int, batch_size: int = PURGE_BATCH_SIZE,
+                 progress: Optional[ProgressCallback] = None) -> Dict[str, int]:
+    """Delete every row owned by a soft-deleted tenant, children first"""
+    tenant = db.get(Tenant, tenant_id)
+    if tenant is None:
+        return {}
+    if tenant.plan_status != "deleted":
+        raise ValueError(f"Tenant {tenant_id} must be marked deleted before it is purged")
+
+    counts = {}
+    # Order follows the foreign keys: endorsements -> listings -> categories -> users
+    for model in (Endorsement, ModerationReport, AuditLog, UsageMeter, ListingTombstone):
+        counts[model.__tablename__] = _delete_in_batches(
+            db, model, model.tenant_id == tenant_id, batch_size, progress
+        )
+
+    # Stats rows are keyed by listing_id rather than id
+    result = db.execute(
+        delete(ListingEndorsementStats).where(ListingEndorsementStats.tenant_id == tenant_id)
+    )
+    db.commit()
+    counts[ListingEndorsementStats.__tablename__] = result.rowcount
+
+    counts[Listing.__tablename__] = _delete_in_batches(
+        db, Listing, Listing.tenant_id == tenant_id, batch_size, progress
+    )
+
+    # Break the self-reference so categories can be deleted in any order
+    db.execute(
+        update(Category)
+        .where(Category.tenant_id == tenant_id, Category.parent_id.isnot(None))
+        .values(parent_id=None)
+    )
+    db.commit()
+
+    for model in (Category, Member, User):
+        counts[model.__tablename__] = _delete_in_batches(
+            db, model, model.tenant_id == tenant_id, batch_size, progress
+        )
+
+    db.expunge(tenant)
+    db.execute(delete(Tenant).where(Tenant.id == tenant_id).execution_options(synchronize_session=False))
+    db.commit()
+    counts["tenants"] = 1
+    logger.info(f"Purged tenant {tenant_id}: {counts}")
+    return counts
+
+
+def run_listing_purge(listing_id: int):
+    """Background task entry point with its own session"""
+    db = SessionLocal()
+    try:
+        purge_listing(db, listing_id)
+    except Exception as e:
+        logger.error(f"Error purging listing {listing_id}: {str(e)}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+def _delete_in_batches(db: Session, model, condition, batch_size: int,
+                       progress: Optional[ProgressCallback]) -> int:
+    """DELETE ... WHERE id IN (SELECT id ... LIMIT n), one commit per batch"""
+    table = model.__tablename__
+    deleted = 0
+    while True:
+        batch = select(model.id).where(condition).limit(batch_size).scalar_subquery()
+        result = db.execute(
+            delete(model).where(model.id.in_(batch)).execution_options(synchronize_session=False)
+        )
+        db.commit()
+        deleted += result.rowcount
+        if progress:
+            progress(table, deleted)
+        logger.debug(f"Purged {deleted} rows from {table}")
+        if result.rowcount < batch_size:
+            return deleted
@@ -0,0 +1,134 @@
+"""
+In-app periodic scheduler
+
+Each registered task gets an asyncio loop that sleeps for its interval
+plus random jitter, then submits the task to the job runner (so scheduled
+runs show up in /api/data/jobs like manual ones). The job body first takes
+a Postgres advisory lock named after the task on a dedicated connection,
+so two instances never run a task at the same time. Every run's start is
+recorded in ``scheduled_runs``, and a scheduled tick skips the task if it
+already started within the interval. With several workers or hosts, each
+task therefore runs about once per interval in total, not once per
+instance.
+"""
+import asyncio
+import logging
+import random
+import zlib
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from database.database import engine
+from database.models import ScheduledRun
+from backend.services.jobs import Job, job_runner
+
+logger = logging.getLogger(__name__)
+
+# A run that started within this fraction of the interval counts for the
+# current tick; the slack keeps timing noise from skipping a worker's own tick
+RECENT_RUN_FRACTION = 0.9
+
+
+@dataclass
+class ScheduledTask:
+    name: str
+    interval_seconds: float
+    run: Callable[[Job], Any]
+    jitter_seconds: float = 0.0
+    run_on_start: bool = False
+    params: Optional[Dict] = None
+
+
+def advisory_lock_key(name: str) -> int:
+    """Stable 32-bit key for a task name (pg advisory locks take a bigint)"""
+    return zlib.crc32(f"scheduler:{name}".encode())
+
+
+def run_with_advisory_lock(name: str, body: Callable[[Job], Any], job: Job,
+                           min_interval: Optional[float] = None) -> Any:
+    """
+    Run ``body`` only if this process wins the task's advisory lock and, when
+    ``min_interval`` (seconds) is given, the task hasn't started that recently
+    on any instance. Manual runs pass no ``min_interval`` but are still
+    recorded, so the next scheduled tick counts from them.
+    """
+    key = advisory_lock_key(name)
+    runs = ScheduledRun.__table__
+    # The lock belongs to this connection, which stays checked out until the body finishes
+    with engine.connect() as conn:
+        acquired = conn.execute(select(func.pg_try_advisory_lock(key))).scalar()
+        conn.commit()
+        if not acquired:
+            job.progress["skipped"] = "another instance holds the lock"
+            logger.info(f"Skipping {name}: running elsewhere")
+            return None
+        try:
+            if min_interval is not None:
+                recent = conn.execute(
+                    select(runs.c.last_started_at).where(
+                        runs.c.name == name,
+                        runs.c.last_started_at > func.now() - timedelta(seconds=min_interval)
+                    )
+                ).scalar()
+                if recent is not None:
+                    job.progress["skipped"] = f"already ran at {recent.isoformat()}"
+                    logger.info(f"Skipping scheduled {name}: last started {recent}")
+                    return None
+
+            stmt = pg_insert(runs).values(name=name, last_started_at=func.now())
+            conn.execute(stmt.on_conflict_do_update(
+                index_elements=[runs.c.name], set_={"last_started_at": stmt.excluded.last_started_at}
+            ))
+            conn.commit()
+            return body(job)
+        finally:
+            conn.execute(select(func.pg_advisory_unlock(key)))
+            conn.commit()
+
+
+class Scheduler:
+    """Runs registered tasks on fixed intervals with jitter"""
+
+    def __init__(self):
+        self.tasks: List[ScheduledTask] = []
+        self._loops: List[asyncio.Task] = []
+
+    def register(self, task: ScheduledTask):
+        self.tasks.append(task)
+
+    async def start(self):
+        for task in self.tasks:
+            self._loops.append(asyncio.create_task(self._loop(task), name=f"schedule-{task.name}"))
+        if self.tasks:
+            logger.info(f"Scheduler started: {', '.join(task.name for task in self.tasks)}")
+
+    async def stop(self):
+        for loop in self._loops:
+            loop.cancel()
+        await asyncio.gather(*self._loops, return_exceptions=True)
+        self._loops = []
+
+    async def _loop(self, task: ScheduledTask):
+        first = True
+        while True:
+            if not (first and task.run_on_start):
+                await asyncio.sleep(task.interval_seconds + random.uniform(0, task.jitter_seconds))
+            first = False
+            try:
+                job = job_runner.submit(
+                    task.name,
+                    lambda job, task=task: run_with_advisory_lock(
+                        task.name, task.run, job, min_interval=task.interval_seconds * RECENT_RUN_FRACTION
+                    ),
+                    params={**(task.params or {}), "scheduled": True}
+                )
+                logger.debug(f"Scheduled {task.name} as job {job.id}")
+            except Exception as e:
+                logger.error(f"Error scheduling {task.name}: {str(e)}")
+
+
+scheduler = Scheduler()
@@ -0,0 +1,87 @@
+"""
+Collision-free slug allocation shared by tenant listings and businesses
+"""
+import re
+import secrets
+import unicodedata
+from typing import Any, Dict, Iterator, Sequence
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+# Sequential suffixes (-2, -3, ...) tried before falling back to random ones
+MAX_SEQUENTIAL_SUFFIXES = 5
+MAX_RANDOM_SUFFIXES = 10
+
+
+class SlugAllocationError(Exception):
+    """Raised when no free slug could be found for a name"""
+
+
+def slugify(text: str, max_length: int = 200) -> str:
+    """Create a URL-friendly ASCII slug, folding accents ("Café Nöel" -> "cafe-noel")"""
+    normalized = unicodedata.normalize("NFKD", text.replace("&", " and "))
+    ascii_text = normalized.encode("ascii", "ignore").decode("ascii").lower()
+    slug = re.sub(r"[^a-z0-9]+", "-", ascii_text).strip("-")
+    return slug[:max_length].rstrip("-") or "item"
+
+
+def slug_candidates(base: str, max_length: int = 200) -> Iterator[str]:
+    """Yield base, base-2 ... base-N, then a few random suffixes"""
+    yield base[:max_length]
+    for n in range(2, MAX_SEQUENTIAL_SUFFIXES + 2):
+        yield _with_suffix(base, str(n), max_length)
+    for _ in range(MAX_RANDOM_SUFFIXES):
+        yield _with_suffix(base, secrets.token_hex(3), max_length)
+
+
+def _with_suffix(base: str, suffix: str, max_length: int) -> str:
+    return f"{base[:max_length - len(suffix) - 1].rstrip('-')}-{suffix}"
+
+
+def insert_with_unique_slug(db: Session, model, values: Dict[str, Any], base_slug: str,
+                            conflict_columns: Sequence[str]):
+    """
+    Insert a row with the first free slug and return the ORM object.
+
+    Each attempt is a single INSERT ... ON CONFLICT DO NOTHING RETURNING, so
+    there is no pre-check SELECT and concurrent inserts of the same name can't
+    fail the transaction - the loser simply moves on to the next suffix.
+    ``conflict_columns`` must match a unique index that includes ``slug``.
+    """
+    for candidate in slug_candidates(base_slug):
+        stmt = (
+            pg_insert(model)
+            .values(**values, slug=candidate)
+            .on_conflict_do_nothing(index_elements=list(conflict_columns))
+            .returning(model)
+        )
+        obj = db.scalars(stmt).first()
+        if obj is not None:
+            return obj
+
+    raise SlugAllocationError(f"Could not allocate a unique slug for '{base_slug}'")
+
+
+def assign_unique_slug(db: Session, obj, base_slug: str) -> str:
+    """
+    Set ``obj.slug`` to the first free candidate on an existing row.
+
+    Flushes inside a SAVEPOINT and relies on the unique index to reject
+    collisions. Call this before making other changes to ``obj``: a rolled
+    back attempt expires the attributes changed in that flush.
+    """
+    if getattr(obj, "slug", None) == base_slug:
+        return base_slug
+
+    for candidate in slug_candidates(base_slug):
+        obj.slug = candidate
+        try:
+            with db.begin_nested():
+                db.flush()
+            return candidate
+        except IntegrityError:
+            continue
+
+    raise SlugAllocationError(f"Could not allocate a unique slug for '{base_slug}'")
@@ -0,0 +1,61 @@
+"""
+Per-query high-water marks for incremental news collection
+"""
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from database.models import CollectionWatermark
+
+
+def load_watermarks(db: Session, queries: Iterable[str]) -> Dict[str, datetime]:
+    """Stored last_published_at for each query that has one"""
+    return dict(db.execute(
+        select(CollectionWatermark.query, CollectionWatermark.last_published_at)
+        .where(CollectionWatermark.query.in_(list(queries)))
+    ).all())
+
+
+def from_dates(watermarks: Dict[str, datetime], queries: Iterable[str], floor: datetime,
+               overlap: timedelta, earliest: Optional[datetime] = None) -> Dict[str, str]:
+    """
+    NewsAPI ``from`` per query. A query with a watermark resumes from the
+    watermark minus ``overlap``, however long ago that is (articles published
+    just before the watermark may be indexed by NewsAPI late; the overlap
+    picks them up). Only ``earliest``, when given, caps how far back it goes.
+    Queries without a watermark start at ``floor``.
+    """
+    dates = {}
+    for query in queries:
+        start = floor
+        watermark: Optional[datetime] = watermarks.get(query)
+        if watermark is not None:
+            start = watermark - overlap
+            if earliest is not None:
+                start = max(earliest, start)
+        dates[query] = start.strftime("%Y-%m-%dT%H:%M:%S")
+    return dates
+
+
+def advance_watermarks(db: Session, newest: Dict[str, datetime]):
+    """Move watermarks forward (never back) and commit"""
+    if not newest:
+        return
+    stmt = pg_insert(CollectionWatermark).values([
+        {"query": query, "last_published_at": published_at}
+        for query, published_at in newest.items()
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[CollectionWatermark.query],
+        set_={
+            "last_published_at": func.greatest(
+                CollectionWatermark.last_published_at, stmt.excluded.last_published_at
+            ),
+            "updated_at": func.now()
+        }
+    )
+    db.execute(stmt)
+    db.commit()
@@ -97,11 +97,53 @@ def create_initial_locations(db: Session):
     ]
     
     for location_data in locations_data:
-        existing = db.query(Location).filter(Location.state_code == location_data["state_code"]).first()
+        existing = db.query(Location).filter(
+            Location.state_code == location_data["state_code"],
+            Location.city.is_(None)
+        ).first()
         if not existing:
             location = Location(**location_data)
             db.add(location)
     
+    # Major cities (used by the ingestion gazetteer to fill Incident.city)
+    state_names = {data["state_code"]: data["state_name"] for data in locations_data}
+    cities_data = [
+        ("NY", "New York", 8336817), ("CA", "Los Angeles", 3979576), ("IL", "Chicago", 2693976),
+        ("TX", "Houston", 2320268), ("AZ", "Phoenix", 1680992), ("PA", "Philadelphia", 1584064),
+        ("TX", "San Antonio", 1547253), ("CA", "San Diego", 1423851), ("TX", "Dallas", 1343573),
+        ("CA", "San Jose", 1021795), ("TX", "Austin", 978908), ("FL", "Jacksonville", 911507),
+        ("TX", "Fort Worth", 909585), ("OH", "Columbus", 898553), ("NC", "Charlotte", 885708),
+        ("CA", "San Francisco", 881549), ("IN", "Indianapolis", 876384), ("WA", "Seattle", 753675),
+        ("CO", "Denver", 727211), ("DC", "Washington", 705749), ("MA", "Boston", 692600),
+        ("TX", "El Paso", 681728), ("MI", "Detroit", 670031), ("TN", "Nashville", 670820),
+        ("OR", "Portland", 654741), ("TN", "Memphis", 651073), ("OK", "Oklahoma City", 655057),
+        ("NV", "Las Vegas", 651319), ("KY", "Louisville", 617638), ("MD", "Baltimore", 593490),
+        ("WI", "Milwaukee", 590157), ("NM", "Albuquerque", 560513), ("AZ", "Tucson", 548073),
+        ("CA", "Fresno", 531576), ("CA", "Sacramento", 513624), ("MO", "Kansas City", 495327),
+        ("GA", "Atlanta", 506811), ("NE", "Omaha", 478192), ("NC", "Raleigh", 474069),
+        ("FL", "Miami", 467963), ("CA", "Oakland", 433031), ("MN", "Minneapolis", 429954),
+        ("OK", "Tulsa", 401190), ("OH", "Cleveland", 381009), ("KS", "Wichita", 389938),
+        ("LA", "New Orleans", 390144), ("FL", "Tampa", 399700), ("MO", "St. Louis", 300576),
+        ("PA", "Pittsburgh", 300286), ("OH", "Cincinnati", 303940), ("NJ", "Newark", 282011),
+        ("NY", "Buffalo", 255284), ("FL", "Orlando", 287442), ("AL", "Birmingham", 209403),
+        ("VA", "Richmond", 230436), ("LA", "Baton Rouge", 220236),
+        ("IL", "Springfield", 114230), ("MO", "Springfield", 167882), ("ME", "Portland", 66215),
+    ]
+    
+    for state_code, city, population in cities_data:
+        existing = db.query(Location).filter(
+            Location.state_code == state_code,
+            Location.city == city
+        ).first()
+        if not existing:
+            db.add(Location(
+                state_code=state_code,
+                state_name=state_names.get(state_code, "District of Columbia"),
+                city=city,
+                is_major_city=True,
+                population=population
+            ))
+    
     db.commit()
     print("✅ Initial locations created")
 
@@ -64,6 +64,7 @@ class Incident(Base):
     # Metadata
     is_verified = Column(Boolean, default=False)
     is_duplicate = Column(Boolean, default=False)
+    canonical_incident_id = Column(Integer, ForeignKey("incidents.id", ondelete="SET NULL"), nullable=True, index=True)  # First report of a duplicate's story
     confidence_score = Column(Float, default=0.0)  # AI confidence in classification
     
     # Relationships
@@ -74,6 +75,8 @@ class Incident(Base):
         Index('idx_incidents_state_time', 'state', 'published_at'),
         Index('idx_incidents_severity_time', 'severity', 'published_at'),
         Index('idx_incidents_type_time', 'crime_type', 'published_at'),
+        Index('idx_incidents_url', 'url', unique=True),
+        Index('idx_incidents_source_discovered', 'source_id', 'discovered_at'),
     )
 
 
@@ -119,6 +122,52 @@ class ApiLog(Base):
     created_at = Column(DateTime, server_default=func.now(), index=True)
 
 
+class CollectionWatermark(Base):
+    """Newest publishedAt collected per NewsAPI query, for incremental runs"""
+    __tablename__ = "collection_watermarks"
+    
+    query = Column(String(500), primary_key=True)
+    last_published_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+
+class IncidentHourlyRollup(Base):
+    """Incident counts per discovery hour and dimension, maintained at ingest"""
+    __tablename__ = "incident_hourly_rollups"
+    
+    hour = Column(DateTime, primary_key=True)  # date_trunc('hour', discovered_at)
+    state = Column(String(2), primary_key=True)  # '' when no state was extracted
+    crime_type = Column(String(50), primary_key=True)
+    severity = Column(String(20), primary_key=True)
+    is_duplicate = Column(Boolean, primary_key=True)
+    is_verified = Column(Boolean, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class ScheduledRun(Base):
+    """Latest start of each scheduled task, shared by every worker and host"""
+    __tablename__ = "scheduled_runs"
+    
+    name = Column(String(100), primary_key=True)
+    last_started_at = Column(DateTime, nullable=False)
+
+
+class BackgroundJob(Base):
+    """Status of each background job, so any worker can report on it"""
+    __tablename__ = "background_jobs"
+    
+    id = Column(String(32), primary_key=True)
+    kind = Column(String(100), nullable=False)
+    status = Column(String(20), nullable=False)
+    params = Column(Text)  # JSON object
+    progress = Column(Text)  # JSON object, as of the last status change
+    result = Column(Text)  # JSON
+    error = Column(Text)
+    created_at = Column(DateTime, nullable=False, index=True)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+
 class IncidentCategory(Base):
     """Crime type definitions and keywords"""
     __tablename__ = "incident_categories"
@@ -21,18 +21,19 @@ class Tenant(Base):
     logo_url = Column(String(500))
     theme = Column(JSON)  # Theme colors and branding
     plan = Column(String(50), default="free")  # free, premium, pro
-    plan_status = Column(String(20), default="active")  # active, suspended, cancelled
+    plan_status = Column(String(20), default="active")  # active, suspended, cancelled, deleted
     api_key_hash = Column(String(255), unique=True, index=True)  # Hashed API key
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
     
-    # Relationships
-    users = relationship("User", back_populates="tenant", cascade="all, delete-orphan")
-    listings = relationship("Listing", back_populates="tenant", cascade="all, delete-orphan")
-    categories = relationship("Category", back_populates="tenant", cascade="all, delete-orphan")
-    endorsements = relationship("Endorsement", back_populates="tenant", cascade="all, delete-orphan")
-    moderation_reports = relationship("ModerationReport", back_populates="tenant", cascade="all, delete-orphan")
-    audit_logs = relationship("AuditLog", back_populates="tenant", cascade="all, delete-orphan")
-    usage_meters = relationship("UsageMeter", back_populates="tenant", cascade="all, delete-orphan")
+    # Relationships - no ORM delete cascade; children are removed in batches
+    # by backend.services.purge so a tenant delete never loads them all
+    users = relationship("User", back_populates="tenant", passive_deletes=True)
+    listings = relationship("Listing", back_populates="tenant", passive_deletes=True)
+    categories = relationship("Category", back_populates="tenant", passive_deletes=True)
+    endorsements = relationship("Endorsement", back_populates="tenant", passive_deletes=True)
+    moderation_reports = relationship("ModerationReport", back_populates="tenant", passive_deletes=True)
+    audit_logs = relationship("AuditLog", back_populates="tenant", passive_deletes=True)
+    usage_meters = relationship("UsageMeter", back_populates="tenant", passive_deletes=True)
     
     # Indexes
     __table_args__ = (
@@ -96,7 +97,7 @@ class Listing(Base):
     
     # Status and features
     featured_until = Column(DateTime)  # Premium feature
-    status = Column(String(20), default="active")  # active, pending, suspended
+    status = Column(String(20), default="active")  # active, pending, suspended, deleted (awaiting purge)
     
     # Timestamps
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
@@ -113,11 +114,28 @@ class Listing(Base):
         Index('idx_listings_tenant_category', 'tenant_id', 'category_id'),
         Index('idx_listings_tenant_city', 'tenant_id', 'city'),
         Index('idx_listings_tenant_status', 'tenant_id', 'status'),
-        Index('idx_listings_tenant_slug', 'tenant_id', 'slug'),
+        Index('idx_listings_tenant_slug', 'tenant_id', 'slug', unique=True),
+        Index('idx_listings_tenant_updated', 'tenant_id', 'updated_at', 'id'),
         Index('idx_listings_geo', 'lat', 'lng'),
     )
 
 
+class ListingTombstone(Base):
+    """Deletion log backing the listings change feed"""
+    __tablename__ = "listing_tombstones"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    tenant_id = Column(Integer, ForeignKey("tenants.id"), nullable=False)
+    listing_id = Column(Integer, nullable=False)  # No FK - the listing row is gone
+    slug = Column(String(200), nullable=False)
+    deleted_at = Column(DateTime, server_default=func.now(), nullable=False)
+    
+    # Indexes
+    __table_args__ = (
+        Index('idx_listing_tombstones_tenant_deleted', 'tenant_id', 'deleted_at', 'id'),
+    )
+
+
 class Category(Base):
     """Business categories - exact spec from master project"""
     __tablename__ = "categories"
@@ -171,6 +189,23 @@ class Endorsement(Base):
     )
 
 
+class ListingEndorsementStats(Base):
+    """Per-listing endorsement aggregates, maintained as endorsements are written"""
+    __tablename__ = "listing_endorsement_stats"
+    
+    listing_id = Column(Integer, ForeignKey("listings.id", ondelete="CASCADE"), primary_key=True)
+    tenant_id = Column(Integer, ForeignKey("tenants.id", ondelete="CASCADE"), nullable=False)
+    endorsement_count = Column(Integer, nullable=False, default=0)
+    would_repeat_count = Column(Integer, nullable=False, default=0)
+    tag_counts = Column(JSON)  # {"tag": count}
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
+    
+    # Indexes
+    __table_args__ = (
+        Index('idx_endorsement_stats_tenant', 'tenant_id'),
+    )
+
+
 class ModerationReport(Base):
     """Moderation reports - exact spec from master project"""
     __tablename__ = "moderation_reports"
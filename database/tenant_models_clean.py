@@ -113,7 +113,7 @@ class Listing(Base):
         Index('idx_listings_tenant_category', 'tenant_id', 'category_id'),
         Index('idx_listings_tenant_city', 'tenant_id', 'city'),
         Index('idx_listings_tenant_status', 'tenant_id', 'status'),
-        Index('idx_listings_tenant_slug', 'tenant_id', 'slug'),
+        Index('idx_listings_tenant_slug', 'tenant_id', 'slug', unique=True),
         Index('idx_listings_geo', 'lat', 'lng'),
     )
 
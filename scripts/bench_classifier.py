@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-article CPU for incident classification and state extraction
+
+Compares the original per-call keyword scans and state-code scan (embedded
+below, unchanged) with the precompiled classifier and the gazetteer that
+ingestion now uses, over generated news-like articles, after checking both
+produce the same output.
+
+Usage: python scripts/bench_classifier.py [--articles 3000] [--rounds 5]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from backend.services.gazetteer import US_STATES, Gazetteer
+from backend.services.incident_classifier import classifier
+
+SUBJECTS = ["A man", "Two teenagers", "A gunman", "Police", "A student", "The suspect", "A woman", "Officers"]
+EVENTS = [
+    "was shot near", "killed a clerk at", "opened fire outside", "was stabbed behind",
+    "died after a shooting at", "was slain in", "arrested a suspect at", "found a knife at",
+    "reported a mass shooting at", "responded to gunshot calls near", "investigated a homicide at",
+]
+PLACES = ["a school campus", "a gas station", "a downtown bar", "an apartment complex", "a mall", "a park"]
+CITIES = ["Houston TX", "Chicago IL", "Miami FL", "Denver CO", "Atlanta GA", "Phoenix AZ", "Seattle WA", "Boston MA"]
+FILLER = [
+    "according to police", "officials said on Tuesday", "the investigation is ongoing",
+    "witnesses described the scene", "no motive has been released", "the victim was taken to hospital",
+    "a broadcast crew was nearby", "the teacher union issued a statement", "education leaders responded",
+]
+NOISE = ["Movie review:", "Trailer:", "Netflix drama", "Box office:", "Streaming now -"]
+
+
+def make_articles(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    articles = []
+    for _ in range(count):
+        title = f"{rng.choice(SUBJECTS)} {rng.choice(EVENTS)} {rng.choice(PLACES)} in {rng.choice(CITIES)}"
+        if rng.random() < 0.1:
+            title = f"{rng.choice(NOISE)} {title}"
+        description = " ".join(rng.sample(FILLER, rng.randint(1, 4))) + "."
+        articles.append((title, description if rng.random() < 0.95 else None))
+    return articles
+
+
+def legacy_classify(title: str, description: str):
+    """The original NewsAPIService._classify_incident"""
+    text = f"{title} {description}".lower()
+
+    entertainment_keywords = [
+        "movie", "film", "dvd", "blu-ray", "streaming", "netflix", "hulu", "amazon prime",
+        "imdb", "rating", "genre", "drama", "comedy", "action", "thriller", "horror",
+        "plot", "synopsis", "cast", "director", "producer", "awards", "nominations",
+        "trailer", "review", "critic", "box office", "theater", "cinema", "premiere",
+        "sequel", "remake", "adaptation", "based on", "inspired by", "fictional",
+        "character", "actor", "actress", "starring", "featuring", "performance",
+        "amzn", "web-dl", "h264", "1080p", "720p", "4k", "uhd", "torrent", "download"
+    ]
+
+    for keyword in entertainment_keywords:
+        if keyword in text:
+            return {"type": "filtered_out", "severity": "filtered", "confidence": 0.0}
+
+    classifications = {
+        "mass_violence": {
+            "keywords": ["mass shooting", "mass casualty", "multiple victims", "rampage", "mass murder"],
+            "severity": "critical",
+            "min_confidence": 0.3
+        },
+        "school_incident": {
+            "keywords": ["school shooting", "school", "campus", "student", "teacher", "education"],
+            "severity": "critical",
+            "min_confidence": 0.3
+        },
+        "homicide": {
+            "keywords": ["homicide", "murder", "killed", "death", "dead", "fatal", "slain"],
+            "severity": "high",
+            "min_confidence": 0.4
+        },
+        "shooting": {
+            "keywords": ["shooting", "shot", "gun", "firearm", "gunman", "gunshot"],
+            "severity": "medium",
+            "min_confidence": 0.5
+        },
+        "stabbing": {
+            "keywords": ["stabbing", "stabbed", "knife", "cut", "slashed"],
+            "severity": "medium",
+            "min_confidence": 0.5
+        }
+    }
+
+    best_match = {"type": "other", "severity": "low", "confidence": 0.0}
+
+    for crime_type, config in classifications.items():
+        keyword_count = sum(1 for keyword in config["keywords"] if keyword in text)
+        confidence = min(keyword_count / len(config["keywords"]), 1.0)
+        min_confidence = config.get("min_confidence", 0.3)
+
+        if confidence >= min_confidence and confidence > best_match["confidence"]:
+            best_match = {
+                "type": crime_type,
+                "severity": config["severity"],
+                "confidence": confidence
+            }
+
+    if best_match["confidence"] < 0.3:
+        return {"type": "filtered_out", "severity": "filtered", "confidence": 0.0}
+
+    return best_match
+
+
+def legacy_extract_location(title: str, description: str):
+    """The original NewsAPIService._extract_location"""
+    text = f"{title} {description}"
+
+    states = {
+        "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "FL", "GA",
+        "HI", "ID", "IL", "IN", "IA", "KS", "KY", "LA", "ME", "MD",
+        "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NJ",
+        "NM", "NY", "NC", "ND", "OH", "OK", "OR", "PA", "RI", "SC",
+        "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY"
+    }
+
+    for state in states:
+        if f" {state} " in text or text.endswith(f" {state}") or text.startswith(f"{state} "):
+            return {"state": state, "city": None, "text": None}
+
+    return {"state": None, "city": None, "text": None}
+
+
+def legacy_path(articles):
+    return [(legacy_classify(t, d), legacy_extract_location(t, d)["state"]) for t, d in articles]
+
+
+# What load_gazetteer builds when the locations table holds the cities used above
+GAZETTEER = Gazetteer.from_rows(
+    (code, US_STATES[code], city, 0) for city, code in (place.rsplit(" ", 1) for place in CITIES)
+)
+
+
+def compiled_path(articles):
+    """What ingestion runs: NewsAPIService._classify_incident and _extract_location"""
+    return [(classifier.classify(t, d), GAZETTEER.extract(f"{t} {d or ''}")["state"]) for t, d in articles]
+
+
+def legacy_classify_path(articles):
+    return [legacy_classify(t, d) for t, d in articles]
+
+
+def classify_path(articles):
+    return [classifier.classify(t, d) for t, d in articles]
+
+
+def measure(fn, articles, rounds: int) -> float:
+    """Mean CPU seconds per article"""
+    fn(articles)
+    start = time.process_time()
+    for _ in range(rounds):
+        fn(articles)
+    return (time.process_time() - start) / (rounds * len(articles))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--articles", type=int, default=3000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    articles = make_articles(args.articles)
+    # Legacy state order depends on set iteration, so articles here name one state each
+    assert legacy_path(articles) == compiled_path(articles), "outputs differ"
+
+    classify_legacy = measure(legacy_classify_path, articles, args.rounds)
+    classify_compiled = measure(classify_path, articles, args.rounds)
+    legacy = measure(legacy_path, articles, args.rounds)
+    compiled = measure(compiled_path, articles, args.rounds)
+
+    print(f"{args.articles} articles, {args.rounds} rounds (us CPU/article)")
+    print(f"  classification:  legacy {classify_legacy * 1e6:8.2f}  compiled {classify_compiled * 1e6:8.2f}"
+          f"  {classify_legacy / classify_compiled:5.2f}x")
+    print(f"  with location:   legacy {legacy * 1e6:8.2f}  gazetteer {compiled * 1e6:7.2f}"
+          f"  {legacy / compiled:5.2f}x")
+
+if __name__ == "__main__":
+    main()
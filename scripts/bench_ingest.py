@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Benchmark: NewsAPI ingestion throughput from recorded fixtures
+
+  record      fetch live NewsAPI responses into a gzip NDJSON fixture (needs NEWSAPI_KEY)
+  synthesize  write a fixture of generated articles, for when no recording is at hand
+  run         replay a fixture through fetch -> classify -> dedup -> insert and report articles/sec
+
+``run`` writes to the database in DATABASE_URL, so point it at a local
+Postgres. Synthesized articles live under https://replay.invalid/, and
+--cleanup deletes them afterwards. Collection watermarks are restored after
+the replay, and replayed calls are not written to api_logs.
+
+Usage:
+  python scripts/bench_ingest.py record --out fixtures/newsapi.ndjson.gz [--hours-back 24]
+  python scripts/bench_ingest.py synthesize --out fixtures/synthetic.ndjson.gz [--articles 2000]
+  python scripts/bench_ingest.py run --fixture fixtures/newsapi.ndjson.gz [--articles 100000] [--speed 0] [--cleanup]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import httpx
+from sqlalchemy import insert, select
+
+from backend.core.config import settings
+from backend.services.incident_rollups import adjust_rollups
+from backend.services.news_api import NewsAPIService
+from backend.services.news_collector import KEYWORD_GROUPS, PAGE_SIZE, NewsAPIFetcher, group_query
+from backend.services.news_fixtures import (
+    SYNTHETIC_HOST, RecordingTransport, ReplayTransport, read_fixture, write_fixture
+)
+from scripts.bench_classifier import make_articles
+
+
+class ReplayNewsAPIService(NewsAPIService):
+    """The production pipeline, minus api_logs rows for calls that never reached NewsAPI"""
+
+    def _log_api_call(self, *args, **kwargs):
+        pass
+
+
+def snapshot_watermarks(db) -> list:
+    from database.models import CollectionWatermark
+    return [dict(row._mapping) for row in db.execute(select(CollectionWatermark.__table__))]
+
+
+def restore_watermarks(db, rows: list):
+    """Put collection_watermarks back the way the replay found them"""
+    from database.models import CollectionWatermark
+    table = CollectionWatermark.__table__
+    db.execute(table.delete())
+    if rows:
+        db.execute(insert(table), rows)
+    db.commit()
+
+
+async def fetch_all(transport, max_pages: int, max_requests: int, requests_per_second: float,
+                    params: dict) -> tuple:
+    """Run every keyword group through the fetcher, discarding pages; returns (stats, articles)"""
+    service = NewsAPIService()
+    queue: asyncio.Queue = asyncio.Queue()
+    async with httpx.AsyncClient(base_url=service.base_url, headers=service.headers,
+                                 timeout=30, transport=transport) as client:
+        fetcher = NewsAPIFetcher(client, max_concurrency=settings.NEWSAPI_MAX_CONCURRENCY,
+                                 requests_per_second=requests_per_second,
+                                 max_pages=max_pages, max_requests=max_requests)
+        await asyncio.gather(*(fetcher.fetch_group(keywords, params, queue) for keywords in KEYWORD_GROUPS))
+    articles = []
+    while not queue.empty():
+        articles.extend(queue.get_nowait())
+    return fetcher.stats, articles
+
+
+def record(args):
+    if not settings.NEWSAPI_KEY:
+        sys.exit("NEWSAPI_KEY is not set")
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    transport = RecordingTransport(args.out)
+    params = {
+        "language": "en",
+        "sortBy": "publishedAt",
+        "from": (datetime.utcnow() - timedelta(hours=args.hours_back)).strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    stats, articles = asyncio.run(fetch_all(
+        transport, settings.NEWSAPI_MAX_PAGES, settings.NEWSAPI_MAX_REQUESTS_PER_RUN,
+        settings.NEWSAPI_REQUESTS_PER_SECOND, params
+    ))
+    print(f"Recorded {transport.recorded} responses ({len(articles)} articles) to {args.out}")
+    for error in stats.errors:
+        print(f"  ⚠️  {error}")
+
+
+def synthesize(args):
+    rng = random.Random(args.seed)
+    now = datetime.utcnow()
+    records = []
+    per_group = -(-args.articles // len(KEYWORD_GROUPS))
+    for group, keywords in enumerate(KEYWORD_GROUPS):
+        generated = make_articles(per_group, seed=args.seed + group)
+        pages = -(-per_group // PAGE_SIZE)
+        for page in range(1, pages + 1):
+            chunk = generated[(page - 1) * PAGE_SIZE:page * PAGE_SIZE]
+            records.append({
+                "q": group_query(keywords), "page": page, "status": 200,
+                "elapsed_ms": rng.randint(150, 600),
+                "body": {"status": "ok", "totalResults": per_group, "articles": [
+                    {
+                        "source": {"name": rng.choice(["Associated Press", "Reuters", "CNN", "Local 7 News"])},
+                        "title": title,
+                        "description": description,
+                        "url": f"{SYNTHETIC_HOST}/seed/{group}/{page}/{index}",
+                        "publishedAt": (now - timedelta(minutes=rng.randint(0, 24 * 60))).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                    }
+                    for index, (title, description) in enumerate(chunk)
+                ]},
+            })
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    count = write_fixture(args.out, records)
+    print(f"Wrote {count} pages ({per_group * len(KEYWORD_GROUPS)} articles) to {args.out}")
+
+
+def run(args):
+    from database import SessionLocal
+    from database.models import Incident
+
+    recorded = sum(len(record["body"].get("articles", [])) for record in read_fixture(args.fixture))
+    target = args.articles or recorded
+    max_pages = -(-target // PAGE_SIZE) + 1
+    # Replay is local; don't let the live quota and politeness limits cap it
+    settings.NEWSAPI_MAX_PAGES = max_pages
+    settings.NEWSAPI_MAX_REQUESTS_PER_RUN = max_pages * len(KEYWORD_GROUPS) * 2
+    settings.NEWSAPI_REQUESTS_PER_SECOND = 0
+
+    print(f"Fixture {args.fixture}: {recorded} recorded articles, replaying {target} at speed {args.speed or 'max'}")
+
+    # Stage 1: fetch only
+    transport = ReplayTransport(args.fixture, speed=args.speed, articles=args.articles)
+    start = time.perf_counter()
+    stats, articles = asyncio.run(fetch_all(
+        transport, max_pages, settings.NEWSAPI_MAX_REQUESTS_PER_RUN, 0, {"language": "en"}
+    ))
+    fetch_seconds = time.perf_counter() - start
+    report("fetch", len(articles), fetch_seconds)
+
+    # Stage 2: classify + locate (CPU only)
+    service = NewsAPIService()
+    start = time.perf_counter()
+    rows = [service._article_to_row(article) for article in articles]
+    report("classify", len(articles), time.perf_counter() - start,
+           f"{sum(row is not None for row in rows)} kept")
+
+    # Stage 3: the whole pipeline, including near-duplicate detection and inserts.
+    # Replayed pages would advance the real watermarks, so put them back afterwards
+    db = SessionLocal()
+    watermarks = snapshot_watermarks(db)
+    try:
+        transport = ReplayTransport(args.fixture, speed=args.speed, articles=args.articles)
+        start = time.perf_counter()
+        result = asyncio.run(ReplayNewsAPIService().collect_incidents_async(
+            db, hours_back=24 * 365, transport=transport
+        ))
+        report("pipeline", result["articles_found"], time.perf_counter() - start,
+               f"{result['articles_processed']} inserted")
+        for error in result["errors"]:
+            print(f"  ⚠️  {error}")
+
+        if args.cleanup:
+            synthetic = Incident.url.like(f"{SYNTHETIC_HOST}/%")
+            adjust_rollups(db, synthetic, sign=-1)
+            deleted = db.query(Incident).filter(synthetic).delete(synchronize_session=False)
+            db.commit()
+            print(f"Deleted {deleted} synthetic incidents")
+    finally:
+        db.rollback()
+        restore_watermarks(db, watermarks)
+        db.close()
+
+
+def report(stage: str, articles: int, seconds: float, note: str = ""):
+    rate = articles / seconds if seconds else 0.0
+    print(f"  {stage:<9} {articles:>8} articles in {seconds:8.2f}s = {rate:10.0f} articles/s  {note}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record", help="Record live NewsAPI responses")
+    record_parser.add_argument("--out", required=True)
+    record_parser.add_argument("--hours-back", type=int, default=24)
+    record_parser.set_defaults(func=record)
+
+    synthesize_parser = commands.add_parser("synthesize", help="Write a generated fixture")
+    synthesize_parser.add_argument("--out", required=True)
+    synthesize_parser.add_argument("--articles", type=int, default=2000)
+    synthesize_parser.add_argument("--seed", type=int, default=7)
+    synthesize_parser.set_defaults(func=synthesize)
+
+    run_parser = commands.add_parser("run", help="Replay a fixture and measure throughput")
+    run_parser.add_argument("--fixture", required=True)
+    run_parser.add_argument("--articles", type=int, help="Scale to this many articles (default: as recorded)")
+    run_parser.add_argument("--speed", type=float, default=0.0,
+                            help="Replay this many times faster than recorded (0 = no latency)")
+    run_parser.add_argument("--cleanup", action="store_true", help="Delete synthetic incidents afterwards")
+    run_parser.set_defaults(func=run)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-request CPU to serialize a 100-item SearchResponse
+
+Compares the old path (ListingResponse.from_orm per row, SearchResponse
+validated again as the response_model, then jsonable_encoder + json) with
+the fast path (precompiled attribute getters + orjson).
+
+Usage: python scripts/bench_serialization.py [--items 100] [--iterations 2000]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import warnings
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from fastapi.encoders import jsonable_encoder
+
+from backend.schemas.tenant_schemas import ListingResponse, SearchResponse
+from backend.core.serialization import dumps, serialize_listing
+
+
+def make_listings(count: int):
+    """Plain objects shaped like ORM Listing rows"""
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    return [
+        SimpleNamespace(
+            id=i,
+            tenant_id=1,
+            name=f"Business {i}",
+            slug=f"business-{i}",
+            description="A neighbourhood business with a reasonably long description. " * 4,
+            website=f"https://business{i}.example.com",
+            phone="555-0100",
+            email=f"owner{i}@example.com",
+            addr_line1=f"{i} Main Street",
+            city="Springfield",
+            region="IL",
+            postal="62701",
+            country="US",
+            lat=39.78 + i / 1000,
+            lng=-89.65 - i / 1000,
+            category_id=3,
+            tags=["family-owned", "open-late", "parking"],
+            hours_json={"mon": "9-17", "tue": "9-17", "wed": "9-17", "thu": "9-17", "fri": "9-20"},
+            images_json=[f"https://cdn.example.com/{i}/{n}.jpg" for n in range(3)],
+            featured_until=now + timedelta(days=30) if i % 10 == 0 else None,
+            status="active",
+            created_at=now - timedelta(days=i),
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+def old_path(listings) -> bytes:
+    response = SearchResponse(
+        listings=[ListingResponse.from_orm(listing) for listing in listings],
+        total=len(listings), page=1, limit=len(listings), has_next=False
+    )
+    # What FastAPI does with a response_model: validate again, then encode
+    validated = SearchResponse.model_validate(response.model_dump())
+    return json.dumps(jsonable_encoder(validated)).encode()
+
+
+def fast_path(listings) -> bytes:
+    return dumps({
+        "listings": [serialize_listing(listing) for listing in listings],
+        "total": len(listings), "page": 1, "limit": len(listings), "has_next": False
+    })
+
+
+def measure(fn, listings, iterations: int) -> float:
+    """Mean CPU seconds per call"""
+    for _ in range(min(50, iterations)):
+        fn(listings)
+    start = time.process_time()
+    for _ in range(iterations):
+        fn(listings)
+    return (time.process_time() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    # from_orm is deprecated under Pydantic 2; don't let warning overhead skew the numbers
+    warnings.simplefilter("ignore", DeprecationWarning)
+    listings = make_listings(args.items)
+    expected = json.loads(old_path(listings))
+    for listing in expected["listings"]:
+        listing.pop("endorsement_summary")  # Detail reads only; not part of list payloads
+    assert expected == json.loads(fast_path(listings)), "payloads differ"
+
+    old = measure(old_path, listings, args.iterations)
+    fast = measure(fast_path, listings, args.iterations)
+
+    print(f"SearchResponse with {args.items} listings, {args.iterations} iterations")
+    print(f"  pydantic + response_model: {old * 1e6:10.1f} us CPU/request")
+    print(f"  precompiled + orjson:      {fast * 1e6:10.1f} us CPU/request")
+    print(f"  speedup:                   {old / fast:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """
-Scheduled data collection script for Directory
+One-off data collection script for Directory
+
+The app now schedules collection itself (SCHEDULER_ENABLED); use this for
+manual runs or deployments with the in-app scheduler turned off.
 """
 import os
 import sys
@@ -12,14 +15,19 @@ import pytz
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from database import SessionLocal
+from backend.core.config import settings
 from backend.services.news_api import NewsAPIService
 
-# Set up logging
+# Set up logging next to the app log (relative paths resolve from the project root)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOG_DIR = os.path.join(PROJECT_ROOT, os.path.dirname(settings.LOG_FILE))
+os.makedirs(LOG_DIR, exist_ok=True)
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler('/opt/webwise/directory/logs/data_collection.log'),
+        logging.FileHandler(os.path.join(LOG_DIR, 'data_collection.log')),
         logging.StreamHandler()
     ]
 )
@@ -36,8 +44,8 @@ def collect_crime_data():
         # Create NewsAPI service
         news_service = NewsAPIService()
         
-        # Collect incidents from last 2 hours (overlap for safety)
-        result = news_service.collect_incidents(db, hours_back=2)
+        # Collect since each query's watermark (COLLECTION_HOURS_BACK for new queries)
+        result = news_service.collect_incidents(db, hours_back=settings.COLLECTION_HOURS_BACK)
         
         if result["success"]:
             logger.info(f"Data collection successful: {result['articles_processed']} incidents processed")
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Offboard a tenant: soft-mark it, then purge its data in bounded batches
+"""
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import argparse
+import time
+
+from database import SessionLocal
+from database.tenant_models import Tenant
+from backend.services.purge import PURGE_BATCH_SIZE, mark_tenant_deleted, purge_tenant
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Purge a tenant and all of its data")
+    parser.add_argument("tenant_id", type=int, help="Tenant ID to purge")
+    parser.add_argument("--batch-size", type=int, default=PURGE_BATCH_SIZE,
+                       help="Rows deleted per transaction")
+    parser.add_argument("--yes", action="store_true", help="Skip the confirmation prompt")
+    args = parser.parse_args()
+    
+    db = SessionLocal()
+    try:
+        tenant = db.get(Tenant, args.tenant_id)
+        if tenant is None:
+            print(f"❌ Tenant {args.tenant_id} not found")
+            sys.exit(1)
+        
+        if not args.yes:
+            confirm = input(f"⚠️  Permanently delete tenant '{tenant.slug}' and all of its data? (yes/no): ")
+            if confirm.lower() != "yes":
+                print("❌ Operation cancelled")
+                sys.exit(1)
+        
+        # Soft-mark first so the API stops serving the tenant immediately
+        if tenant.plan_status != "deleted":
+            mark_tenant_deleted(db, tenant)
+            print(f"🔒 Tenant '{tenant.slug}' marked deleted")
+        
+        start = time.monotonic()
+        
+        def report(table: str, deleted: int):
+            print(f"   {table}: {deleted} rows deleted ({time.monotonic() - start:.1f}s)", flush=True)
+        
+        counts = purge_tenant(db, args.tenant_id, args.batch_size, progress=report)
+        print(f"🎉 Purge complete: {counts}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
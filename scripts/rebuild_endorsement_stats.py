@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Recompute per-listing endorsement stats from the endorsements table
+"""
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import argparse
+import time
+
+from database import SessionLocal
+from backend.services.endorsement_stats import rebuild_stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild listing endorsement stats")
+    parser.add_argument("--tenant-id", type=int, help="Only rebuild this tenant's listings")
+    parser.add_argument("--batch-size", type=int, default=5000,
+                       help="Endorsement rows fetched per round trip while counting tags")
+    args = parser.parse_args()
+    
+    db = SessionLocal()
+    try:
+        start = time.monotonic()
+        rebuilt = rebuild_stats(db, tenant_id=args.tenant_id, batch_size=args.batch_size)
+        scope = f"tenant {args.tenant_id}" if args.tenant_id is not None else "all tenants"
+        print(f"🎉 Rebuilt stats for {rebuilt} listings ({scope}) in {time.monotonic() - start:.1f}s")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Tests for the in-process endorsement anti-spam gate
+"""
+from backend.services import anti_spam
+from backend.services.anti_spam import EndorsementGate, SlidingWindowLimiter
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_limit_applies_per_key_within_window(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(anti_spam.time, "monotonic", clock)
+    limiter = SlidingWindowLimiter(limit=2, window_seconds=60)
+
+    limiter.record("a")
+    limiter.record("a")
+    assert not limiter.allowed("a")
+    assert limiter.allowed("b")
+
+    clock.now += 61
+    assert limiter.allowed("a")
+
+
+def test_idle_keys_expire_and_key_count_is_bounded(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(anti_spam.time, "monotonic", clock)
+    limiter = SlidingWindowLimiter(limit=1, window_seconds=60, max_keys=3)
+
+    for key in range(5):
+        limiter.record(key)
+        clock.now += 1
+    assert list(limiter._events) == [2, 3, 4]
+
+    clock.now += 60
+    limiter.record("fresh")
+    assert list(limiter._events) == ["fresh"]
+
+
+def test_gate_only_counts_recorded_submissions():
+    gate = EndorsementGate(limit=1, window_seconds=60, capacity=1000,
+                           error_rate=0.001, dedup_ttl_seconds=60)
+
+    # A submission whose write failed was checked but never recorded; its retry passes
+    assert gate.check(1, 2, "ip", "txn") is None
+    assert gate.check(1, 2, "ip", "txn") is None
+
+    gate.record(1, 2, "ip", "txn")
+    assert gate.check(1, 2, "ip", "txn") == EndorsementGate.RATE_LIMITED
+    assert gate.check(1, 3, "ip", "txn") == EndorsementGate.DUPLICATE
@@ -0,0 +1,63 @@
+"""
+Tests for create/update classification in the listing change feed
+"""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from backend.core.cursors import decode_cursor, encode_cursor, position
+from backend.services.change_feed import fetch_listing_changes
+
+T0 = datetime(2026, 1, 10, 12, 0, 0)
+
+
+def listing(listing_id: int, created_at: datetime, updated_at: datetime):
+    return SimpleNamespace(id=listing_id, created_at=created_at, updated_at=updated_at)
+
+
+class FakeResult(list):
+    def all(self):
+        return self
+
+
+class FakeSession:
+    """Serves the listings query, then the tombstones query"""
+
+    def __init__(self, listings, tombstones=()):
+        self.results = [FakeResult(listings), FakeResult(tombstones)]
+
+    def scalars(self, statement):
+        return self.results.pop(0)
+
+
+def ops(page):
+    return [(change["op"], change["id"]) for change in page["changes"]]
+
+
+def test_first_page_reports_everything_as_created():
+    db = FakeSession([listing(1, T0, T0), listing(2, T0, T0 + timedelta(minutes=5))])
+    assert ops(fetch_listing_changes(db, 1, None, 10)) == [("create", 1), ("create", 2)]
+
+
+def test_classification_uses_the_incoming_cursor_not_the_page_so_far():
+    # Listing 1 was created before the cursor and edited since; listing 2 is new.
+    # Listing 3 was created after the cursor and updated later on this same page,
+    # so the client has never seen it
+    since = encode_cursor({"u": position(T0, 9)})
+    db = FakeSession([
+        listing(1, T0 - timedelta(days=1), T0 + timedelta(minutes=1)),
+        listing(2, T0 + timedelta(minutes=2), T0 + timedelta(minutes=2)),
+        listing(3, T0 + timedelta(minutes=1), T0 + timedelta(minutes=3)),
+    ])
+    page = fetch_listing_changes(db, 1, since, 10)
+
+    assert ops(page) == [("update", 1), ("create", 2), ("create", 3)]
+    assert decode_cursor(page["next_cursor"])["u"] == position(T0 + timedelta(minutes=3), 3)
+
+
+def test_deletes_merge_in_timestamp_order():
+    tombstone = SimpleNamespace(id=5, listing_id=4, slug="gone", deleted_at=T0 + timedelta(minutes=1))
+    db = FakeSession([listing(1, T0, T0), listing(2, T0, T0 + timedelta(minutes=2))], [tombstone])
+    page = fetch_listing_changes(db, 1, None, 2)
+
+    assert ops(page) == [("create", 1), ("delete", 4)]
+    assert page["has_more"]
@@ -0,0 +1,57 @@
+"""
+Tests for streaming GET /v1/endorsements responses
+"""
+import json
+from datetime import datetime
+from types import SimpleNamespace
+
+from backend.core.serialization import ENDORSEMENT_FIELDS
+from backend.routes.tenant_api import _stream_endorsements
+
+
+def endorsement(endorsement_id: int):
+    values = {field: None for field in ENDORSEMENT_FIELDS}
+    values.update(id=endorsement_id, tenant_id=1, listing_id=7, would_repeat=True,
+                  txn_hash=f"txn{endorsement_id}", ip_hash="ip", created_at=datetime(2026, 1, 1))
+    return SimpleNamespace(**values)
+
+
+class FakeResult:
+    def __init__(self, batches):
+        self.batches = batches
+
+    def partitions(self):
+        return iter(self.batches)
+
+    def close(self):
+        pass
+
+
+class FakeSession:
+    def __init__(self, batches):
+        self.batches = batches
+
+    def scalars(self, statement):
+        return FakeResult(self.batches)
+
+    def expunge(self, row):
+        pass
+
+
+def body(db, **kwargs) -> bytes:
+    return b"".join(_stream_endorsements(db, [], **kwargs))
+
+
+def test_default_response_is_a_plain_json_list():
+    db = FakeSession([[endorsement(3), endorsement(2)], [endorsement(1)]])
+    assert [row["id"] for row in json.loads(body(db, json_array=True))] == [3, 2, 1]
+
+
+def test_empty_list_is_valid_json():
+    assert json.loads(body(FakeSession([]), json_array=True)) == []
+
+
+def test_ndjson_has_one_endorsement_per_line():
+    db = FakeSession([[endorsement(2)], [endorsement(1)]])
+    lines = body(db).decode().splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [2, 1]
@@ -0,0 +1,29 @@
+"""
+Tests for place extraction from article text
+"""
+from backend.services import gazetteer
+from backend.services.gazetteer import Gazetteer
+
+GAZETTEER = Gazetteer.from_rows([
+    ("MS", "Mississippi", "Jackson", 150000),
+    ("CA", "California", "Fresno", 540000),
+])
+
+
+def test_dotted_abbreviation_names_the_state():
+    assert GAZETTEER.extract("FRESNO, Calif. (AP) — a man was shot")["state"] == "CA"
+    assert GAZETTEER.extract("Shooting in Jackson, Miss. overnight")["city"] == "Jackson"
+
+
+def test_undotted_abbreviation_is_an_ordinary_word():
+    assert GAZETTEER.extract("Miss America contestant robbed")["state"] is None
+    assert GAZETTEER.extract("Volunteers Wash graffiti off the school")["state"] is None
+
+
+def test_states_only_fallback_is_built_once(monkeypatch):
+    monkeypatch.setattr(gazetteer, "_gazetteer", None)
+    monkeypatch.setattr(gazetteer, "_states_only", None)
+
+    fallback = gazetteer.get_gazetteer()
+    assert gazetteer.get_gazetteer() is fallback
+    assert fallback.extract("Storms hit Texas overnight")["state"] == "TX"
@@ -0,0 +1,46 @@
+"""
+Tests for background job state and its background_jobs rows
+"""
+from datetime import datetime
+from types import SimpleNamespace
+
+from backend.services.jobs import FAILED, Job, JobRunner, SUCCEEDED
+
+
+def test_job_round_trips_through_its_row():
+    job = Job(id="abc", kind="news_collection", params={"hours_back": 2}, status=FAILED,
+              progress={"requests_made": 3}, result={"when": datetime(2026, 1, 1)}, error="boom",
+              started_at=datetime(2026, 1, 1, 12), finished_at=datetime(2026, 1, 1, 12, 5))
+
+    restored = Job.from_row(SimpleNamespace(**job.to_row()))
+
+    assert restored.to_dict() == {**job.to_dict(), "result": {"when": "2026-01-01 00:00:00"}}
+
+
+def test_lookup_falls_back_to_jobs_stored_by_other_workers(monkeypatch):
+    runner = JobRunner(max_workers=1)
+    other = Job(id="elsewhere", kind="news_collection", params={}, status=SUCCEEDED)
+    saved = []
+    monkeypatch.setattr(runner, "_save", saved.append)
+    monkeypatch.setattr(runner, "_load", lambda stmt: [other])
+    try:
+        local = runner.submit("news_collection", lambda job: {"ok": True})
+
+        assert runner.get("elsewhere") is other
+        assert runner.get(local.id) is local
+        assert saved[0] is local
+    finally:
+        runner.shutdown()
+
+
+def test_unreadable_database_lists_this_workers_jobs(monkeypatch):
+    runner = JobRunner(max_workers=1)
+    monkeypatch.setattr(runner, "_save", lambda job: None)
+    monkeypatch.setattr(runner, "_load", lambda stmt: None)
+    try:
+        job = runner.submit("rollups", lambda job: None)
+
+        assert runner.list() == [job]
+        assert runner.latest("rollups") is job
+    finally:
+        runner.shutdown()
@@ -0,0 +1,146 @@
+"""
+Tests for near-duplicate detection and how ingestion keeps the index in step
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from backend.services import news_api
+from backend.services.near_duplicates import NearDuplicateIndex
+from backend.services.news_api import NewsAPIService
+
+NOW = datetime.utcnow()
+STORY = ("Gunman opens fire at Houston gas station, two injured",
+         "Police said the suspect fled in a grey sedan after the shooting")
+SAME_STORY = ("Gunman opens fire at Houston gas station, two injured",
+              "Police said the suspect fled in a grey sedan after the shooting on Monday")
+OTHER_STORY = ("Warehouse fire in Dallas destroys three buildings", "No injuries were reported")
+
+
+def make_index() -> NearDuplicateIndex:
+    index = NearDuplicateIndex(num_perm=64, bands=16, threshold=0.5, window_hours=72)
+    index.loaded = True
+    return index
+
+
+def test_rewritten_story_matches_and_unrelated_one_does_not():
+    index = make_index()
+    index.add(1, index.signature(*STORY), NOW)
+
+    assert index.find(index.signature(*SAME_STORY)) == 1
+    assert index.find(index.signature(*OTHER_STORY)) is None
+
+
+def test_rekey_keeps_eviction_order():
+    index = make_index()
+    index.add("https://a.example/1", index.signature(*STORY), NOW - timedelta(hours=2))
+    index.add(2, index.signature(*OTHER_STORY), NOW - timedelta(hours=1))
+    index.rekey("https://a.example/1", 1)
+
+    assert list(index._order) == [1, 2]
+
+
+def test_entries_outside_window_are_evicted():
+    index = make_index()
+    index.add(1, index.signature(*STORY), NOW - timedelta(hours=80))
+    index.add(2, index.signature(*OTHER_STORY), NOW)
+
+    assert len(index) == 1
+    assert index.find(index.signature(*STORY)) is None
+
+
+class RowsSession:
+    """Answers the index's load query with canned rows, recording each query"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    def execute(self, statement):
+        self.queries.append(statement)
+        return type("Result", (), {"all": lambda result: self.rows})()
+
+
+def test_reload_reads_only_newly_discovered_incidents():
+    index = NearDuplicateIndex(num_perm=64, bands=16, threshold=0.5, window_hours=72)
+    discovered = NOW - timedelta(minutes=30)
+    index.load(RowsSession([(1, *STORY, NOW, discovered)]))
+
+    db = RowsSession([(1, *STORY, NOW, discovered), (2, *OTHER_STORY, NOW, NOW)])
+    index.load(db)
+
+    assert "discovered_at" in {clause.left.name for clause in db.queries[0].whereclause.clauses}
+    assert index.loaded_through == NOW
+    assert set(index._entries) == {1, 2}
+
+
+def test_aware_publish_times_compare_with_the_window():
+    index = make_index()
+    published = (NOW - timedelta(hours=1)).replace(tzinfo=timezone.utc)
+    index.load(RowsSession([(1, *STORY, published, NOW)]))
+
+    assert index.find(index.signature(*SAME_STORY)) == 1
+
+
+class FakeSession:
+    def __init__(self):
+        self.committed = False
+
+    def scalars(self, statement):
+        return []  # No URL is stored yet
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        pass
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    """NewsAPIService._process_articles with the database calls replaced"""
+    index = make_index()
+    monkeypatch.setattr(news_api, "near_duplicate_index", index)
+    monkeypatch.setattr(news_api, "get_near_duplicate_index", lambda db: index)
+    monkeypatch.setattr(news_api, "get_gazetteer", lambda db: None)
+
+    service = NewsAPIService()
+    next_id = iter(range(100, 200))
+    monkeypatch.setattr(service, "_article_to_row", lambda article: dict(article))
+    monkeypatch.setattr(service, "_resolve_sources", lambda db, names: {name: 1 for name in names})
+    monkeypatch.setattr(service, "_insert_incidents",
+                        lambda db, values: [(row["url"], next(next_id)) for row in values])
+    return service, index
+
+
+def articles():
+    return [
+        {"url": f"https://news.example/{n}", "title": title, "description": description,
+         "published_at": NOW, "source_name": "Example News"}
+        for n, (title, description) in enumerate([STORY, OTHER_STORY])
+    ]
+
+
+def test_committed_rows_are_indexed_by_incident_id(pipeline, monkeypatch):
+    service, index = pipeline
+    monkeypatch.setattr(news_api, "adjust_rollups", lambda db, condition: None)
+    db = FakeSession()
+
+    assert service._process_articles(db, articles()) == 2
+    assert db.committed
+    assert set(index._entries) == {100, 101}
+
+
+def test_rolled_back_rows_leave_nothing_in_the_index(pipeline, monkeypatch):
+    service, index = pipeline
+
+    def fail(db, condition):
+        raise RuntimeError("rollup upsert failed")
+
+    monkeypatch.setattr(news_api, "adjust_rollups", fail)
+
+    with pytest.raises(RuntimeError):
+        service._process_articles(FakeSession(), articles())
+    # Neither the URLs nor the ids of the rolled-back inserts can be matched later
+    assert len(index) == 0
+    assert index.find(index.signature(*SAME_STORY)) is None
@@ -0,0 +1,127 @@
+"""
+Tests for the async NewsAPI pipeline, run against a replayed fixture
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from backend.core.config import settings
+from backend.services import news_api
+from backend.services.news_api import NewsAPIService
+from backend.services.news_collector import KEYWORD_GROUPS, RecentUrls, group_query
+from backend.services.news_fixtures import ReplayTransport, write_fixture
+
+PAGED_QUERY = group_query(KEYWORD_GROUPS[0])
+FAILING_QUERY = group_query(KEYWORD_GROUPS[1])
+TOTAL_RESULTS = 250  # Three pages of PAGE_SIZE
+
+
+def article(index: int) -> dict:
+    return {
+        "url": f"https://news.example/{index}",
+        "title": f"Shooting report {index}",
+        "description": "Police responded to a shooting",
+        "publishedAt": f"2026-01-10T{index % 24:02d}:00:00Z",
+    }
+
+
+@pytest.fixture
+def fixture_path(tmp_path):
+    path = str(tmp_path / "newsapi.ndjson.gz")
+    records = [
+        {"q": PAGED_QUERY, "page": page, "status": 200, "elapsed_ms": 20,
+         "body": {"status": "ok", "totalResults": TOTAL_RESULTS,
+                  "articles": [article(index) for index in range(start, min(start + 100, TOTAL_RESULTS))]}}
+        for page, start in ((1, 0), (2, 100), (3, 200))
+    ]
+    records.append({"q": FAILING_QUERY, "page": 1, "status": 500, "elapsed_ms": 20,
+                    "body": {"status": "error", "code": "unexpectedError", "message": "Server error"}})
+    write_fixture(path, records)
+    return path
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    """Stubs the database side of the pipeline and records what reaches it"""
+    calls = {"processed": [], "advanced": [], "logged": []}
+
+    def process_articles(self, db, articles):
+        calls["processed"].extend(article["url"] for article in articles)
+        return len(articles)
+
+    monkeypatch.setattr(settings, "NEWSAPI_REQUESTS_PER_SECOND", 0.0)
+    monkeypatch.setattr(news_api, "recent_urls", RecentUrls(1000))
+    monkeypatch.setattr(news_api, "load_watermarks", lambda db, queries: {})
+    monkeypatch.setattr(news_api, "advance_watermarks", lambda db, marks: calls["advanced"].append(marks))
+    monkeypatch.setattr(news_api.near_duplicate_index, "load", lambda db: None)
+    monkeypatch.setattr(news_api.log_writer, "submit", lambda model, row: calls["logged"].append(row))
+    monkeypatch.setattr(NewsAPIService, "_process_articles", process_articles)
+    return calls
+
+
+def collect(transport, progress=None):
+    return asyncio.run(NewsAPIService().collect_incidents_async(None, transport=transport, progress=progress))
+
+
+def test_every_page_of_a_query_is_fetched_and_processed(fixture_path, pipeline):
+    progress = {}
+    result = collect(ReplayTransport(fixture_path), progress)
+
+    assert sorted(pipeline["processed"]) == sorted(article(index)["url"] for index in range(TOTAL_RESULTS))
+    assert result["articles_found"] == TOTAL_RESULTS
+    assert result["articles_processed"] == TOTAL_RESULTS
+    assert result["requests_made"] == 3 + len(KEYWORD_GROUPS) - 1
+    assert progress["articles_processed"] == TOTAL_RESULTS
+    assert pipeline["logged"][0]["articles_found"] == TOTAL_RESULTS
+
+
+def test_failed_query_is_reported_and_keeps_its_watermark(fixture_path, pipeline):
+    result = collect(ReplayTransport(fixture_path))
+
+    assert result["success"]
+    assert any("500" in error for error in result["errors"])
+    # Only the fully fetched query with articles moves its watermark
+    assert [set(marks) for marks in pipeline["advanced"]] == [{PAGED_QUERY}]
+
+
+def test_processing_error_holds_back_every_watermark(fixture_path, pipeline, monkeypatch):
+    def fail(self, db, articles):
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(NewsAPIService, "_process_articles", fail)
+    result = collect(ReplayTransport(fixture_path))
+
+    assert any("database went away" in error for error in result["errors"])
+    assert result["articles_processed"] == 0
+    assert pipeline["advanced"] == []
+
+
+def test_requests_stay_within_concurrency_limit(fixture_path, pipeline, monkeypatch):
+    class CountingTransport(httpx.AsyncBaseTransport):
+        def __init__(self, inner):
+            self.inner = inner
+            self.in_flight = 0
+            self.peak = 0
+
+        async def handle_async_request(self, request):
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            try:
+                return await self.inner.handle_async_request(request)
+            finally:
+                self.in_flight -= 1
+
+    monkeypatch.setattr(settings, "NEWSAPI_MAX_CONCURRENCY", 2)
+    transport = CountingTransport(ReplayTransport(fixture_path, speed=1.0))
+    collect(transport)
+
+    assert transport.peak == 2
+
+
+def test_blocking_entry_point_refuses_a_running_loop(pipeline):
+    async def call_from_loop():
+        NewsAPIService().collect_incidents(None)
+
+    with pytest.raises(RuntimeError, match="collect_incidents_async"):
+        asyncio.run(call_from_loop())
@@ -0,0 +1,104 @@
+"""
+Tests for the advisory-lock and recent-run checks around scheduled tasks
+"""
+from datetime import datetime
+
+import pytest
+
+from backend.services import scheduler
+from backend.services.jobs import Job
+from backend.services.scheduler import run_with_advisory_lock
+
+
+class FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar(self):
+        return self.value
+
+
+class FakeConnection:
+    """Answers the lock query, then the recent-run query; records every statement"""
+
+    def __init__(self, acquired=True, last_started_at=None):
+        self.answers = {"pg_try_advisory_lock": acquired, "scheduled_runs.last_started_at": last_started_at}
+        self.statements = []
+
+    def execute(self, statement):
+        sql = str(statement)
+        self.statements.append(sql)
+        for marker, value in self.answers.items():
+            if marker in sql and not sql.startswith("INSERT"):
+                return FakeResult(value)
+        return FakeResult(None)
+
+    def commit(self):
+        pass
+
+    def ran(self, marker: str) -> bool:
+        return any(marker in sql for sql in self.statements)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def connect(monkeypatch):
+    def install(conn):
+        monkeypatch.setattr(scheduler, "engine", type("FakeEngine", (), {"connect": lambda self: conn})())
+        return conn
+    return install
+
+
+def make_job() -> Job:
+    return Job(id="job", kind="rollups", params={})
+
+
+def test_skips_when_another_instance_holds_the_lock(connect):
+    conn = connect(FakeConnection(acquired=False))
+    job = make_job()
+
+    assert run_with_advisory_lock("rollups", lambda job: "ran", job, min_interval=60) is None
+    assert "another instance" in job.progress["skipped"]
+    assert not conn.ran("INSERT INTO scheduled_runs")
+    assert not conn.ran("pg_advisory_unlock")
+
+
+def test_skips_when_the_task_ran_recently(connect):
+    conn = connect(FakeConnection(last_started_at=datetime(2026, 1, 1, 12)))
+    job = make_job()
+
+    assert run_with_advisory_lock("rollups", lambda job: "ran", job, min_interval=60) is None
+    assert job.progress["skipped"].startswith("already ran")
+    assert not conn.ran("INSERT INTO scheduled_runs")
+    assert conn.ran("pg_advisory_unlock")
+
+
+def test_runs_and_records_start_when_due(connect):
+    conn = connect(FakeConnection())
+
+    assert run_with_advisory_lock("rollups", lambda job: "ran", make_job(), min_interval=60) == "ran"
+    assert conn.ran("INSERT INTO scheduled_runs")
+
+
+def test_manual_run_ignores_recent_runs_but_is_recorded(connect):
+    conn = connect(FakeConnection(last_started_at=datetime(2026, 1, 1, 12)))
+
+    assert run_with_advisory_lock("rollups", lambda job: "ran", make_job()) == "ran"
+    assert not conn.ran("scheduled_runs.last_started_at")
+    assert conn.ran("INSERT INTO scheduled_runs")
+
+
+def test_lock_is_released_when_the_task_fails(connect):
+    conn = connect(FakeConnection())
+
+    def fail(job):
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        run_with_advisory_lock("rollups", fail, make_job(), min_interval=60)
+    assert conn.ran("pg_advisory_unlock")
@@ -0,0 +1,34 @@
+"""
+Tests for slug generation and suffix candidates
+"""
+from itertools import islice
+
+from backend.services.slugs import MAX_SEQUENTIAL_SUFFIXES, slug_candidates, slugify
+
+
+def test_accents_fold_to_ascii():
+    assert slugify("Café Nöel") == "cafe-noel"
+
+
+def test_ampersand_and_punctuation():
+    assert slugify("  Smith & Sons, Plumbing!  ") == "smith-and-sons-plumbing"
+
+
+def test_text_without_ascii_letters_falls_back():
+    assert slugify("東京") == "item"
+    assert slugify("---") == "item"
+
+
+def test_truncation_does_not_leave_a_trailing_dash():
+    assert slugify("abc def", max_length=4) == "abc"
+
+
+def test_candidates_try_sequential_suffixes_first():
+    candidates = list(islice(slug_candidates("joes-diner"), MAX_SEQUENTIAL_SUFFIXES + 2))
+    assert candidates[:3] == ["joes-diner", "joes-diner-2", "joes-diner-3"]
+    assert candidates[-1].startswith("joes-diner-") and len(candidates[-1]) == len("joes-diner-") + 6
+
+
+def test_suffixed_candidates_fit_max_length():
+    for candidate in slug_candidates("a" * 20, max_length=12):
+        assert len(candidate) <= 12
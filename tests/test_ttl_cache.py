@@ -0,0 +1,79 @@
+"""
+Tests for the single-flight TTL cache
+"""
+import asyncio
+import threading
+
+from backend.core import ttl_cache
+from backend.core.ttl_cache import SingleFlightCache
+
+
+def test_concurrent_misses_share_one_computation():
+    calls = []
+    release = threading.Event()
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return "value"
+
+    async def scenario():
+        cache = SingleFlightCache(ttl=60)
+        waiters = [asyncio.ensure_future(cache.get("key", compute)) for _ in range(5)]
+        await asyncio.sleep(0.05)
+        release.set()
+        return await asyncio.gather(*waiters)
+
+    assert asyncio.run(scenario()) == ["value"] * 5
+    assert len(calls) == 1
+
+
+def test_value_is_recomputed_after_ttl(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(ttl_cache.time, "monotonic", lambda: clock[0])
+    values = iter([1, 2])
+
+    async def scenario():
+        cache = SingleFlightCache(ttl=5)
+        first = await cache.get("key", lambda: next(values))
+        cached = await cache.get("key", lambda: next(values))
+        clock[0] += 6
+        return first, cached, await cache.get("key", lambda: next(values))
+
+    assert asyncio.run(scenario()) == (1, 1, 2)
+
+
+def test_failures_are_not_cached():
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("database busy")
+        return "ok"
+
+    async def scenario():
+        cache = SingleFlightCache(ttl=60)
+        try:
+            await cache.get("key", flaky)
+        except RuntimeError:
+            pass
+        return await cache.get("key", flaky)
+
+    assert asyncio.run(scenario()) == "ok"
+    assert len(attempts) == 2
+
+
+def test_cancelled_waiter_does_not_cancel_the_others():
+    release = threading.Event()
+
+    async def scenario():
+        cache = SingleFlightCache(ttl=60)
+        leaver = asyncio.ensure_future(cache.get("key", lambda: release.wait(5) and "value"))
+        stayer = asyncio.ensure_future(cache.get("key", lambda: "other"))
+        await asyncio.sleep(0.05)
+        leaver.cancel()
+        release.set()
+        return await stayer
+
+    assert asyncio.run(scenario()) == "value"
@@ -0,0 +1,35 @@
+"""
+Tests for per-query collection watermarks
+"""
+from datetime import datetime, timedelta
+
+from backend.services.watermarks import from_dates
+
+NOW = datetime(2026, 1, 10, 12, 0, 0)
+FLOOR = NOW - timedelta(hours=2)
+OVERLAP = timedelta(minutes=30)
+
+
+def test_query_without_watermark_starts_at_floor():
+    dates = from_dates({}, ["shooting"], FLOOR, OVERLAP)
+    assert dates == {"shooting": "2026-01-10T10:00:00"}
+
+
+def test_watermark_older_than_floor_is_not_skipped():
+    # A failed run left the watermark 6 hours back; resume there, not at now-2h
+    watermark = NOW - timedelta(hours=6)
+    dates = from_dates({"shooting": watermark}, ["shooting"], FLOOR, OVERLAP)
+    assert dates == {"shooting": "2026-01-10T05:30:00"}
+
+
+def test_watermark_resume_is_capped_by_earliest():
+    watermark = NOW - timedelta(days=30)
+    earliest = NOW - timedelta(days=7)
+    dates = from_dates({"shooting": watermark}, ["shooting"], FLOOR, OVERLAP, earliest=earliest)
+    assert dates == {"shooting": "2026-01-03T12:00:00"}
+
+
+def test_recent_watermark_resumes_with_overlap():
+    watermark = NOW - timedelta(minutes=10)
+    dates = from_dates({"shooting": watermark, "homicide": None}, ["shooting", "homicide"], FLOOR, OVERLAP)
+    assert dates == {"shooting": "2026-01-10T11:20:00", "homicide": "2026-01-10T10:00:00"}